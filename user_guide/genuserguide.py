@@ -16,6 +16,7 @@ from utils import (
     getStory,
     RLDocTemplate,
 )
+from utils.fontcache import CachedTTFont
 
 rl_settings.verbose = 1
 
@@ -57,21 +58,21 @@ def run():
         boldItalic='VeraBI',
     )
 
-    # 思源黑体
+    # 思源黑体, 字形较多, 使用缓存的解析结果
     fonts_dir = os.path.join(os.path.dirname(BASE_DIR), 'fonts')
     pdfmetrics.registerFont(
-        TTFont(
+        CachedTTFont(
             'SourceHanSansSC',
             os.path.join(fonts_dir, 'SourceHanSans-ExtraLight.ttf'),
         )
     )
     pdfmetrics.registerFont(
-        TTFont(
+        CachedTTFont(
             'SourceHanSansBd', os.path.join(fonts_dir, 'SourceHanSans-Bold.ttf')
         )
     )
     pdfmetrics.registerFont(
-        TTFont(
+        CachedTTFont(
             'SourceHanSansIt',
             os.path.join(fonts_dir, 'SourceHanSans-ExtraLight.ttf'),
         )
@@ -1,6 +1,8 @@
 import logging
 
 import os
+import re
+from functools import lru_cache
 
 from .rltemplate import RLDocTemplate
 from .stylesheet import getStyleSheet, getCnStyleSheet, CnParagraphStyle
@@ -28,15 +30,15 @@ from reportlab.lib.sequencer import getSequencer
 from reportlab.lib.fonts import tt2ps
 from xml.sax.saxutils import escape as xmlEscape
 
-from .t_parse import Template
-
 
 logger = logging.getLogger(__name__)
 
-QFcodetemplate = Template("X$X$", "X")
-QFreptemplate = Template("X^X^", "X")
-codesubst = "%s<font name=Courier><nobr>%s</nobr></font>"
-QFsubst = "%s<font name=Courier><i><nobr>%s</nobr></i></font>"
+QFmarker = re.compile(r'[$^]')
+QFmarkup = {
+    '$': ('<font name=Courier><nobr>', '</nobr></font>'),
+    '^': ('<font name=Courier><i><nobr>', '</nobr></i></font>'),
+}
+QFcachesize = 8192
 
 styleSheet = getStyleSheet()
 cn_styleSheet = getCnStyleSheet()
@@ -89,42 +91,45 @@ examplefunctiondisplaysizes = (
 appmode = 0
 
 
+@lru_cache(maxsize=QFcachesize)
 def quickfix(text):
     """inside text find any subsequence of form $subsequence$.
     Format the subsequence as code.  If similarly if text contains ^arg^
     format the arg as replaceable.  The escape sequence for literal
     $ is $\\$ (^ is ^\\^.
+
+    Both markers are handled in one scan: markers of the same kind pair up
+    in order, a pair enclosing exactly \\ is an escape and is kept as is,
+    and so is an unpaired marker.  Results are cached.
     """
-    # logger.info('<<' + '=' * 100)
-    # logger.info(f'text: {text}')
-
-    for (template, subst) in [
-        (QFcodetemplate, codesubst),
-        (QFreptemplate, QFsubst),
-    ]:
-        fragment = text
-        parts = []
-        try:
-            while fragment:
-                try:
-                    (matches, index) = template.PARSE(fragment)
-                except:
-                    raise ValueError
-                else:
-                    [prefix, code] = matches
-                    if code == "\\":
-                        part = fragment[:index]
-                    else:
-                        part = subst % (prefix, code)
-                    parts.append(part)
-                    fragment = fragment[index:]
-        except ValueError:
-            parts.append(fragment)
-        text = ''.join(parts)
-
-    # logger.info(f'quickfix text: {text}')
-    # logger.info('=' * 100 + '>> \n\n')
-    return text
+    parts = []
+    # unpaired markers: {marker: (index in text, index in parts)}
+    opened = {}
+    last = 0
+    for match in QFmarker.finditer(text):
+        marker = match.group()
+        index = match.start()
+        parts.append(text[last:index])
+        last = index + 1
+        if marker not in opened:
+            opened[marker] = (index, len(parts))
+            parts.append(marker)
+            continue
+
+        open_index, part_index = opened.pop(marker)
+        if text[open_index + 1 : index] == '\\':
+            parts.append(marker)
+        else:
+            open_tag, close_tag = QFmarkup[marker]
+            parts[part_index] = open_tag
+            parts.append(close_tag)
+    parts.append(text[last:])
+    return ''.join(parts)
+
+
+def quickfixes(texts):
+    """quickfix each of texts, returning a list"""
+    return [quickfix(text) for text in texts]
 
 
 def getJustFontPaths():
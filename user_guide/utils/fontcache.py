@@ -0,0 +1 @@
+../../user_guide_cn/report/core/fontcache.py
\ No newline at end of file
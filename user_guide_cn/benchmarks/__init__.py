@@ -0,0 +1,3 @@
+"""
+基准测试, 在 user_guide_cn 目录下以模块方式执行, 如: python -m benchmarks.build
+"""
@@ -0,0 +1,207 @@
+"""
+图形边界基准测试
+
+比较 report.core.graphics.layout 计算边界的耗时和对照实现, 按点数成倍增加,
+检查耗时随点数线性增长, 并检查结果与对照实现一致:
+
+- points: 展开坐标列表的 getPointsBounds, 对照为原来逐个切片的实现
+- pairs: (x, y) 点对列表的 getPointsBounds, 对照为原来的实现
+- polyline: 折线(PolyLine)的 getBounds, 对照为 reportlab 的 PolyLine.getBounds
+- group: 多层嵌套、带变换的图形组, 对照为 reportlab 的 Group.getBounds
+- legend: 多列、多行名称的图例, 每 100 个点一项, 对照为 reportlab 的
+  Legend.getBounds(绘制后计算)
+- chart: 带图例的快速折线图, 对照为 reportlab 的 Group.getBounds
+- legend_layout: legendLayout 为图例选择的排列和大小, 对照为按选择的行数绘制后
+  Legend.getBounds 的大小
+
+原来的实现每次循环都复制剩余的坐标列表, 耗时随点数平方增长.
+
+用法(在 user_guide_cn 目录下执行)::
+
+    python -m benchmarks.bounds
+    python -m benchmarks.bounds --sizes 1000 10000 100000 points
+"""
+import sys
+import time
+import random
+import argparse
+
+from reportlab.graphics import shapes
+from reportlab.graphics.charts.legends import Legend
+from reportlab.lib import colors
+
+from report.core.graphics import layout
+from report.core.graphics.quick_charts import quickChart
+
+
+def reference_points_bounds(pointList):
+    """ 原来的 getPointsBounds, 展开坐标时每次循环都复制剩余的列表 """
+    xs = []
+    ys = []
+    first = pointList[0]
+    if isinstance(first, (list, tuple)):
+        for (x, y) in pointList:
+            xs.append(x)
+            ys.append(y)
+    else:
+        points = pointList[:]
+        while points:
+            xs.append(points[0])
+            ys.append(points[1])
+            points = points[2:]
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def coordinates(n):
+    rnd = random.Random(n)
+    return [rnd.uniform(-1000, 1000) for _ in range(2 * n)]
+
+
+def make_points(n):
+    return coordinates(n)
+
+
+def make_polyline(n):
+    return shapes.PolyLine(coordinates(n))
+
+
+def make_pairs(n):
+    points = coordinates(n)
+    return [(points[i], points[i + 1]) for i in range(0, len(points), 2)]
+
+
+def make_group(n):
+    """ 10 层嵌套的图形组, 共 n 个矩形 """
+    rnd = random.Random(n)
+    depth = 10
+    root = group = shapes.Group()
+    for level in range(depth):
+        for _ in range(n // depth):
+            group.add(
+                shapes.Rect(
+                    rnd.uniform(-100, 100), rnd.uniform(-100, 100), 10, 5
+                )
+            )
+        child = shapes.Group()
+        child.translate(rnd.uniform(-5, 5), rnd.uniform(-5, 5))
+        child.rotate(rnd.uniform(0, 90))
+        group.add(child)
+        group = child
+    return root
+
+
+def make_legend(n):
+    """ n // 100 项的图例, 名称分两列, 部分名称有多行 """
+    rnd = random.Random(n)
+    legend = Legend()
+    legend.columnMaximum = 10
+    legend.subCols[1].align = 'right'
+    legend.subCols[1].minWidth = 30
+    legend.colorNamePairs = [
+        (
+            colors.toColor(f'#{rnd.randrange(0x1000000):06x}'),
+            (
+                'x' * rnd.randint(1, 20) + '\n' * rnd.randint(0, 2) + 'y',
+                str(rnd.randint(0, 10 ** rnd.randint(1, 6))),
+            ),
+        )
+        for _ in range(max(n // 100, 1))
+    ]
+    return legend
+
+
+def make_chart(n):
+    """ 三个系列共 n 个点、带图例的快速折线图 """
+    rnd = random.Random(n)
+    data = [[rnd.uniform(0, 100) for _ in range(n // 3)] for _ in range(3)]
+    chart = quickChart(
+        'linechart', 500, 300, data, seriesNames=['north', 'south', 'east']
+    )
+    return chart
+
+
+def solve_legend(legend):
+    """ legendLayout 在 400 x 120 的区域内排列水平图例 """
+    return layout.legendLayout(legend, 400, 120)
+
+
+def reference_legend_layout(legend):
+    """ 按 legendLayout 选择的行数绘制图例, 返回实际的大小 """
+    rows = solve_legend(legend)[0]
+    columnMaximum = legend.columnMaximum
+    legend.columnMaximum = rows
+    try:
+        x1, y1, x2, y2 = legend.getBounds()
+    finally:
+        legend.columnMaximum = columnMaximum
+    return rows, x2 - x1, y2 - y1
+
+
+CASES = {
+    'points': (make_points, layout.getPointsBounds, reference_points_bounds),
+    'pairs': (make_pairs, layout.getPointsBounds, reference_points_bounds),
+    'polyline': (make_polyline, layout.getBounds, shapes.PolyLine.getBounds),
+    'group': (make_group, layout.getBounds, shapes.Group.getBounds),
+    'legend': (make_legend, layout.getBounds, Legend.getBounds),
+    'chart': (make_chart, layout.getBounds, shapes.Group.getBounds),
+    'legend_layout': (make_legend, solve_legend, reference_legend_layout),
+}
+
+
+def timed(func, obj, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func(obj)
+    return (time.perf_counter() - start) / repeat, result
+
+
+def run_case(name, sizes, repeat, reference_limit):
+    make, func, reference = CASES[name]
+    print(f'{name}:')
+    print(f'  {"点数":>8} {"耗时(ms)":>10} {"每点(ns)":>9} {"对照(ms)":>10}')
+    for n in sizes:
+        obj = make(n)
+        seconds, result = timed(func, obj, repeat)
+        line = f'  {n:>10} {seconds * 1000:>10.3f} {seconds / n * 1e9:>9.1f}'
+        if n <= reference_limit:
+            reference_seconds, expected = timed(reference, obj, 1)
+            if expected != result:
+                raise AssertionError(f'{name}: 边界与对照实现不一致')
+            line += f' {reference_seconds * 1000:>10.3f}'
+        print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='图形边界基准测试')
+    parser.add_argument(
+        'cases', nargs='*', help=f'要运行的用例, 默认全部: {", ".join(CASES)}'
+    )
+    parser.add_argument(
+        '--sizes',
+        type=int,
+        nargs='+',
+        default=[1000, 4000, 16000, 64000],
+        help='点数, 默认 1000 4000 16000 64000',
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=5, help='重复次数, 默认 5'
+    )
+    parser.add_argument(
+        '--reference-limit',
+        type=int,
+        default=64000,
+        help='点数不超过该值时同时运行对照实现, 默认 64000',
+    )
+    args = parser.parse_args(argv)
+
+    cases = args.cases or list(CASES)
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        parser.error(f'未知的用例: {", ".join(unknown)}')
+    for name in cases:
+        run_case(name, args.sizes, args.repeat, args.reference_limit)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,346 @@
+"""
+文档生成基准测试
+
+通过 ``report.core.pdf.PDF`` 生成各类合成文档(段落、中文段落、表格、快速图形、
+重复图形、图片)以及完整的中文用户手册,
+记录耗时、每秒页数、每秒流对象数、内存峰值和文件大小,
+并与保存的基准结果比较, 在发布前发现性能退化.
+
+每个用例在独立的子进程中执行, 内存峰值互不影响.
+
+用法(在 user_guide_cn 目录下执行)::
+
+    # 运行全部用例
+    python -m benchmarks.build
+    # 指定规模和用例
+    python -m benchmarks.build -n 500 paragraphs cjk
+    # 保存为基准结果
+    python -m benchmarks.build --save baseline.json
+    # 与基准结果比较, 有退化时返回码为 1
+    python -m benchmarks.build --baseline baseline.json
+"""
+import os
+import re
+import sys
+import json
+import time
+import zlib
+import random
+import argparse
+import resource
+import subprocess
+import tempfile
+
+from reportlab.lib import colors
+from reportlab.lib.rl_accel import asciiBase85Decode
+from reportlab.graphics.shapes import Drawing
+from reportlab.graphics.charts.textlabels import Label
+from reportlab.platypus.tables import Table, TableStyle
+
+from report.components import constant
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMAGES_DIR = os.path.join(BASE_DIR, 'report', 'images')
+
+# 与基准比较的指标, 值越大越差
+COMPARED_METRICS = ('seconds', 'peak_rss_mb', 'size_kb')
+
+LOREM = (
+    'Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod '
+    'tempor incididunt ut labore et dolore magna aliqua. Ut enim ad minim '
+    'veniam, quis nostrud exercitation ullamco laboris nisi ut aliquip ex ea '
+    'commodo consequat. <b>Duis aute</b> irure dolor in <i>reprehenderit</i> '
+    'in voluptate velit esse cillum dolore eu fugiat nulla pariatur.'
+)
+
+CJK = (
+    'ReportLab 库根据您的图形命令直接创建PDF, 没有干预步骤. '
+    '您的应用程序可以非常快速地生成报告, 有时比传统的报告编写工具快几个数量级. '
+    '此外, 由于您正在使用功能强大的通用语言编写程序, '
+    '因此从何处获取数据, 如何转换数据以及输出的类型都没有任何限制. '
+    '<b>PDF是电子文档的全球标准</b>, 它支持高质量打印并且完全跨平台支持.'
+)
+
+
+def story_paragraphs(pdf, n):
+    for index in range(n):
+        if index % 20 == 0:
+            pdf.add_heading(f'Section {index // 20 + 1}', level=2)
+        pdf.add_paragraph(LOREM)
+
+
+def story_cjk(pdf, n):
+    for index in range(n):
+        if index % 20 == 0:
+            pdf.add_heading(f'第 {index // 20 + 1} 节', level=2)
+        pdf.add_paragraph(CJK)
+
+
+def story_tables(pdf, n):
+    rnd = random.Random(n)
+    style = TableStyle(
+        [
+            ('FONT', (0, 0), (-1, -1), pdf.font_regular, 9),
+            ('GRID', (0, 0), (-1, -1), 0.25, colors.grey),
+            ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+            ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+        ]
+    )
+    header = ['名称', 'Q1', 'Q2', 'Q3', 'Q4']
+    for index in range(n):
+        rows = [header] + [
+            [f'项目 {row}'] + [f'{rnd.uniform(0, 1000):.2f}' for _ in range(4)]
+            for row in range(10)
+        ]
+        pdf.add_flowable(Table(rows, style=style))
+        pdf.add_caption(f'表格 {index + 1}', category=constant.CAPTION_TABLE)
+
+
+def story_quick_charts(pdf, n):
+    rnd = random.Random(n)
+    chart_types = ('column', 'bar', 'linechart', 'pie', 'area', 'scatter')
+    names = ['A', 'B', 'C', 'D', 'E', 'F']
+    for index in range(n):
+        data = [[rnd.randint(10, 100) for _ in names] for _ in range(3)]
+        pdf.add_quick_chart(
+            data,
+            names,
+            series=['S1', 'S2', 'S3'],
+            width=400,
+            height=200,
+            chart_type=chart_types[index % len(chart_types)],
+            title=f'图形 {index + 1}',
+        )
+
+
+# 只有 setText 设置的文字不同的图形, 不能共用一个表单, 见 check_dashboard
+LABEL_TEXTS = ('ALPHA', 'BETA')
+
+
+def label_drawing(text):
+    drawing = Drawing(200, 40)
+    label = Label()
+    label.x = 100
+    label.y = 20
+    label.setText(text)
+    drawing.add(label)
+    return drawing
+
+
+def check_dashboard(filename):
+    """ 只有 setText 设置的文字不同的两个图形都要绘制出来 """
+    with open(filename, 'rb') as f:
+        data = f.read()
+    contents = []
+    for stream in re.findall(rb'stream\r?\n(.*?)endstream', data, re.S):
+        # 流按 ASCII85 和 Flate 编码, 不能解码的流(如图片)按原样检查
+        try:
+            contents.append(zlib.decompress(asciiBase85Decode(stream.strip())))
+        except (ValueError, zlib.error):
+            contents.append(stream)
+    contents = b''.join(contents)
+    for text in LABEL_TEXTS:
+        if f'({text})'.encode() not in contents:
+            raise AssertionError(f'dashboard: 图形 {text} 没有绘制')
+
+
+def story_dashboard(pdf, n):
+    """ 重复出现的相同图形, 如每页相同的 logo 图和迷你图 """
+    names = ['A', 'B', 'C', 'D', 'E', 'F']
+    data = [[10, 40, 25, 60, 45, 80], [30, 20, 50, 35, 70, 55]]
+    for index in range(n):
+        pdf.add_heading(f'Section {index + 1}', level=2)
+        pdf.add_quick_chart(
+            data,
+            names,
+            series=['S1', 'S2'],
+            width=400,
+            height=120,
+            chart_type=('linechart', 'column')[index % 2],
+            title='趋势',
+        )
+        pdf.add_paragraph(LOREM)
+    for text in LABEL_TEXTS:
+        pdf.add_draw(label_drawing(text), text)
+
+
+def story_images(pdf, n):
+    images = sorted(
+        os.path.join(IMAGES_DIR, name)
+        for name in os.listdir(IMAGES_DIR)
+        if name.endswith(('.gif', '.jpg', '.png'))
+    )
+    for index in range(n):
+        pdf.add_image(images[index % len(images)])
+
+
+def story_guide(pdf, n):
+    import gen_cn_user_guide
+
+    for chapter in gen_cn_user_guide.CHAPTERS:
+        chapter(pdf)
+
+
+CASES = {
+    'paragraphs': story_paragraphs,
+    'cjk': story_cjk,
+    'tables': story_tables,
+    'quick_charts': story_quick_charts,
+    'dashboard': story_dashboard,
+    'images': story_images,
+    'guide': story_guide,
+}
+
+# 生成文档后检查输出的用例
+CHECKS = {'dashboard': check_dashboard}
+
+
+def run_case(name, n, filename):
+    """ 在当前进程中执行一个用例 """
+    from report.core.pdf import PDF
+
+    start = time.perf_counter()
+    pdf = PDF(filename)
+    if name != 'guide':
+        pdf.add_title(name)
+        pdf.next_toc_template()
+        pdf.add_toc()
+        pdf.next_normal_template()
+        pdf.add_heading(name, level=1)
+    CASES[name](pdf, n)
+    flowables = len(pdf.store)
+    pdf.build_2_save()
+    seconds = time.perf_counter() - start
+    if name in CHECKS:
+        CHECKS[name](filename)
+
+    pages = pdf._doc.page
+    return {
+        'n': 0 if name == 'guide' else n,
+        'seconds': seconds,
+        'pages': pages,
+        'flowables': flowables,
+        'pages_per_second': pages / seconds,
+        'flowables_per_second': flowables / seconds,
+        # linux 下 ru_maxrss 的单位为 KB
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        / 1024,
+        'size_kb': os.path.getsize(filename) / 1024,
+    }
+
+
+def run_in_subprocess(name, n, output_dir):
+    output = subprocess.check_output(
+        [
+            sys.executable,
+            '-m',
+            'benchmarks.build',
+            '--worker',
+            '-n',
+            str(n),
+            '--output-dir',
+            output_dir,
+            name,
+        ],
+        cwd=BASE_DIR,
+    )
+    # 只取最后一行, 前面可能有文档生成时的日志
+    return json.loads(output.decode('utf8').strip().splitlines()[-1])
+
+
+def compare(results, baseline, tolerance):
+    """
+    与基准结果比较
+
+    @return: 退化的指标列表 [(用例, 指标, 基准值, 当前值)]
+    """
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if not base or base.get('n') != result['n']:
+            continue
+        for metric in COMPARED_METRICS:
+            if result[metric] > base[metric] * (1 + tolerance):
+                regressions.append((name, metric, base[metric], result[metric]))
+    return regressions
+
+
+def format_results(results, baseline=None):
+    lines = [
+        f'{"用例":<14} {"N":>5} {"耗时(s)":>8} {"页数":>5} {"页/秒":>8} '
+        f'{"流对象/秒":>10} {"内存(MB)":>9} {"大小(KB)":>9} {"耗时变化":>8}'
+    ]
+    for name, result in results.items():
+        change = ''
+        base = (baseline or {}).get(name)
+        if base and base.get('n') == result['n']:
+            change = f'{result["seconds"] / base["seconds"] - 1:+.1%}'
+        lines.append(
+            f'{name:<14} {result["n"]:>5} {result["seconds"]:>8.2f} '
+            f'{result["pages"]:>5} {result["pages_per_second"]:>8.1f} '
+            f'{result["flowables_per_second"]:>10.1f} '
+            f'{result["peak_rss_mb"]:>9.1f} {result["size_kb"]:>9.1f} '
+            f'{change:>8}'
+        )
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='文档生成基准测试')
+    parser.add_argument(
+        'cases', nargs='*', help=f'要运行的用例, 默认全部: {", ".join(CASES)}'
+    )
+    parser.add_argument(
+        '-n', type=int, default=100, help='合成文档的流对象规模, 默认 100'
+    )
+    parser.add_argument('--baseline', help='与此基准结果(JSON)比较')
+    parser.add_argument('--save', help='将结果保存为基准结果(JSON)')
+    parser.add_argument(
+        '--tolerance',
+        type=float,
+        default=0.1,
+        help='允许的退化比例, 默认 0.1 即 10%%',
+    )
+    parser.add_argument('--output-dir', help='生成文档的保存目录, 默认为临时目录')
+    parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    cases = args.cases or list(CASES)
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        parser.error(f'未知的用例: {", ".join(unknown)}')
+
+    if args.worker:
+        # 子进程: 执行一个用例, 最后一行输出结果
+        name = cases[0]
+        filename = os.path.join(args.output_dir, f'{name}.pdf')
+        print(json.dumps(run_case(name, args.n, filename)))
+        return 0
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        output_dir = args.output_dir or tmp_dir
+        os.makedirs(output_dir, exist_ok=True)
+        for name in cases:
+            results[name] = run_in_subprocess(name, args.n, output_dir)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding='utf8') as f:
+            baseline = json.load(f)
+    print(format_results(results, baseline))
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf8') as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+
+    if baseline:
+        regressions = compare(results, baseline, args.tolerance)
+        for name, metric, base, current in regressions:
+            print(f'退化: {name} {metric} {base:.2f} -> {current:.2f}')
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
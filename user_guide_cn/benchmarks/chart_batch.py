@@ -0,0 +1,109 @@
+"""
+批量渲染快速图形基准测试
+
+比较 report.core.graphics.quick_charts.renderCharts 在不同工作进程数量下的吞吐量,
+对照为在主进程中逐个调用 quickChart 并导出(Drawing.asString).
+
+图形为各种图形类型轮流使用的小图, 数据随机生成, 每个图形输出全部指定格式.
+
+用法(在 user_guide_cn 目录下执行)::
+
+    python -m benchmarks.chart_batch
+    python -m benchmarks.chart_batch --count 2000 --workers 4 8 --formats pdf png
+"""
+import sys
+import time
+import random
+import argparse
+
+from report.core.graphics.quick_charts import (
+    CHART_TYPES,
+    ChartSpec,
+    _renderChart,
+    renderCharts,
+)
+
+
+def make_specs(count, points=12, series=3):
+    """ 轮流使用各种图形类型的图形参数 """
+    rnd = random.Random(count)
+    for index in range(count):
+        data = [
+            [rnd.uniform(1, 100) for _ in range(points)] for _ in range(series)
+        ]
+        chart_type = CHART_TYPES[index % len(CHART_TYPES)]
+        yield ChartSpec(chart_type, 300, 200, data)
+
+
+def run_serial(count, formats):
+    """ 逐个渲染, 返回失败图形的错误信息列表 """
+    return [
+        result.error
+        for result in (
+            _renderChart(index, spec, formats)
+            for index, spec in enumerate(make_specs(count))
+        )
+        if result.error
+    ]
+
+
+def run_batch(count, formats, workers):
+    """ 用进程池渲染, 返回失败图形的错误信息列表 """
+    return [
+        result.error
+        for result in renderCharts(make_specs(count), formats, workers=workers)
+        if result.error
+    ]
+
+
+def report(name, count, seconds, errors):
+    print(
+        f'  {name:>10} {seconds:>9.2f} {count / seconds:>10.1f}'
+        f' {len(errors):>6}'
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='批量渲染快速图形基准测试')
+    parser.add_argument(
+        '--count', type=int, default=500, help='图形数量, 默认 500'
+    )
+    parser.add_argument(
+        '--workers',
+        type=int,
+        nargs='+',
+        default=[1, 2, 4],
+        help='工作进程数量, 默认 1 2 4',
+    )
+    parser.add_argument(
+        '--formats', nargs='+', default=['pdf'], help='输出格式, 默认 pdf'
+    )
+    args = parser.parse_args(argv)
+    formats = tuple(args.formats)
+
+    # 预热主进程, 避免把模块导入计入对照
+    _renderChart(0, next(make_specs(1)), formats)
+
+    print(f'{args.count} 个图形, 格式: {", ".join(formats)}')
+    print(f'  {"方式":>10} {"耗时(s)":>9} {"图形/秒":>10} {"失败":>6}')
+    failed = []
+    start = time.perf_counter()
+    errors = run_serial(args.count, formats)
+    report('serial', args.count, time.perf_counter() - start, errors)
+    failed.extend(errors)
+    for workers in args.workers:
+        start = time.perf_counter()
+        errors = run_batch(args.count, formats, workers)
+        seconds = time.perf_counter() - start
+        report(f'workers={workers}', args.count, seconds, errors)
+        failed.extend(errors)
+    if failed:
+        # 有图形失败时耗时没有意义, 输出第一个错误并以非零状态退出
+        print(f'{len(failed)} 个图形渲染失败, 第一个错误:', file=sys.stderr)
+        print(failed[0], file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+导入耗时基准测试
+
+在全新的子进程中导入模块, 多次运行取中位数, 分别记录:
+
+- reportlab: 先导入 report 依赖的 reportlab 模块(platypus、字体等)的耗时,
+  这部分由 reportlab 和 Pillow 决定, 是导入耗时的下限;
+- report: 之后再导入目标模块的耗时, 即 report 包自身的导入开销;
+- 导入后是否加载了应当延迟导入的模块(图形引擎、示例库等).
+
+report 自身的导入耗时超过 --budget 或加载了延迟导入的模块时返回码为 1.
+
+用法(在 user_guide_cn 目录下执行)::
+
+    python -m benchmarks.imports
+    python -m benchmarks.imports --repeat 10 --budget 50 report.core.pdf
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# report 依赖的 reportlab 模块
+REPORTLAB_MODULES = (
+    'reportlab.platypus',
+    'reportlab.pdfbase.pdfmetrics',
+    'reportlab.pdfbase.cidfonts',
+    'reportlab.pdfbase.ttfonts',
+)
+
+# 应当在第一次使用时才导入的模块
+DEFERRED_MODULES = (
+    'report.core.graphics.quick_charts',
+    'report.core.office_examples.charts',
+    'report.core.doc_examples',
+    'reportlab.graphics.charts',
+    'reportlab.graphics.testshapes',
+    'pypdf',
+)
+
+MODULES = ('report.core.pdf', 'report.core.parallel')
+
+WORKER = '''
+import sys, json, time
+start = time.perf_counter()
+for name in {reportlab_modules!r}:
+    __import__(name)
+middle = time.perf_counter()
+__import__({module!r})
+end = time.perf_counter()
+loaded = [
+    name for name in {deferred_modules!r}
+    if any(m == name or m.startswith(name + '.') for m in sys.modules)
+]
+print(json.dumps([middle - start, end - middle, loaded]))
+'''
+
+
+def measure(module):
+    """ 在子进程中导入一次模块, 返回 (reportlab 耗时, report 耗时, 已加载的延迟模块) """
+    code = WORKER.format(
+        reportlab_modules=REPORTLAB_MODULES,
+        deferred_modules=DEFERRED_MODULES,
+        module=module,
+    )
+    output = subprocess.check_output([sys.executable, '-c', code], cwd=BASE_DIR)
+    return json.loads(output.decode('utf8').strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='导入耗时基准测试')
+    parser.add_argument(
+        'modules', nargs='*', help=f'要导入的模块, 默认: {", ".join(MODULES)}'
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=5, help='每个模块导入的次数, 默认 5'
+    )
+    parser.add_argument(
+        '--budget',
+        type=float,
+        default=100,
+        help='report 自身导入耗时的上限(毫秒), 默认 100',
+    )
+    args = parser.parse_args(argv)
+
+    status = 0
+    print(f'{"模块":<24} {"reportlab(ms)":>14} {"report(ms)":>11} {"合计(ms)":>9}')
+    for module in args.modules or MODULES:
+        runs = [measure(module) for _ in range(args.repeat)]
+        reportlab_ms = statistics.median(run[0] for run in runs) * 1000
+        report_ms = statistics.median(run[1] for run in runs) * 1000
+        loaded = runs[-1][2]
+        print(
+            f'{module:<24} {reportlab_ms:>14.1f} {report_ms:>11.1f} '
+            f'{reportlab_ms + report_ms:>9.1f}'
+        )
+        if report_ms > args.budget:
+            print(f'  超出预算: {report_ms:.1f}ms > {args.budget:.1f}ms')
+            status = 1
+        if loaded:
+            print(f'  加载了应延迟导入的模块: {", ".join(loaded)}')
+            status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
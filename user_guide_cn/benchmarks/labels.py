@@ -0,0 +1,137 @@
+"""
+数据标签重叠检测基准测试
+
+比较标签数量增长时两种重叠检测的耗时, 检查找到的重叠相同:
+
+- 两两比较: 每对标签的边界都比较一次, O(n²)
+- 网格: report.core.graphics.label_placement.find_overlaps, 均匀网格索引
+
+并测量 place_labels 放置全部标签, 以及带大量数据标签的柱形图在 checkLabelOverlap
+开启前后的绘制耗时.
+
+用法(在 user_guide_cn 目录下执行)::
+
+    python -m benchmarks.labels
+    python -m benchmarks.labels --counts 1000 5000 20000 --bars 1200
+"""
+import sys
+import time
+import random
+import argparse
+
+from report.core.graphics.label_placement import (
+    around_moves,
+    boxes_overlap,
+    find_overlaps,
+    place_labels,
+)
+from report.core.graphics.quick_charts import quickChart
+
+
+def make_boxes(count, seed=0):
+    """ 随机的标签边界, 区域随数量增大, 密度不变 """
+    rnd = random.Random(seed)
+    side = (count * 400.0) ** 0.5
+    boxes = []
+    for _ in range(count):
+        x = rnd.uniform(0, side)
+        y = rnd.uniform(0, side)
+        boxes.append((x, y, x + rnd.uniform(10, 30), y + 8))
+    return boxes
+
+
+def pairwise_overlaps(boxes):
+    return [
+        (i, j)
+        for i in range(len(boxes))
+        for j in range(i + 1, len(boxes))
+        if boxes_overlap(boxes[i], boxes[j])
+    ]
+
+
+def timed(func, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def run_boxes(count, pairwise_limit):
+    boxes = make_boxes(count, count)
+    grid, pairs = timed(lambda: find_overlaps(boxes))
+    if count <= pairwise_limit:
+        pairwise, expected = timed(lambda: pairwise_overlaps(boxes))
+        if expected != pairs:
+            raise AssertionError(
+                f'{count} 个标签: 网格检测结果与两两比较不一致'
+            )
+        pairwise = f'{pairwise * 1000:>12.1f}'
+    else:
+        pairwise = f'{"-":>12}'
+    moves = [around_moves(box) for box in boxes]
+    place, offsets = timed(lambda: place_labels(boxes, moves))
+    hidden = offsets.count(None)
+    print(
+        f'  {count:>8} {len(pairs):>8} {pairwise} {grid * 1000:>10.1f}'
+        f' {place * 1000:>10.1f} {hidden:>8}'
+    )
+
+
+def run_chart(bars, repeat):
+    rnd = random.Random(bars)
+    data = [
+        [rnd.randint(100, 1000) for _ in range(bars // 2)] for _ in range(2)
+    ]
+    for check in (0, 1):
+        seconds, _ = timed(
+            lambda: quickChart(
+                'column',
+                1200,
+                400,
+                data,
+                dataLabelsType='values',
+                checkLabelOverlap=check,
+            ).asString('pdf'),
+            repeat,
+        )
+        print(
+            f'  柱形图 {bars} 个数据标签, checkLabelOverlap={check}:'
+            f' {seconds * 1000:.1f} ms'
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='数据标签重叠检测基准测试')
+    parser.add_argument(
+        '--counts',
+        type=int,
+        nargs='+',
+        default=[1000, 2000, 5000, 20000],
+        help='标签数量, 默认 1000 2000 5000 20000',
+    )
+    parser.add_argument(
+        '--pairwise-limit',
+        type=int,
+        default=5000,
+        help='超过该数量时不运行两两比较, 默认 5000',
+    )
+    parser.add_argument(
+        '--bars', type=int, default=1200, help='柱形图的数据标签数, 默认 1200'
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=3, help='柱形图重复次数, 默认 3'
+    )
+    args = parser.parse_args(argv)
+
+    print(
+        f'  {"标签数":>8} {"重叠数":>8} {"两两比较(ms)":>12} {"网格(ms)":>10}'
+        f' {"放置(ms)":>10} {"隐藏数":>8}'
+    )
+    for count in args.counts:
+        run_boxes(count, args.pairwise_limit)
+    run_chart(args.bars, args.repeat)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
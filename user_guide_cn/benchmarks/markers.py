@@ -0,0 +1,91 @@
+"""
+数据点标记盖印基准测试
+
+比较散点图、气泡图的点数增长时两种标记绘制方式的 PDF 大小和耗时, 检查图形边界相同:
+
+- 逐个: 每个数据点的标记都输出完整的路径
+- 盖印: report.core.graphics.markers, 标记定义为一个表单, 每个点只输出一次引用
+
+用法(在 user_guide_cn 目录下执行)::
+
+    python -m benchmarks.markers
+    python -m benchmarks.markers --points 1000 10000 50000 --kinds scatter
+"""
+import sys
+import time
+import random
+import argparse
+
+from report.core.graphics.layout import getBounds
+from report.core.graphics.quick_charts import quickChart
+
+
+def make_data(kind, points, seed=0):
+    """ 两个系列的随机数据, 第一行为 x, 气泡图每个系列后面跟着气泡大小 """
+    rnd = random.Random(seed)
+    data = [[rnd.uniform(0, 100) for _ in range(points)]]
+    for _ in range(2):
+        data.append([rnd.uniform(0, 100) for _ in range(points)])
+        if kind == 'bubble':
+            data.append([rnd.uniform(1, 10) for _ in range(points)])
+    return data
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def run(kind, points, repeat):
+    data = make_data(kind, points, points)
+    results = {}
+    for stamps in (False, True):
+        seconds, drawing = timed(
+            lambda: quickChart(kind, 500, 400, data, markerStamps=stamps),
+            repeat,
+        )
+        pdf, content = timed(lambda: drawing.asString('pdf'), repeat)
+        results[stamps] = seconds + pdf, len(content), getBounds(drawing)
+    if results[False][2] != results[True][2]:
+        raise AssertionError(f'{kind} {points} 个点: 盖印后图形边界不一致')
+    line = f'  {kind:>8} {points:>8}'
+    for stamps in (False, True):
+        seconds, size, _ = results[stamps]
+        line += f' {size / 1024:>10.1f} {seconds * 1000:>10.1f}'
+    print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='数据点标记盖印基准测试')
+    parser.add_argument(
+        '--points',
+        type=int,
+        nargs='+',
+        default=[1000, 5000, 20000],
+        help='每个系列的点数, 默认 1000 5000 20000',
+    )
+    parser.add_argument(
+        '--kinds',
+        nargs='+',
+        default=['scatter', 'bubble'],
+        help='图形类型, 默认 scatter bubble',
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=1, help='重复次数, 默认 1'
+    )
+    args = parser.parse_args(argv)
+
+    print(
+        f'  {"类型":>8} {"点数":>8} {"逐个(KB)":>10} {"逐个(ms)":>10}'
+        f' {"盖印(KB)":>10} {"盖印(ms)":>10}'
+    )
+    for kind in args.kinds:
+        for points in args.points:
+            run(kind, points, args.repeat)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+快速图形数据准备基准测试
+
+比较 quickChart 的数据以列表和 NumPy 数组传入时数据准备的耗时, 并检查结果一致:
+
+- normalize: 百分比堆积图的归一化(normalizeData)
+- series: 折线图、散点图的系列转换(blockToMultiSeries)
+- area: 堆积面积图的转换(getLinePlotArea)
+- labels: 数据标签(makeDataLabels), 主要耗时在逐个格式化标签
+- validate: QuickChart.configure 校验数据, 数组只检查类型
+
+需要安装 numpy.
+
+用法(在 user_guide_cn 目录下执行)::
+
+    python -m benchmarks.quick_charts
+    python -m benchmarks.quick_charts --series 20 --categories 1000 normalize
+"""
+import sys
+import time
+import argparse
+
+from report.core.graphics import quick_charts
+
+
+def case_normalize(data):
+    return quick_charts.normalizeData(data)
+
+
+def case_series(data):
+    return quick_charts.blockToMultiSeries(data[0], data[1:])
+
+
+def case_area(data):
+    chart = quick_charts.getLinePlotArea(
+        data=data,
+        seriesRelation='stacked',
+        chartColors=quick_charts.mainColours,
+    )
+    return chart.data
+
+
+def case_labels(data):
+    return quick_charts.makeDataLabels(
+        '%(value)s', data, None, None, None, 0, tryInt=1
+    )
+
+
+def case_validate(data):
+    return quick_charts.QuickChart().configure(data=data).data
+
+
+CASES = {
+    'normalize': case_normalize,
+    'series': case_series,
+    'area': case_area,
+    'labels': case_labels,
+    'validate': case_validate,
+}
+
+
+def _comparable(result):
+    """ 转换为可以直接比较的值: 数组和元组转换为列表 """
+    if hasattr(result, 'tolist'):
+        result = result.tolist()
+    if isinstance(result, (list, tuple)):
+        return [_comparable(item) for item in result]
+    if isinstance(result, float):
+        return round(result, 9)
+    return result
+
+
+def run_case(name, rows, repeat):
+    import numpy as np
+
+    timings = {}
+    outputs = {}
+    for label, data in (('列表', rows), ('数组', np.asarray(rows))):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            outputs[label] = CASES[name](data)
+        timings[label] = time.perf_counter() - start
+
+    if _comparable(outputs['列表']) != _comparable(outputs['数组']):
+        raise AssertionError(f'{name}: 数组的结果与列表不一致')
+
+    print(f'{name}: 重复 {repeat} 次')
+    print(f'  列表: {timings["列表"]:.3f}s')
+    print(f'  数组: {timings["数组"]:.3f}s')
+    print(f'  加速比: {timings["列表"] / timings["数组"]:.1f}x')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='快速图形数据准备基准测试')
+    parser.add_argument(
+        'cases', nargs='*', help=f'要运行的用例, 默认全部: {", ".join(CASES)}'
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=5, help='重复次数, 默认 5'
+    )
+    parser.add_argument(
+        '--series', type=int, default=10, help='系列数, 默认 10'
+    )
+    parser.add_argument(
+        '--categories',
+        type=int,
+        default=2000,
+        help='每个系列的数据点数, 默认 2000',
+    )
+    args = parser.parse_args(argv)
+
+    cases = args.cases or list(CASES)
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        parser.error(f'未知的用例: {", ".join(unknown)}')
+
+    columns = range(args.categories)
+    rows = [
+        [float((row * 7919 + col * 104729) % 97 + 1) for col in columns]
+        for row in range(args.series)
+    ]
+    print(f'数据: {args.series} 个系列, 每个系列 {args.categories} 个数据点')
+    for name in cases:
+        run_case(name, rows, args.repeat)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,134 @@
+"""
+t_parse.Template 基准测试
+
+比较逐个扫描(compiled=False)和编译为正则表达式两种模式的耗时, 并检查结果一致:
+
+- guide: 以中文用户手册中的全部字符串为输入, 按 quick_fix 的方式解析 $…$ 和 ^…^ 片段
+- records: 以 t_parse 文档中的 ssnum 模板解析多指令的记录
+
+用法(在 user_guide_cn 目录下执行)::
+
+    python -m benchmarks.t_parse
+    python -m benchmarks.t_parse --repeat 20 guide
+"""
+import os
+import ast
+import sys
+import time
+import random
+import argparse
+
+from report.components.t_parse import Template, _int, _str
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+GUIDE_FILE = os.path.join(BASE_DIR, 'gen_cn_user_guide.py')
+
+
+def guide_texts():
+    """ 用户手册源码中的全部字符串常量 """
+    with open(GUIDE_FILE, encoding='utf8') as f:
+        tree = ast.parse(f.read())
+    return [
+        node.value
+        for node in ast.walk(tree)
+        if isinstance(node, ast.Constant) and isinstance(node.value, str)
+    ]
+
+
+def record_texts(n=5000):
+    """ 与 ssnum 模板匹配的记录 """
+    rnd = random.Random(n)
+    return [
+        f'ssnum: {rnd.randint(100, 999)}-{rnd.randint(10, 99)}-'
+        f'{rnd.randint(1000, 9999)}, fn=Name{index}, ln=Family{index}, '
+        f"age={rnd.randint(1, 99)}, quote='quote {index}'"
+        for index in range(n)
+    ]
+
+
+CASES = {
+    'guide': (
+        guide_texts,
+        lambda compiled: [
+            Template('X$X$', 'X', compiled=compiled),
+            Template('X^X^', 'X', compiled=compiled),
+        ],
+    ),
+    'records': (
+        record_texts,
+        lambda compiled: [
+            Template(
+                'ssnum: NNN-NN-NNNN, fn=X, ln=X, age=I, quote=Q',
+                'X',
+                'N',
+                compiled=compiled,
+                I=_int,
+                Q=_str,
+            )
+        ],
+    ),
+}
+
+
+def parse_all(templates, texts):
+    """ 与 quick_fix 相同的解析循环, 返回全部解析结果 """
+    results = []
+    for template in templates:
+        for text in texts:
+            fragment = text
+            while fragment:
+                try:
+                    matches, index = template.PARSE(fragment)
+                except ValueError:
+                    break
+                results.append(matches)
+                fragment = fragment[index:]
+    return results
+
+
+def run_case(name, repeat):
+    get_texts, get_templates = CASES[name]
+    texts = get_texts()
+    timings = {}
+    outputs = {}
+    for compiled in (False, True):
+        templates = get_templates(compiled)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            outputs[compiled] = parse_all(templates, texts)
+        timings[compiled] = time.perf_counter() - start
+
+    if outputs[False] != outputs[True]:
+        raise AssertionError(f'{name}: 编译模式的解析结果与逐个扫描不一致')
+
+    size = sum(len(text) for text in texts)
+    print(
+        f'{name}: {len(texts)} 个字符串, {size} 个字符, '
+        f'{len(outputs[True])} 个片段, 重复 {repeat} 次'
+    )
+    print(f'  逐个扫描: {timings[False]:.3f}s')
+    print(f'  编译正则: {timings[True]:.3f}s')
+    print(f'  加速比: {timings[False] / timings[True]:.1f}x')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='t_parse.Template 基准测试')
+    parser.add_argument(
+        'cases', nargs='*', help=f'要运行的用例, 默认全部: {", ".join(CASES)}'
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=10, help='重复次数, 默认 10'
+    )
+    args = parser.parse_args(argv)
+
+    cases = args.cases or list(CASES)
+    unknown = [name for name in cases if name not in CASES]
+    if unknown:
+        parser.error(f'未知的用例: {", ".join(unknown)}')
+    for name in cases:
+        run_case(name, args.repeat)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
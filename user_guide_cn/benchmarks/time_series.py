@@ -0,0 +1,111 @@
+"""
+时间序列坐标轴基准测试
+
+比较日数据的 x 坐标轴配置(刻度、标签)和整个图形的绘制耗时, 检查结果一致:
+
+- 对照: reportlab 的 SimpleTimeSeriesPlot, x 值为 yyyymmdd 整数
+- epoch: report.core.graphics.time_series.EpochDayTimeSeriesPlot, x 值为 epoch 日
+
+用法(在 user_guide_cn 目录下执行)::
+
+    python -m benchmarks.time_series
+    python -m benchmarks.time_series --years 1 10 50 --daily-freq
+"""
+import sys
+import time
+import random
+import argparse
+
+from reportlab.graphics.charts.lineplots import SimpleTimeSeriesPlot
+from reportlab.graphics.shapes import Drawing
+
+from report.core.graphics.time_series import (
+    EpochDayTimeSeriesPlot,
+    epoch_date,
+    epoch_day,
+)
+
+
+def make_drawing(plot_class, days, values, daily_freq):
+    chart = plot_class()
+    chart.width = 400
+    chart.height = 200
+    chart.xValueAxis.dailyFreq = daily_freq
+    chart.data = [list(zip(days, values))]
+    drawing = Drawing(450, 250)
+    drawing.add(chart, 'chart')
+    return drawing
+
+
+def timed(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def run(years, daily_freq, repeat):
+    rnd = random.Random(years)
+    start = epoch_day(20000101)
+    days = list(range(start, start + int(365.25 * years)))
+    values = [rnd.uniform(50, 150) for _ in days]
+    dates = [int(epoch_date(day).strftime('%Y%m%d')) for day in days]
+
+    results = {}
+    for name, plot_class, x in (
+        ('对照', SimpleTimeSeriesPlot, dates),
+        ('epoch', EpochDayTimeSeriesPlot, days),
+    ):
+        drawing = make_drawing(plot_class, x, values, daily_freq)
+        axis = drawing.chart.xValueAxis
+        axis.setPosition(0, 0, 400)
+        # 对照的坐标轴会把数据点原地转换为 NormalDate, 每次使用新的数据
+        configure, labels = timed(
+            lambda: axis.configure([list(zip(x, values))])
+            or axis._labelTextFormat,
+            repeat,
+        )
+        draw, _ = timed(
+            lambda: make_drawing(plot_class, x, values, daily_freq).asString(
+                'pdf'
+            ),
+            repeat,
+        )
+        results[name] = configure, draw, labels
+    if results['对照'][2] != results['epoch'][2]:
+        raise AssertionError(f'{years} 年: 刻度标签与对照不一致')
+    line = f'  {years:>6} {len(days):>8}'
+    for name in results:
+        configure, draw, _ = results[name]
+        line += f' {configure * 1000:>10.2f} {draw * 1000:>10.1f}'
+    print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='时间序列坐标轴基准测试')
+    parser.add_argument(
+        '--years',
+        type=int,
+        nargs='+',
+        default=[1, 5, 20],
+        help='日数据的年数, 默认 1 5 20',
+    )
+    parser.add_argument(
+        '--daily-freq', action='store_true', help='按月末取刻度(dailyFreq)'
+    )
+    parser.add_argument(
+        '--repeat', type=int, default=3, help='重复次数, 默认 3'
+    )
+    args = parser.parse_args(argv)
+
+    print(
+        f'  {"年数":>6} {"点数":>8} {"对照配置(ms)":>10} {"对照绘制(ms)":>10}'
+        f' {"epoch配置(ms)":>10} {"epoch绘制(ms)":>10}'
+    )
+    for years in args.years:
+        run(years, args.daily_freq, args.repeat)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,12 +1,12 @@
 import os
 import logging
+import argparse
 from datetime import datetime
 
 import reportlab
 from reportlab import rl_config
 from reportlab.lib import colors
 from reportlab.lib.styles import ParagraphStyle
-from reportlab.lib.codecharts import SingleByteEncodingChart
 from reportlab.pdfbase.pdfmetrics import registerFontFamily
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
@@ -16,36 +16,22 @@ from reportlab.platypus.paraparser import (
     _paraAttrMap,
     _bulletAttrMap,
 )
-from reportlab.graphics.shapes import Drawing
-from reportlab.graphics import widgetbase
 from reportlab.platypus.flowables import Spacer, Image
 from reportlab.lib.units import inch
 from reportlab.rl_config import defaultPageSize
+
+# testshapes 导入时注册 Vera 字体, 在文档字体之前导入,
+# 第 3 章 getAvailableFonts 示例列出的字体与之前相同
 from reportlab.graphics import testshapes
-from reportlab.graphics.shapes import (
-    Drawing,
-    Line,
-    PolyLine,
-    String,
-    Group,
-    mmult,
-    translate,
-    rotate,
-)
-from reportlab.graphics.charts.piecharts import sample5, sample7, sample8
 
 from report.components import constant
-from report.core import doc_examples
-from report.core.office_examples.charts import (
-    lines as of_ex_lines,
-    pie as of_ex_pie,
-    scatter as of_ex_scatter,
-    bar as of_ex_bar,
-    quick_charts as of_ex_quick_charts,
-    area as of_ex_area,
-)
 from report.core.pdf import PDF
+from report.core.parallel import build_in_parallel
+from report.core.graphics import text_metrics
+
 
+# 手册中 reportlab 图表内部测量文字时也使用缓存, 在模块级别替换, 并行构建的工作进程同样生效
+text_metrics.install()
 
 BASE_DIR = os.path.dirname(__file__)
 IMAGES_DIR = os.path.join(BASE_DIR, 'report', 'images')
@@ -421,6 +407,8 @@ and many more."""
 
 
 def chapter2_overview(pdf):
+    from report.core import doc_examples
+
     pdf.add_heading("使用 $pdfgen$ 生成图形和文本", level=1)
     pdf.add_heading("基本概念", level=2)
     pdf.add_paragraph(
@@ -1217,6 +1205,9 @@ def chapter2_overview(pdf):
 
 
 def chapter3_font(pdf):
+    from reportlab.lib.codecharts import SingleByteEncodingChart
+    from report.core import doc_examples
+
     pdf.add_heading("字体和编码", level=1)
     pdf.add_paragraph(
         '本章包括字体、编码和亚洲语言功能。'
@@ -1673,6 +1664,8 @@ data
 
 
 def chapter4_special_features(pdf):
+    from report.core import doc_examples
+
     pdf.add_heading("PDF的特殊功能", level=1)
     pdf.add_paragraph("PDF提供了许多功能，使电子文档的浏览更加高效和舒适，我们的类库就公开了其中的一些功能。")
 
@@ -2649,6 +2642,8 @@ def chapter4_special_features(pdf):
 
 
 def chapter5_platypus(pdf):
+    from report.core import doc_examples
+
     pdf.add_heading("PLATYPUS - 页面布局和排版", level=1)
     pdf.add_heading("设计目标", level=2)
     pdf.add_paragraph(
@@ -4578,6 +4573,8 @@ t = ListFlowable(
 
 
 def chapter9_useful_flowables(pdf):
+    from report.core import doc_examples
+
     pdf.add_heading("编写 $Flowable$ ")
     pdf.add_paragraph(
         '$Flowables$旨在成为创建可重复使用的报表内容的开放标准，您可以轻松创建自己的对象。 '
@@ -4641,6 +4638,18 @@ I.hAlign = 'CENTER'
 
 
 def chapter10_graph(pdf):
+    from reportlab.graphics import widgetbase
+    from reportlab.graphics.charts.piecharts import sample5, sample7, sample8
+    from reportlab.graphics.shapes import (
+        Drawing,
+        Line,
+        String,
+        Group,
+        mmult,
+        translate,
+        rotate,
+    )
+
     pdf.add_heading("绘制", level=1)
     pdf.add_heading("简介", level=2)
     pdf.add_paragraph(
@@ -7211,6 +7220,8 @@ def chapter13_appendix_font(pdf):
 
 
 def chapter14_appendix_line(pdf):
+    from report.core.office_examples.charts import lines as of_ex_lines
+
     pdf.add_appendix("官方示例: Line")
 
     pdf.add_paragraph(
@@ -7249,6 +7260,8 @@ def chapter14_appendix_line(pdf):
 
 
 def chapter15_appendix_pie(pdf):
+    from report.core.office_examples.charts import pie as of_ex_pie
+
     pdf.add_appendix("官方示例: Pie")
 
     pdf.add_paragraph(
@@ -7297,6 +7310,8 @@ def chapter15_appendix_pie(pdf):
 
 
 def chapter16_appendix_scatter(pdf):
+    from report.core.office_examples.charts import scatter as of_ex_scatter
+
     pdf.add_appendix("官方示例: Scatter")
 
     pdf.add_paragraph(
@@ -7313,6 +7328,8 @@ def chapter16_appendix_scatter(pdf):
 
 
 def chapter17_appendix_bar(pdf):
+    from report.core.office_examples.charts import bar as of_ex_bar
+
     pdf.add_appendix("官方示例: bar")
 
     pdf.add_paragraph(
@@ -7410,6 +7427,10 @@ def chapter17_appendix_bar(pdf):
 
 
 def chapter18_appendix_quick_charts(pdf):
+    from report.core.office_examples.charts import (
+        quick_charts as of_ex_quick_charts,
+    )
+
     pdf.add_appendix("官方示例: quickcharts")
 
     pdf.add_paragraph(
@@ -7647,6 +7668,8 @@ def chapter18_appendix_quick_charts(pdf):
 
 
 def chapter19_appendix_area(pdf):
+    from report.core.office_examples.charts import area as of_ex_area
+
     pdf.add_appendix("官方示例: Area")
 
     pdf.add_paragraph(
@@ -7666,7 +7689,38 @@ def chapter19_appendix_area(pdf):
     pdf.add_caption('面积动态标签图', category=constant.CAPTION_IMAGE)
 
 
-def main(filename):
+CHAPTERS = (
+    chapter1_introduction,
+    chapter2_overview,
+    chapter3_font,
+    chapter4_special_features,
+    chapter5_platypus,
+    chapter6_paragraph,
+    chapter7_table,
+    chapter8_flowables,
+    chapter9_useful_flowables,
+    chapter10_graph,
+    chapter11,
+    chapter12_appendix_mode,
+    chapter13_appendix_font,
+    chapter14_appendix_line,
+    chapter15_appendix_pie,
+    chapter16_appendix_scatter,
+    chapter17_appendix_bar,
+    chapter18_appendix_quick_charts,
+    chapter19_appendix_area,
+)
+
+
+def main(filename, workers=None, cache_dir=None, profile=None):
+    """
+    生成用户手册
+
+    @param filename: 输出文件名
+    @param workers: 并行构建的进程数量, 为 None 时顺序构建
+    @param cache_dir: 并行构建时的分段缓存目录, 为 None 时不缓存
+    @param profile: 顺序构建时统计流对象排版耗时, 结果文件名前缀
+    """
     # 封面图片和版权信息
     logo = os.path.join(IMAGES_DIR, 'replogo.gif')
     copyrights = (
@@ -7677,36 +7731,62 @@ def main(filename):
         '',
         '翻译整理: Hello wac',
     )
+
+    if workers is not None:
+        build_in_parallel(
+            filename,
+            CHAPTERS,
+            workers=workers or None,
+            cache_dir=cache_dir,
+            cover_image=logo,
+            copyrights=copyrights,
+            pagesize=defaultPageSize,
+        )
+        return
+
     pdf = PDF(
         filename,
         cover_image=logo,
         copyrights=copyrights,
         pagesize=defaultPageSize,
+        toc_sidecar=f'{filename}.toc.json',
+        profile=profile,
     )
 
-    chapter1_introduction(pdf)
-    chapter2_overview(pdf)
-    chapter3_font(pdf)
-    chapter4_special_features(pdf)
-    chapter5_platypus(pdf)
-    chapter6_paragraph(pdf)
-    chapter7_table(pdf)
-    chapter8_flowables(pdf)
-    chapter9_useful_flowables(pdf)
-    chapter10_graph(pdf)
-    chapter11(pdf)
-    chapter12_appendix_mode(pdf)
-    chapter13_appendix_font(pdf)
-    chapter14_appendix_line(pdf)
-    chapter15_appendix_pie(pdf)
-    chapter16_appendix_scatter(pdf)
-    chapter17_appendix_bar(pdf)
-    chapter18_appendix_quick_charts(pdf)
-    chapter19_appendix_area(pdf)
+    for chapter in CHAPTERS:
+        chapter(pdf)
     pdf.build_2_save()
 
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='生成中文版用户手册')
+    parser.add_argument('filename', nargs='?', default='test2.pdf')
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        type=int,
+        default=None,
+        help='按章节并行构建的进程数量, 0 表示使用全部 cpu 核数',
+    )
+    parser.add_argument(
+        '--cache-dir',
+        default=os.path.join(BASE_DIR, '.build_cache'),
+        help='并行构建时的分段缓存目录, 未变化的章节直接复用上次的排版结果',
+    )
+    parser.add_argument(
+        '--no-cache', action='store_true', help='并行构建时不使用分段缓存'
+    )
+    parser.add_argument(
+        '--profile',
+        metavar='PREFIX',
+        help='顺序构建时统计流对象排版耗时, 保存到 PREFIX.txt 和 PREFIX.json',
+    )
+    args = parser.parse_args()
 
     setup_logging()
-    main('test2.pdf')
+    main(
+        args.filename,
+        workers=args.jobs,
+        cache_dir=None if args.no_cache else args.cache_dir,
+        profile=args.profile,
+    )
@@ -0,0 +1,141 @@
+"""
+对象内容指纹
+
+递归遍历对象的内容(类型、属性、容器元素、函数代码等)计算摘要,
+内容相同的对象得到相同的指纹, 且不受进程、对象地址的影响.
+用于判断流对象、图形是否发生变化.
+"""
+import os
+import types
+import hashlib
+
+from reportlab.platypus import Paragraph, Image
+
+_SCALAR_TYPES = (type(None), bool, int, float, complex, str, bytes)
+_FUNCTION_TYPES = (
+    types.FunctionType,
+    types.BuiltinFunctionType,
+    types.MethodType,
+    types.CodeType,
+)
+
+
+class _Hasher(object):
+    def __init__(self):
+        self._hash = hashlib.md5()
+        # 已访问的对象 {id: 序号}, 同一对象再次出现时只记录序号, 也避免循环引用
+        self._seen = {}
+        # 保持引用, 避免临时对象被回收后 id 被复用
+        self._keep = []
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
+    def _write(self, *tokens):
+        for token in tokens:
+            self._hash.update(str(token).encode('utf8', 'surrogatepass'))
+            self._hash.update(b'\0')
+
+    def feed(self, obj):
+        if isinstance(obj, _SCALAR_TYPES):
+            self._write(type(obj).__name__, repr(obj))
+            return
+        if isinstance(obj, type):
+            self._write('type', obj.__module__, obj.__qualname__)
+            return
+
+        if id(obj) in self._seen:
+            self._write('ref', self._seen[id(obj)])
+            return
+        self._seen[id(obj)] = len(self._seen)
+        self._keep.append(obj)
+
+        cls = type(obj)
+        self._write(cls.__module__, cls.__qualname__)
+        if isinstance(obj, (list, tuple)):
+            self._write(len(obj))
+            for item in obj:
+                self.feed(item)
+        elif isinstance(obj, (set, frozenset)):
+            self._write(len(obj))
+            for item in sorted(obj, key=fingerprint):
+                self.feed(item)
+        elif isinstance(obj, dict):
+            self._feed_items(obj)
+        elif isinstance(obj, _FUNCTION_TYPES):
+            self._feed_function(obj)
+        elif hasattr(obj, 'dtype') and hasattr(obj, 'tobytes'):
+            # NumPy 数组, repr 会省略大数组的中间部分, 按数据计算
+            self._write(obj.dtype.str, getattr(obj, 'shape', ()))
+            if obj.dtype.kind == 'O':
+                self.feed(obj.tolist())
+            else:
+                self._hash.update(obj.tobytes())
+        elif isinstance(obj, Paragraph):
+            # frags 由 text 和 style 解析得到, 不必重复计算
+            self._feed_items(
+                {
+                    'text': obj.text,
+                    'style': obj.style,
+                    'bulletText': obj.bulletText,
+                    'caseSensitive': obj.caseSensitive,
+                }
+            )
+        elif isinstance(obj, Image):
+            self._feed_items(vars(obj))
+            self._feed_file(obj.filename)
+        elif hasattr(obj, '__dict__'):
+            # 包括 reportlab 的图形和组件: 按实例的全部属性计算, 包括私有属性,
+            # getProperties 只含 _attrMap 中的属性, 不含 Label.setText 设置的 _text 等
+            self._feed_items(vars(obj))
+        elif callable(getattr(obj, 'getProperties', None)):
+            self._feed_items(obj.getProperties(recur=0))
+        elif cls.__repr__ is not object.__repr__:
+            self._write(repr(obj))
+
+    def _feed_items(self, mapping):
+        self._write(len(mapping))
+        for key in sorted(mapping, key=repr):
+            self.feed(key)
+            self.feed(mapping[key])
+
+    def _feed_function(self, func):
+        if isinstance(func, types.MethodType):
+            self.feed(func.__self__)
+            func = func.__func__
+        if isinstance(func, types.CodeType):
+            self._write(func.co_name, func.co_names, func.co_varnames)
+            self._write(func.co_code.hex())
+            self.feed(func.co_consts)
+            return
+        self._write(
+            getattr(func, '__module__', None), getattr(func, '__qualname__', None)
+        )
+        code = getattr(func, '__code__', None)
+        if code is not None:
+            self.feed(code)
+            self.feed(func.__defaults__)
+            self.feed(func.__kwdefaults__)
+            for cell in func.__closure__ or ():
+                try:
+                    self.feed(cell.cell_contents)
+                except ValueError:  # 尚未赋值的闭包变量
+                    self.feed(None)
+
+    def _feed_file(self, path):
+        """ 文件按路径、大小和修改时间计算 """
+        if isinstance(path, str) and os.path.isfile(path):
+            stat = os.stat(path)
+            self._write('file', stat.st_size, stat.st_mtime_ns)
+
+
+def fingerprint(*objects):
+    """
+    计算对象的内容指纹
+
+    @param objects: 任意对象, 多个对象按顺序一起计算
+    @return: 16进制摘要字符串
+    """
+    hasher = _Hasher()
+    hasher.feed(objects)
+    return hasher.hexdigest()
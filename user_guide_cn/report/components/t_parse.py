@@ -78,6 +78,11 @@ Template directives:
 (['123', '45', '6789', 'Aaron', 'Watters', '13', "'do be do be do'"], 72)
 >>>
 
+  By default the template is also compiled into a single regular expression
+  at construction time, so PARSE is one match call and raises ValueError
+  when it doesn't match.  Pass compiled=False to scan the parse sequence
+  instead, whose ValueError tells which directive failed.
+
 """
 
 import re
@@ -155,6 +160,10 @@ from reportlab.lib.utils import ascii_letters
     >>> T.PARSE("ssnum: 123-45-6789, fn=Aaron, ln=Watters, age=13, quote='do bedo be do'")
     (['123', '45', '6789', 'Aaron', 'Watters', '13', "'do be do be do'"], 72)
     >>>
+
+    默认情况下, 模板在初始化时还会被编译为一个等价的正则表达式, PARSE 只需一次匹配,
+    不匹配时抛出 ValueError. 传入 compiled=False 时逐个扫描解析序列,
+    ValueError 信息会指出哪个指令解析失败.
 """
 
 # some useful regular expressions
@@ -177,6 +186,7 @@ class Template:
         template,
         wild_card_marker=None,
         single_char_marker=None,
+        compiled=True,
         **marker_to_regex_dict,
     ):
         self.template = template
@@ -247,8 +257,81 @@ class Template:
             lastchar = template[index - 1]
         self.parse_seq = parse_seq
         self.ndirectives = ndirectives
+        # literals every match must contain (匹配的字符串必须包含的文字)
+        self.literals = [
+            data for indicator, data in parse_seq if indicator is None
+        ]
+        # scan lets single char directives run past the end of the string
+        # (逐个扫描时单字符指令可以超出字符串末尾)
+        self.has_single_char = any(
+            indicator == self.char for indicator, _ in parse_seq
+        )
+        # compile into one regular expression (编译为一个正则表达式)
+        self.pattern = self.compile() if compiled else None
+
+    def compile(self):
+        """
+        build one regular expression equivalent to the parse sequence,
+        or None if the markers' regular expressions can't be embedded
+        (构建与解析序列等价的正则表达式, 无法嵌入标记的正则时返回 None)
+        """
+        wild_card = self.wild_card
+        parse_seq = self.parse_seq
+        parts = []
+        groups = 0
+        for parse_index, (indicator, data) in enumerate(parse_seq):
+            if indicator is None:
+                parts.append(re.escape(data))
+                continue
+            group = f'_d{groups}'
+            groups = groups + 1
+            if indicator == wild_card:
+                if parse_index == len(parse_seq) - 1:
+                    # the rest of the string (字符串的其余部分)
+                    body = '.*'
+                else:
+                    # stop at the first match of the next directive, like
+                    # s.find / re.search (在下一个指令第一次匹配处结束)
+                    nextindicator, nextdata = parse_seq[parse_index + 1]
+                    if nextindicator is None:
+                        if len(nextdata) == 1:
+                            body = f'[^{re.escape(nextdata)}]*'
+                        else:
+                            body = f'(?:(?!{re.escape(nextdata)}).)*'
+                    else:
+                        body = f'(?:(?!{nextdata.pattern}).)*'
+                parts.append(f'(?P<{group}>{body})')
+            elif indicator == self.char:
+                parts.append(f'(?P<{group}>.{{{data}}})')
+            else:
+                if data.groups or data.flags & ~re.UNICODE:
+                    return None
+                # a lookahead doesn't backtrack, so the directive keeps the
+                # match found by re.match (前瞻不会回溯, 与 re.match 的结果一致)
+                parts.append(f'(?=(?P<{group}>{data.pattern}))(?P={group})')
+        return re.compile(''.join(parts), re.DOTALL)
 
     def PARSE(self, s, start=0):
+        pattern = self.pattern
+        if pattern is None:
+            return self.scan(s, start)
+        # a missing literal can't match, skip the regex
+        # (缺少文字时不可能匹配, 跳过正则)
+        for literal in self.literals:
+            if s.find(literal, start) < 0:
+                break
+        else:
+            match = pattern.match(s, start)
+            if match is not None:
+                return list(match.groups()), match.end()
+            if self.has_single_char:
+                return self.scan(s, start)
+        raise ValueError(
+            "template doesn't match at (模板不匹配) " + repr((start, self.template))
+        )
+
+    def scan(self, s, start=0):
+        """ scan the parse sequence (逐个扫描解析序列) """
         ndirectives = self.ndirectives
         wild_card = self.wild_card
         single_char = self.char
@@ -298,28 +381,25 @@ class Template:
                         else:
                             # data is a re, search for it
                             # 数据是一个re，搜索它
-                            last = nextdata.search(s, currentindex)
-                            if last < currentindex:
+                            match = nextdata.search(s, currentindex)
+                            if match is None:
                                 raise ValueError(
                                     "couldn't terminate wild with re (无法用正则解析)"
                                     + repr(currentindex)
                                 )
+                            last = match.start()
                 elif indicator == single_char:
                     # data is length to eat (数据长度刚刚好)
                     last = currentindex + data
                 else:
                     # other directives are always regular expressions
                     # 其他指令始终是正则表达式
-                    print(
-                        f'data: {data} \n'
-                        f's: {s} \n'
-                        f'currentindex: {currentindex}'
-                    )
-                    last = data.match(s, currentindex) + currentindex
-                    if last < currentindex:
+                    match = data.match(s, currentindex)
+                    if match is None:
                         raise ValueError(
                             "couldn't match re at(无法正则匹配) " + repr(currentindex)
                         )
+                    last = match.end()
                 # print("accepting", s[currentindex:last])
                 result[current_directive_index] = s[currentindex:last]
                 current_directive_index = current_directive_index + 1
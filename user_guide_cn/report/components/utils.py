@@ -1,16 +1,18 @@
 import os
+import re
 import json
 import logging
 
+from functools import lru_cache
 from contextlib import redirect_stderr
 # from fontTools import ttLib
 
-from report.components.t_parse import Template
-
 logger = logging.getLogger(__name__)
 
-QF_CODE_TEMPLATE = Template("X$X$", "X")
-QF_REP_TEMPLATE = Template("X^X^", "X")
+# quick_fix 的代码($)和可替换参数(^)标记
+QF_MARKER_RE = re.compile(r'[$^]')
+# quick_fix 缓存的文本数
+QF_CACHE_SIZE = 8192
 
 
 def find_font_name(font_path):
@@ -50,44 +52,55 @@ def find_file_name(file_path):
     return name
 
 
+@lru_cache(maxsize=QF_CACHE_SIZE)
 def quick_fix(text, code_font):
     """inside text find any subsequence of form $subsequence$.
     Format the subsequence as code.  If similarly if text contains ^arg^
     format the arg as replaceable.  The escape sequence for literal
     $ is $\\$ (^ is ^\\^.
+
+    一遍扫描同时处理 $ 和 ^ 两种标记: 同种标记按出现顺序两两配对,
+    配对的两个标记之间恰好为 \\ 时视为转义, 原样保留; 未配对的标记也原样保留.
+    结果按 (text, code_font) 缓存.
+    """
+    markups = {
+        # Courier, 粗体
+        '$': (f'<font name={code_font}><nobr>', '</nobr></font>'),
+        # 斜体，不支持中文
+        '^': ('<font name=Courier><i><nobr>', '</nobr></i></font>'),
+    }
+
+    parts = []
+    # 未配对标记: {标记: (在 text 中的位置, 在 parts 中的位置)}
+    opened = {}
+    last = 0
+    for match in QF_MARKER_RE.finditer(text):
+        marker = match.group()
+        index = match.start()
+        parts.append(text[last:index])
+        last = index + 1
+        if marker not in opened:
+            opened[marker] = (index, len(parts))
+            parts.append(marker)
+            continue
+
+        open_index, part_index = opened.pop(marker)
+        if text[open_index + 1 : index] == '\\':
+            parts.append(marker)
+        else:
+            open_tag, close_tag = markups[marker]
+            parts[part_index] = open_tag
+            parts.append(close_tag)
+    parts.append(text[last:])
+    return ''.join(parts)
+
+
+def quick_fix_batch(texts, code_font):
+    """
+    批量处理 quick_fix 标记
+
+    @param texts: 文本列表
+    @param code_font: 代码字体名称
+    @return: 处理后的文本列表
     """
-    # logger.info('<<' + '=' * 100)
-    # logger.info(f'text: {text}')
-
-    # Courier
-    code_subst = f"%s<font name={code_font}><nobr>%s</nobr></font>"  # 粗体
-    qf_subst = f"%s<font name=Courier><i><nobr>%s</nobr></i></font>"  #
-    # 斜体，不支持中文
-
-    for (template, subst) in [
-        (QF_CODE_TEMPLATE, code_subst),
-        (QF_REP_TEMPLATE, qf_subst),
-    ]:
-        fragment = text
-        parts = []
-        try:
-            while fragment:
-                try:
-                    matches, index = template.PARSE(fragment)
-                except Exception as e:
-                    raise ValueError
-                else:
-                    prefix, code = matches
-                    if code == "\\":
-                        part = fragment[:index]
-                    else:
-                        part = subst % (prefix, code)
-                    parts.append(part)
-                    fragment = fragment[index:]
-        except ValueError:
-            parts.append(fragment)
-        text = ''.join(parts)
-
-    # logger.info(f'quickfix text: {text}')
-    # logger.info('=' * 100 + '>> \n\n')
-    return text
+    return [quick_fix(text, code_font) for text in texts]
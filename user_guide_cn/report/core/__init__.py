@@ -3,10 +3,10 @@ import glob
 import logging
 
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.pdfbase.cidfonts import UnicodeCIDFont, defaultUnicodeEncodings
 
 from report.components.utils import find_file_name, quick_fix
+from report.core.fontcache import CachedTTFont
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 PARENT_DIR = os.path.dirname(BASE_DIR)
@@ -15,37 +15,49 @@ FONTS_DIR = os.path.join(PARENT_DIR, 'fonts')
 
 logger = logging.getLogger(__name__)
 
+# 可用的字体 {字体名称: 字体文件}, 仅为目录, 字体由 register_font 解析并注册
 VALIDATED_FONT_NAMES = {}
 
+# reportlab包默认的cid字体声明
+CID_FONT_NAMES = frozenset(defaultUnicodeEncodings.keys())
 
-def _load_and_register_fonts():
+
+def _load_font_catalog():
     """
-    加载指定字体文件目录中字体名称和文件映射 并注册
+    加载指定字体文件目录中字体名称和文件映射
 
     1. 初始化扩展字体, 参考用户手册: 3.5 支持TrueType字体
     """
-    global VALIDATED_FONT_NAMES
-
     # 默认思源黑体, 仅支持ttf文件
-    ttf_files = glob.glob(os.path.join(FONTS_DIR, '*.ttf'))
-    fonts = {find_file_name(file): file for file in ttf_files}
-
-    # reportlab包默认的cid字体声明
-    cid_font_names = defaultUnicodeEncodings.keys()
-
-    for name in [*fonts.keys(), *cid_font_names]:
-        try:
-            path = fonts[name]
-            pdfmetrics.registerFont(TTFont(name, path))
-        except KeyError as e:
-            if name in cid_font_names:
-                pdfmetrics.registerFont(UnicodeCIDFont(name))
-                path = f'BuildIn Font {name}'
-            else:
-                raise e
-        else:
-            VALIDATED_FONT_NAMES[name] = path
-        logger.debug(f'注册字体: {name}')
-
-
-_load_and_register_fonts()
+    for file in glob.glob(os.path.join(FONTS_DIR, '*.ttf')):
+        VALIDATED_FONT_NAMES[find_file_name(file)] = file
+
+    for name in CID_FONT_NAMES:
+        VALIDATED_FONT_NAMES.setdefault(name, f'BuildIn Font {name}')
+
+
+def register_font(name):
+    """
+    注册字体目录中的字体, 已注册的字体不会重复注册
+
+    PDF 排版前注册其使用的字体, 图形、样式等使用其他字体时需先调用本函数
+
+    @param name: 字体名称, 需在 VALIDATED_FONT_NAMES 中
+    @return: 字体对象
+    """
+    if name in pdfmetrics.getRegisteredFontNames():
+        return pdfmetrics.getFont(name)
+
+    path = VALIDATED_FONT_NAMES[name]
+    if os.path.isfile(path):
+        font = CachedTTFont(name, path)
+    elif name in CID_FONT_NAMES:
+        font = UnicodeCIDFont(name)
+    else:
+        raise KeyError(name)
+    pdfmetrics.registerFont(font)
+    logger.debug(f'注册字体: {name}')
+    return font
+
+
+_load_font_catalog()
@@ -6,7 +6,8 @@ from reportlab.lib.units import inch
 from reportlab.platypus.figures import Figure as BaseFigure
 from reportlab.platypus import Paragraph, Preformatted
 from reportlab.lib.styles import ParagraphStyle
-from xml.sax.saxutils import escape as xmlEscape
+
+from report.components.fingerprint import fingerprint
 
 
 # 示例函数宽高定义
@@ -46,7 +47,14 @@ class Illustration(BaseFigure):
 
 
 class GraphicsDrawing(Illustration):
-    def __init__(self, drawing, caption, font_name=None):
+    """
+    图形插图
+
+    内容相同的图形(按内容指纹判断)在文档中只绘制一次, 保存为 PDF 表单对象(form XObject),
+    之后的每次出现都通过 doForm 引用该表单.
+    """
+
+    def __init__(self, drawing, caption, font_name=None, reuse_form=True):
         _font_name = font_name or rl_config.canvas_basefontname
         BaseFigure.__init__(
             self,
@@ -56,11 +64,35 @@ class GraphicsDrawing(Illustration):
             captionFont=tt2ps(_font_name, 0, 1),
         )
         self.drawing = drawing
+        self.reuse_form = reuse_form
+        self._form_name = None
+
+    @property
+    def form_name(self):
+        """ 图形对应的表单名称, 首次使用时按图形内容计算 """
+        if self._form_name is None:
+            self._form_name = f'Drawing{fingerprint(self.drawing)}'
+        return self._form_name
 
     def drawFigure(self):
         d = self.drawing
-        d.wrap(d.width, d.height)
-        d.drawOn(self.canv, 0, 0)
+        if not self.reuse_form:
+            d.wrap(d.width, d.height)
+            d.drawOn(self.canv, 0, 0)
+            return
+
+        canv = self.canv
+        name = self.form_name
+        if not canv.hasForm(name):
+            # 图形可能超出自身的宽高, 表单的边界取整个页面可能的范围
+            page_width, page_height = canv._pagesize
+            canv.beginForm(
+                name, -page_width, -page_height, page_width, page_height
+            )
+            d.wrap(d.width, d.height)
+            d.drawOn(canv, 0, 0)
+            canv.endForm()
+        canv.doForm(name)
 
 
 class ParaBox(BaseFigure):
@@ -149,6 +181,9 @@ class ParaBox(BaseFigure):
 
 class ParaBox2(BaseFigure):
     def __init__(self, text, caption, style, font_name=None):
+        # xml.sax.saxutils 会导入 urllib.request 等模块, 用到时才导入
+        from xml.sax.saxutils import escape as xmlEscape
+
         _font_name = font_name or rl_config.canvas_basefontname
         BaseFigure.__init__(self, 0, 0, caption, captionFont=_font_name)
         descr_style = ParagraphStyle(
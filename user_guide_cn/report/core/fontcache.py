@@ -0,0 +1,245 @@
+"""
+TrueType 字体解析结果的磁盘缓存
+
+``TTFont(name, path)`` 每次都会完整读取并解析字体文件, 思源黑体等中文字体有数万个字形,
+每个进程解析一次需要较长时间和较多内存. 这里将解析结果(cmap、字宽、字形位置、
+水平度量以及 ascent/descent 等字体信息)以紧凑的二进制格式缓存到磁盘,
+缓存以字体文件路径、修改时间和大小为键.
+
+加载缓存时, 字形位置和水平度量直接使用内存映射的数组, 字体文件本身也通过内存映射
+读取(子集化时需要), 多个进程共享同一份物理内存页.
+
+缓存目录默认为 ``~/.cache/report/fonts``, 可通过环境变量 ``REPORT_FONT_CACHE`` 指定.
+同一字体文件修改后或 reportlab 升级后重新写入缓存时, 删除该字体旧的缓存文件.
+
+本模块只依赖 reportlab, 英文版的 ``user_guide/utils/fontcache.py`` 是指向本文件的
+符号链接, 两个版本分别作为 ``utils.fontcache`` 和 ``report.core.fontcache`` 导入.
+"""
+import os
+import mmap
+import struct
+import pickle
+import hashlib
+import logging
+from collections.abc import Sequence
+from weakref import WeakKeyDictionary
+
+import reportlab
+from reportlab import rl_config
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont, TTFontFace, TTEncoding
+
+logger = logging.getLogger(__name__)
+
+FONT_CACHE_DIR = os.environ.get(
+    'REPORT_FONT_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'report', 'fonts'),
+)
+
+_MAGIC = b'RLTTFC01'
+# 文件头: 魔数, 字体信息长度, cmap 条目数, 字宽条目数, 字形数
+_HEADER = struct.Struct('<8sIIII')
+
+# 单独以数组形式保存的属性, 其余属性保存在 pickle 的字体信息中
+_ARRAY_ATTRIBUTES = ('charToGlyph', 'charWidths', 'hmetrics', 'glyphPos')
+_SKIPPED_ATTRIBUTES = ('_ttf_data', '_pos')
+
+
+class _PairView(Sequence):
+    """ 以 (advance width, left side bearing) 元组访问的水平度量数组 """
+
+    def __init__(self, values):
+        self._values = values
+
+    def __len__(self):
+        return len(self._values) // 2
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        return self._values[2 * index], self._values[2 * index + 1]
+
+
+def _digest(key):
+    return hashlib.md5(repr(key).encode('utf8')).hexdigest()
+
+
+def _cache_path(filename, subfont_index, cache_dir):
+    """ 缓存文件名: <字体文件和序号的摘要>-<修改时间、大小和 reportlab 版本的摘要> """
+    stat = os.stat(filename)
+    font_key = (os.path.abspath(filename), subfont_index)
+    version_key = (stat.st_mtime_ns, stat.st_size, reportlab.Version)
+    return os.path.join(
+        cache_dir, f'{_digest(font_key)}-{_digest(version_key)}.ttfc'
+    )
+
+
+def _evict_stale(path):
+    """ 删除同一字体的其他缓存文件, 即字体文件修改或 reportlab 升级前的缓存 """
+    cache_dir, name = os.path.split(path)
+    prefix = name.split('-')[0] + '-'
+    for other in os.listdir(cache_dir):
+        if (
+            other != name
+            and other.startswith(prefix)
+            and other.endswith('.ttfc')
+        ):
+            try:
+                os.remove(os.path.join(cache_dir, other))
+            except OSError:
+                # 其他进程可能正在使用或已删除
+                pass
+
+
+def _map_file(filename):
+    with open(filename, 'rb') as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _parse_face(filename, subfont_index):
+    """ 解析字体文件, 字体文件内容通过内存映射读取 """
+    face = TTFontFace.__new__(TTFontFace)
+    # TTFontParser.readFile 发现已有 _ttf_data 时不再读取文件
+    face._ttf_data = _map_file(filename)
+    face.filename = filename
+    TTFontFace.__init__(face, filename, subfontIndex=subfont_index)
+    return face
+
+
+def _pad(data, size):
+    return data + b'\0' * (-len(data) % size)
+
+
+def _dump_face(face, path):
+    info = {
+        key: value
+        for key, value in face.__dict__.items()
+        if key not in _ARRAY_ATTRIBUTES and key not in _SKIPPED_ATTRIBUTES
+    }
+    info = _pad(pickle.dumps(info, protocol=pickle.HIGHEST_PROTOCOL), 8)
+
+    cmap = sorted(face.charToGlyph.items())
+    widths = sorted(face.charWidths.items())
+    hmetrics = [value for pair in face.hmetrics for value in pair]
+    chunks = [
+        _HEADER.pack(
+            _MAGIC, len(info), len(cmap), len(widths), len(face.hmetrics)
+        ),
+        info,
+        # 字宽为浮点数, 先写 8 字节对齐的数组
+        struct.pack(f'<{len(widths)}d', *(width for _, width in widths)),
+        struct.pack(f'<{len(widths)}I', *(code for code, _ in widths)),
+        struct.pack(f'<{len(cmap)}I', *(code for code, _ in cmap)),
+        struct.pack(f'<{len(cmap)}I', *(glyph for _, glyph in cmap)),
+        struct.pack(f'<{len(face.glyphPos)}I', *face.glyphPos),
+        _pad(struct.pack(f'<{len(hmetrics)}H', *hmetrics), 4),
+    ]
+
+    # 先写临时文件再改名, 避免并行的进程读到不完整的缓存
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        for chunk in chunks:
+            f.write(chunk)
+    os.replace(tmp_path, path)
+
+
+def _load_face(filename, path):
+    """ 从缓存文件构造字体, 缓存无效时返回 None """
+    try:
+        data = memoryview(_map_file(path))
+    except (OSError, ValueError):
+        return None
+    magic, info_size, cmap_size, width_size, glyph_count = _HEADER.unpack(
+        data[: _HEADER.size]
+    )
+    if magic != _MAGIC:
+        return None
+
+    offset = _HEADER.size
+    info = pickle.loads(data[offset : offset + info_size])
+    offset += info_size
+
+    def take(fmt, count, item_size):
+        nonlocal offset
+        view = data[offset : offset + count * item_size].cast(fmt)
+        offset += count * item_size
+        return view
+
+    widths = take('d', width_size, 8)
+    width_codes = take('I', width_size, 4)
+    cmap_codes = take('I', cmap_size, 4)
+    cmap_glyphs = take('I', cmap_size, 4)
+    glyph_pos = take('I', glyph_count + 1, 4)
+    hmetrics = take('H', 2 * glyph_count, 2)
+
+    face = TTFontFace.__new__(TTFontFace)
+    pdfmetrics.TypeFace.__init__(face, None)
+    face.__dict__.update(info)
+    face.filename = filename
+    face._ttf_data = _map_file(filename)
+    face._pos = 0
+    # 字宽和 cmap 查询频繁, 且 reportlab 的 C 扩展要求为 dict
+    face.charWidths = dict(zip(width_codes, widths))
+    face.charToGlyph = dict(zip(cmap_codes, cmap_glyphs))
+    face.glyphPos = glyph_pos
+    face.hmetrics = _PairView(hmetrics)
+    return face
+
+
+def load_ttf_face(filename, subfont_index=0, cache_dir=None):
+    """
+    加载 TrueType 字体, 优先使用缓存的解析结果
+
+    @param filename: 字体文件路径
+    @param subfont_index: ttc 字体集中的字体序号
+    @param cache_dir: 缓存目录, 默认为 FONT_CACHE_DIR
+    @return: TTFontFace 对象
+    """
+    path = _cache_path(filename, subfont_index, cache_dir or FONT_CACHE_DIR)
+    face = _load_face(filename, path)
+    if face is not None:
+        return face
+
+    face = _parse_face(filename, subfont_index)
+    try:
+        _dump_face(face, path)
+        _evict_stale(path)
+    except OSError as e:
+        logger.warning(f'无法写入字体缓存 {path}: {e}')
+    return face
+
+
+class CachedTTFont(TTFont):
+    """ 使用解析结果缓存的 TTFont, 参数与 TTFont 相同 """
+
+    def __init__(
+        self,
+        name,
+        filename,
+        validate=0,
+        subfontIndex=0,
+        asciiReadable=None,
+        cache_dir=None,
+    ):
+        if validate or not isinstance(subfontIndex, int):
+            # 需要校验或按名称查找 ttc 中的字体时, 使用原始的解析方式
+            TTFont.__init__(
+                self,
+                name,
+                filename,
+                validate=validate,
+                subfontIndex=subfontIndex,
+                asciiReadable=asciiReadable,
+            )
+            return
+
+        self.fontName = name
+        self.face = load_ttf_face(filename, subfontIndex, cache_dir=cache_dir)
+        self.encoding = TTEncoding()
+        self.state = WeakKeyDictionary()
+        if asciiReadable is None:
+            asciiReadable = rl_config.ttfAsciiReadable
+        self._asciiReadable = asciiReadable
@@ -0,0 +1,350 @@
+"""
+图形数据源
+
+quickChart 的数据通常是内存中的列表, 或按空白分隔的文本块. 数据源按需从文件中读取
+数据, 可以直接作为 quickChart / QuickChart 的 data 使用::
+
+    source = CSVSource('sales.csv', x='日期', max_points=500)
+    chart = quickChart('linechart', 400, 270, source)
+
+CSVSource 按块读取 CSV/TSV 文件的指定列, 读取的同时:
+
+- 按 max_points 合并相邻的行(均值、求和、最大值等), 文件再大内存中也只保留
+  不超过 max_points 个数据点;
+- 统计 x 列和数据列的取值范围, 可用于设置坐标轴.
+
+整个过程只读一遍文件, 不会把整个文件转换为嵌套列表.
+"""
+import os
+import io
+import csv
+import mmap
+from collections import namedtuple
+from itertools import islice
+
+# 数据源读取结果
+SourceData = namedtuple(
+    'SourceData',
+    [
+        'x',  # x 列的数值, x 列不是数值或未指定 x 列时为 None
+        'labels',  # x 列的原始文字, 未指定 x 列时为 None
+        'series',  # 数据列, 每列一个列表, 缺失值为 None
+        'names',  # 数据列的名称, 没有表头时为 None
+        'x_range',  # x 列数值的 (最小值, 最大值), 没有数值时为 None
+        'y_range',  # 全部数据列的 (最小值, 最大值), 没有数值时为 None
+        'row_count',  # 读取的数据行数(合并前)
+    ],
+)
+
+
+def _merge_mean(a, b):
+    return a[0] + b[0], a[1] + b[1]
+
+
+# 合并方式 {名称: (一组数值的汇总, 合并两个汇总, 汇总转换为数据点)}
+# 均值的汇总为 (和, 个数), 以便继续合并
+AGGREGATES = {
+    'mean': (lambda v: (sum(v), len(v)), _merge_mean, lambda s: s[0] / s[1]),
+    'sum': (sum, lambda a, b: a + b, None),
+    'min': (min, min, None),
+    'max': (max, max, None),
+    'first': (lambda v: v[0], lambda a, b: a, None),
+    'last': (lambda v: v[-1], lambda a, b: b, None),
+}
+
+
+def _number(text):
+    """ 单元格转换为数值, 空单元格为 None """
+    text = text.strip()
+    return float(text) if text else None
+
+
+def _numbers(cells):
+    """ 一列单元格转换为数值, 先整列转换, 有空单元格时再逐个转换 """
+    try:
+        return list(map(float, cells))
+    except ValueError:
+        return list(map(_number, cells))
+
+
+def _widen(bounds, values):
+    """ 用一组数值扩展 (最小值, 最大值) """
+    if not values:
+        return bounds
+    low, high = min(values), max(values)
+    if bounds is None:
+        return low, high
+    return min(bounds[0], low), max(bounds[1], high)
+
+
+class _Buckets:
+    """
+    流式降采样: 每 size 行合并为一个数据点, 数据点超过 max_points 个时两两合并,
+    size 加倍. 数据列的汇总按合并方式计算, x 取每组第一行的值.
+    max_points 为 None 时不合并
+    """
+
+    def __init__(self, column_count, max_points, aggregate):
+        self.max_points = max_points
+        self.reduce, self.merge, self.finish = AGGREGATES[aggregate]
+        self.size = 1
+        self.x = []
+        self.labels = []
+        # 各列每组的汇总, None 表示该组没有数值
+        self.columns = [[] for _ in range(column_count)]
+        # 最后一组已有的行数, 0 表示已满
+        self.filled = 0
+
+    def _combine(self, a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        return self.merge(a, b)
+
+    def _reduce(self, values):
+        values = [v for v in values if v is not None]
+        return self.reduce(values) if values else None
+
+    def feed(self, x, labels, columns):
+        """
+        添加一块数据
+
+        @param x: x 列数值
+        @param labels: x 列文字
+        @param columns: 各数据列的数值, 与 x 等长
+        """
+        if self.max_points is None:
+            self.x.extend(x)
+            self.labels.extend(labels)
+            for out, values in zip(self.columns, columns):
+                out.extend(values)
+            return
+        start = 0
+        count = len(labels)
+        while start < count:
+            if not self.filled:
+                self.x.append(x[start])
+                self.labels.append(labels[start])
+                for out in self.columns:
+                    out.append(None)
+            stop = min(count, start + self.size - self.filled)
+            for out, values in zip(self.columns, columns):
+                part = self._reduce(values[start:stop])
+                out[-1] = self._combine(out[-1], part)
+            self.filled = (self.filled + stop - start) % self.size
+            start = stop
+            if not self.filled and len(self.labels) > self.max_points:
+                self._halve()
+
+    def _halve(self):
+        """ 相邻的两组合并为一组, 组数为奇数时最后一组只有原来的一组数据, 未满 """
+        odd = len(self.labels) % 2
+        self.x = self.x[::2]
+        self.labels = self.labels[::2]
+        for i, out in enumerate(self.columns):
+            pairs = zip(out[::2], out[1::2] + [None])
+            self.columns[i] = [self._combine(a, b) for a, b in pairs]
+        self.filled = self.size if odd else 0
+        self.size *= 2
+
+    def result(self):
+        """
+        @return: (x 列数值, x 列文字, 各数据列)
+        """
+        if self.max_points is not None:
+            # 最后一组未满时不会合并, 数据点可能还多于 max_points
+            while len(self.labels) > self.max_points:
+                self._halve()
+        columns = self.columns
+        if self.finish and self.max_points is not None:
+            columns = [
+                [None if s is None else self.finish(s) for s in out]
+                for out in columns
+            ]
+        return self.x, self.labels, columns
+
+
+class DataSource:
+    """
+    图形数据源基类
+
+    子类实现 load, 返回 SourceData. quickChart 在排版时才调用 load 读取数据
+    """
+
+    def load(self):
+        """
+        读取数据
+
+        @return: SourceData
+        """
+        raise NotImplementedError
+
+    def stamp(self):
+        """
+        数据的版本标记, 数据变化时应随之变化, 用于判断图形是否需要重新构建
+
+        @return: 可计算指纹的对象
+        """
+        return None
+
+
+class CSVSource(DataSource):
+    """
+    CSV/TSV 文件数据源
+
+    按块读取文件, 每块 chunk_size 行, 只转换需要的列; 指定 max_points 时边读边合并.
+    """
+
+    def __init__(
+        self,
+        path,
+        columns=None,
+        x=None,
+        delimiter=None,
+        header=True,
+        encoding='utf-8',
+        max_points=None,
+        aggregate='mean',
+        chunk_size=10000,
+        use_mmap=False,
+    ):
+        """
+        @param path: 文件路径
+        @param columns: 数据列, 列名或序号(从 0 开始)的列表, 默认为除 x 列外的全部列
+        @param x: x 列(散点图等的 x 值, 其他图形的分类名称), 列名或序号, 默认没有
+        @param delimiter: 分隔符, 默认 .tsv/.tab 文件为制表符, 其他为逗号
+        @param header: 第一行是否为表头
+        @param encoding: 文件编码
+        @param max_points: 数据点数量上限, 超过时合并相邻的行, 默认不合并
+        @param aggregate: 合并方式, 见 AGGREGATES: mean、sum、min、max、first、last
+        @param chunk_size: 每块的行数
+        @param use_mmap: 是否以内存映射方式读取文件
+        """
+        if aggregate not in AGGREGATES:
+            raise ValueError(
+                f'合并方式 {aggregate} 不支持, 仅支持: {"、".join(AGGREGATES)}'
+            )
+        if max_points is not None and max_points < 1:
+            raise ValueError(f'max_points 必须大于 0: {max_points}')
+        if delimiter is None:
+            extension = os.path.splitext(path)[1].lower()
+            delimiter = '\t' if extension in ('.tsv', '.tab') else ','
+        self.path = path
+        self.columns = columns
+        self.x = x
+        self.delimiter = delimiter
+        self.header = header
+        self.encoding = encoding
+        self.max_points = max_points
+        self.aggregate = aggregate
+        self.chunk_size = chunk_size
+        self.use_mmap = use_mmap
+
+    def stamp(self):
+        """ 文件的路径、大小和修改时间 """
+        stat = os.stat(self.path)
+        return self.path, stat.st_size, stat.st_mtime_ns
+
+    def _lines(self, f):
+        """ 逐行读取文件, 以内存映射方式读取时按行解码 """
+        if not self.use_mmap:
+            return io.TextIOWrapper(f, encoding=self.encoding, newline='')
+        return self._mapped_lines(f)
+
+    def _mapped_lines(self, f):
+        # 空文件不能映射
+        if not os.fstat(f.fileno()).st_size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for line in iter(mapped.readline, b''):
+                yield line.decode(self.encoding)
+
+    def _indexes(self, names):
+        """
+        x 列和数据列的序号
+
+        @param names: 表头, 没有表头时为 None
+        @return: (x 列序号或 None, 数据列序号列表)
+        """
+
+        def index(column):
+            if isinstance(column, int):
+                return column
+            if names is None or column not in names:
+                raise ValueError(f'{self.path} 中没有列: {column}')
+            return names.index(column)
+
+        x = None if self.x is None else index(self.x)
+        if self.columns is None:
+            if names is None:
+                raise ValueError('没有表头时需要指定数据列 columns')
+            return x, [i for i in range(len(names)) if i != x]
+        return x, [index(column) for column in self.columns]
+
+    def load(self):
+        """
+        读取文件, 只读一遍
+
+        @return: SourceData
+        """
+        with open(self.path, 'rb') as f:
+            reader = csv.reader(self._lines(f), delimiter=self.delimiter)
+            names = next(reader, None) if self.header else None
+            if names is not None:
+                names = [name.strip() for name in names]
+            x_index, indexes = self._indexes(names)
+            buckets = _Buckets(len(indexes), self.max_points, self.aggregate)
+            x_range = y_range = None
+            numeric_x = True
+            row_count = 0
+            while True:
+                rows = [row for row in islice(reader, self.chunk_size) if row]
+                if not rows:
+                    break
+                row_count += len(rows)
+                width = min(map(len, rows))
+                columns = [
+                    _numbers(
+                        [row[i] for row in rows]
+                        if i < width
+                        else [row[i] if i < len(row) else '' for row in rows]
+                    )
+                    for i in indexes
+                ]
+                for values in columns:
+                    y_range = _widen(
+                        y_range, [v for v in values if v is not None]
+                    )
+                if x_index is None:
+                    labels = x = [None] * len(rows)
+                else:
+                    labels = [
+                        row[x_index].strip() if x_index < len(row) else ''
+                        for row in rows
+                    ]
+                    x = [None] * len(rows)
+                    if numeric_x:
+                        try:
+                            x = _numbers(labels)
+                        except ValueError:
+                            numeric_x = False
+                        x_range = _widen(
+                            x_range, [v for v in x if v is not None]
+                        )
+                buckets.feed(x, labels, columns)
+
+        x, labels, series = buckets.result()
+        if x_index is None:
+            x = labels = None
+        elif not numeric_x:
+            x = x_range = None
+        return SourceData(
+            x,
+            labels,
+            series,
+            [names[i] for i in indexes] if names else None,
+            x_range,
+            y_range,
+            row_count,
+        )
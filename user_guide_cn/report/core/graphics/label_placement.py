@@ -0,0 +1,354 @@
+"""
+数据标签的重叠检测和放置
+
+饼图、条形图、散点图的数据标签较多时容易互相重叠. 两两比较边界的检测是 O(n²) 的,
+这里把已放置的标签按边界登记到均匀网格中, 检测一个标签只需比较它覆盖的网格单元中的
+标签; 标签大小相近时每个单元中的标签数有上限, 全部标签的检测接近线性.
+
+放置按优先级(标签的顺序)贪心进行: 每个标签依次尝试一组候选位移, 取第一个不与已放置
+标签重叠的位置; 都不行时隐藏标签, 或保持原位.
+
+LabelPlacement 混入类把放置接到 reportlab 图形的数据标签上, quickChart 在
+checkLabelOverlap 为真时对饼图、条形图和散点图使用::
+
+    chart = with_label_placement(VerticalBarChart)()
+"""
+from math import cos, floor, radians, sin
+
+from reportlab.graphics.shapes import Line
+from reportlab.graphics.charts.barcharts import BarChart
+from reportlab.graphics.charts.lineplots import LinePlot
+from reportlab.graphics.charts.piecharts import Pie, WedgeLabel
+
+# 候选位移中沿一个方向移动的最多次数
+MAX_STEPS = 4
+
+
+def boxes_overlap(a, b, gap=0):
+    """
+    两个边界 (x1, y1, x2, y2) 是否重叠, 只接触不算重叠
+
+    @param gap: 标签之间至少保留的间距
+    """
+    return (
+        a[0] < b[2] + gap
+        and b[0] < a[2] + gap
+        and a[1] < b[3] + gap
+        and b[1] < a[3] + gap
+    )
+
+
+def _shift(box, dx, dy):
+    return box[0] + dx, box[1] + dy, box[2] + dx, box[3] + dy
+
+
+def cell_size(boxes):
+    """
+    网格单元的边长: 标签的平均宽度和平均高度中较大的一个
+
+    @param boxes: 边界列表
+    @return: 边长
+    """
+    if not boxes:
+        return 1.0
+    width = sum(b[2] - b[0] for b in boxes) / len(boxes)
+    height = sum(b[3] - b[1] for b in boxes) / len(boxes)
+    return max(width, height) or 1.0
+
+
+class LabelGrid:
+    """
+    边界的均匀网格索引, 每个边界登记到它覆盖的所有单元中
+    """
+
+    def __init__(self, size):
+        """
+        @param size: 单元边长, 见 cell_size
+        """
+        self.size = float(size)
+        self.boxes = []
+        self.cells = {}
+
+    def _cells(self, box, gap=0):
+        size = self.size
+        x1 = floor((box[0] - gap) / size)
+        x2 = floor((box[2] + gap) / size)
+        y1 = floor((box[1] - gap) / size)
+        y2 = floor((box[3] + gap) / size)
+        for i in range(x1, x2 + 1):
+            for j in range(y1, y2 + 1):
+                yield i, j
+
+    def add(self, box):
+        """
+        登记边界
+
+        @return: 边界的序号
+        """
+        index = len(self.boxes)
+        self.boxes.append(box)
+        cells = self.cells
+        for cell in self._cells(box):
+            if cell in cells:
+                cells[cell].append(index)
+            else:
+                cells[cell] = [index]
+        return index
+
+    def query(self, box, gap=0):
+        """
+        与 box 重叠的已登记边界
+
+        @return: 序号集合
+        """
+        found = set()
+        boxes = self.boxes
+        cells = self.cells
+        for cell in self._cells(box, gap):
+            for index in cells.get(cell, ()):
+                if index not in found and boxes_overlap(box, boxes[index], gap):
+                    found.add(index)
+        return found
+
+    def collides(self, box, gap=0):
+        """ box 是否与已登记的边界重叠, 找到一个即返回 """
+        boxes = self.boxes
+        cells = self.cells
+        for cell in self._cells(box, gap):
+            for index in cells.get(cell, ()):
+                if boxes_overlap(box, boxes[index], gap):
+                    return True
+        return False
+
+
+def find_overlaps(boxes, gap=0):
+    """
+    找出互相重叠的边界
+
+    @param boxes: 边界 (x1, y1, x2, y2) 列表
+    @param gap: 标签之间至少保留的间距
+    @return: 重叠的序号对 (i, j) 列表, i < j, 按序排列
+    """
+    grid = LabelGrid(cell_size(boxes))
+    pairs = []
+    for j, box in enumerate(boxes):
+        pairs.extend((i, j) for i in grid.query(box, gap))
+        grid.add(box)
+    pairs.sort()
+    return pairs
+
+
+def place_labels(boxes, moves, gap=0, hide=True):
+    """
+    按顺序放置标签, 每个标签取第一个不与已放置标签重叠的候选位移
+
+    @param boxes: 标签原位的边界列表, 排在前面的优先
+    @param moves: 每个标签的候选位移 (dx, dy) 序列, 通常以 (0, 0) 开头
+    @param gap: 标签之间至少保留的间距
+    @param hide: 没有合适位置时是否隐藏; 否则保持原位, 后面的标签仍然避开它
+    @return: 每个标签的位移 (dx, dy), 隐藏的标签为 None
+    """
+    grid = LabelGrid(cell_size(boxes))
+    offsets = []
+    for box, candidates in zip(boxes, moves):
+        offset = None
+        for dx, dy in candidates:
+            moved = _shift(box, dx, dy)
+            if not grid.collides(moved, gap):
+                offset = dx, dy
+                grid.add(moved)
+                break
+        if offset is None and not hide:
+            offset = 0, 0
+            grid.add(box)
+        offsets.append(offset)
+    return offsets
+
+
+def stacked_moves(box, direction, steps=MAX_STEPS):
+    """
+    沿一个方向错开的候选位移, 每次移动一个标签的宽度(水平)或高度(垂直)
+
+    @param box: 标签的边界
+    @param direction: 方向 (dx, dy), 如 (0, 1) 向上
+    @param steps: 最多移动的次数
+    """
+    dx = direction[0] * (box[2] - box[0])
+    dy = direction[1] * (box[3] - box[1])
+    return [(dx * k, dy * k) for k in range(steps + 1)]
+
+
+def around_moves(box):
+    """ 原位和上下左右、四个角的相邻位置, 用于散点的标签 """
+    w = box[2] - box[0]
+    h = box[3] - box[1]
+    return [
+        (0, 0),
+        (0, h),
+        (0, -h),
+        (w, 0),
+        (-w, 0),
+        (w, h),
+        (-w, h),
+        (w, -h),
+        (-w, -h),
+    ]
+
+
+def radial_moves(box, angle, steps=MAX_STEPS * 2):
+    """
+    沿半径向外的候选位移, 每次移动一个标签的高度, 用于饼图的标签
+
+    @param angle: 标签所在的角度(度)
+    """
+    step = box[3] - box[1]
+    dx = cos(radians(angle)) * step
+    dy = sin(radians(angle)) * step
+    return [(dx * k, dy * k) for k in range(steps + 1)]
+
+
+class LabelPlacement:
+    """
+    图形类的混入类: 绘制时记录数据标签, 绘制完成后放置标签, 解决重叠.
+    子类在添加数据标签的方法中调用 _recordLabel
+    """
+
+    # 没有合适位置的标签是否隐藏
+    _hideLabels = True
+
+    def draw(self):
+        self.__dict__['_placedLabels'] = []
+        try:
+            g = super().draw()
+            self._placeLabels(self.__dict__['_placedLabels'])
+        finally:
+            del self.__dict__['_placedLabels']
+        return g
+
+    def _recordLabel(self, group, label, moves):
+        """
+        @param group: 标签所在的图形组, 隐藏标签时从中删除
+        @param label: Label
+        @param moves: 函数, 参数为标签的边界, 返回候选位移
+        """
+        labels = self.__dict__.get('_placedLabels')
+        if labels is not None:
+            labels.append((group, label, moves))
+
+    def _placeLabels(self, labels):
+        boxes = [label.getBounds() for _, label, _ in labels]
+        moves = [move(box) for box, (_, _, move) in zip(boxes, labels)]
+        offsets = place_labels(boxes, moves, hide=self._hideLabels)
+        hidden = {}
+        for (group, label, _), offset in zip(labels, offsets):
+            if offset is None:
+                hidden.setdefault(id(group), (group, set()))[1].add(id(label))
+            elif offset != (0, 0):
+                label.x += offset[0]
+                label.y += offset[1]
+        for group, ids in hidden.values():
+            group.contents[:] = [n for n in group.contents if id(n) not in ids]
+
+
+class BarLabelPlacement(LabelPlacement):
+    """ 条形图(BarChart)的标签沿条形的方向向外错开 """
+
+    def _addLabel(
+        self,
+        text,
+        label,
+        g,
+        rowNo,
+        colNo,
+        x,
+        y,
+        width,
+        height,
+        calcOnly=False,
+    ):
+        result = super()._addLabel(
+            text, label, g, rowNo, colNo, x, y, width, height, calcOnly
+        )
+        if not calcOnly and label.visible:
+            if self._flipXY:
+                direction = (1 if label.x >= x + width * 0.5 else -1), 0
+            else:
+                direction = 0, (1 if label.y >= y + height * 0.5 else -1)
+            self._recordLabel(
+                g, label, lambda box: stacked_moves(box, direction)
+            )
+        return result
+
+
+class PointLabelPlacement(LabelPlacement):
+    """ 散点图、折线图(LinePlot)的标签移到数据点周围的空位 """
+
+    def drawLabel(self, G, rowNo, colNo, x, y):
+        label = self._innerDrawLabel(rowNo, colNo, x, y)
+        if label:
+            G.add(label)
+            self._recordLabel(G, label, around_moves)
+
+
+class PieLabelPlacement(LabelPlacement):
+    """
+    饼图(Pie)的标签: reportlab 按角度分开相邻片子的标签后, 其余的重叠(如不相邻的片子)
+    沿半径向外移动, 指示线随之延长; 标签不隐藏.
+    只在 checkLabelOverlap 为真, 并且不使用 sideLabels、pointerLabelMode 时放置
+    """
+
+    _hideLabels = False
+
+    def makeWedges(self):
+        g = super().makeWedges()
+        if (
+            not self.checkLabelOverlap
+            or self.sideLabels
+            or self.pointerLabelMode
+        ):
+            return g
+        pointers = {(n.x1, n.y1): n for n in g.contents if isinstance(n, Line)}
+        labels = [n for n in g.contents if isinstance(n, WedgeLabel)]
+        origins = [(label.x, label.y) for label in labels]
+        self._placeLabels(
+            [
+                (
+                    g,
+                    label,
+                    lambda box, angle=label._pmv: radial_moves(box, angle),
+                )
+                for label in labels
+            ]
+        )
+        for label, origin in zip(labels, origins):
+            pointer = pointers.get(origin)
+            if pointer is not None and label._simple_pointer:
+                pointer.x1, pointer.y1 = label.x, label.y
+        return g
+
+
+# {reportlab 图形类: 加上标签放置的子类}
+_PLACEMENT_CLASSES = {}
+
+
+def with_label_placement(klass):
+    """
+    reportlab 图形类加上数据标签放置的子类, 同一个类只创建一次
+
+    @param klass: BarChart、LinePlot(含 ScatterPlot)或 Pie 及其子类
+    @return: 子类
+    """
+    placement = _PLACEMENT_CLASSES.get(klass)
+    if placement is None:
+        if issubclass(klass, BarChart):
+            mixin = BarLabelPlacement
+        elif issubclass(klass, LinePlot):
+            mixin = PointLabelPlacement
+        elif issubclass(klass, Pie):
+            mixin = PieLabelPlacement
+        else:
+            raise TypeError(f'{klass.__name__} 不支持数据标签放置')
+        placement = _PLACEMENT_CLASSES[klass] = type(
+            klass.__name__, (mixin, klass), {'__module__': __name__}
+        )
+    return placement
@@ -38,12 +38,26 @@ into a method of each widget.
  理想情况下，我们将getBounds移到每个小部件的方法中。
 """
 
+import weakref
+
 from reportlab.graphics import shapes
-from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfbase.pdfmetrics import getFont
 from reportlab.lib.validators import *
 from reportlab.lib.attrmap import *
-from reportlab.lib.colors import cyan, magenta
+from reportlab.lib.colors import Color, cyan, magenta
+from reportlab.lib.utils import isSeq, asUnicode, _simpleSplit
+from reportlab.rl_config import decimalSymbol
 from reportlab.graphics.widgetbase import Widget
+from reportlab.graphics.charts.textlabels import Label
+from reportlab.graphics.charts.legends import (
+    Legend,
+    _getLines,
+    _getLineCount,
+    _transMax,
+)
+
+from report.components.fingerprint import fingerprint
+from report.core.graphics.text_metrics import string_width, string_widths
 
 
 #  The functions below would logically be methods of the corresponding
@@ -70,28 +84,109 @@ def getRectsBounds(rectList):
 
 def getPointsBounds(pointList):
     """
-    Helper function for list of points
-    点列表的辅助函数
+    Helper function for list of points, either (x, y) pairs or flat
+    x1, y1, x2, y2... coordinates; linear time, no intermediate lists
+    点列表的辅助函数, 点可以是 (x, y) 对或展开的 x1, y1, x2, y2... 坐标;
+    线性时间, 不创建中间列表
     """
-    xs = []
-    ys = []
+    if hasattr(pointList, 'reshape'):
+        return _arrayPointsBounds(pointList)
     first = pointList[0]
     if isinstance(first, (list, tuple)):
         # pairs of things
-        for (x, y) in pointList:
-            xs.append(x)
-            ys.append(y)
+        return _pairsBounds(iter(pointList))
+    return _flatPointsBounds(pointList)
+
+
+def _flatPointsBounds(points):
+    "Bounds of flat x1, y1, x2, y2... coordinates (展开坐标的边界)"
+    if hasattr(points, 'reshape'):
+        return _arrayPointsBounds(points)
+    it = iter(points)
+    return _pairsBounds(zip(it, it))
+
+
+def _pairsBounds(pairs):
+    """
+    Bounds of an iterator of (x, y) pairs in a single pass
+    (一次遍历计算 (x, y) 点对的边界)
+    """
+    for xMin, yMin in pairs:
+        break
     else:
-        points = pointList[:]
-        while points:
-            xs.append(points[0])
-            ys.append(points[1])
-            points = points[2:]
-    return (min(xs), min(ys), max(xs), max(ys))
+        raise ValueError("Can't get bounds of no points")
+    xMax = xMin
+    yMax = yMin
+    for x, y in pairs:
+        if x < xMin:
+            xMin = x
+        elif x > xMax:
+            xMax = x
+        if y < yMin:
+            yMin = y
+        elif y > yMax:
+            yMax = y
+    return (xMin, yMin, xMax, yMax)
+
+
+def _arrayPointsBounds(points):
+    "Bounds of a NumPy array of points, vectorized (NumPy 数组的边界, 向量化计算)"
+    points = points.reshape(-1, 2)
+    xMin, yMin = points.min(axis=0).tolist()
+    xMax, yMax = points.max(axis=0).tolist()
+    return (xMin, yMin, xMax, yMax)
 
 
 def getBounds(obj):
-    if hasattr(obj, 'getBounds'):
+    """
+    Bounds of any graphic object as (x1, y1, x2, y2)
+    任何图形对象的边界 (x1, y1, x2, y2)
+    """
+    if getattr(type(obj), 'getBounds', None) is _WIDGET_GET_BOUNDS:
+        bounds = _widgetBounds(obj, cache=True)
+    else:
+        bounds = _getBounds(obj)
+    if bounds is None:
+        # empty group needs a sane default; this
+        # will happen when interactively creating a group
+        # nothing has been added to yet.  The alternative is
+        # to handle None as an allowed return value everywhere.
+        return (0, 0, 0, 0)
+    return bounds
+
+
+def _getBounds(obj):
+    """
+    getBounds without the default for empty groups, which return None
+    (空的图形组返回 None).
+
+    Groups, widgets and point lists that do not override getBounds are
+    measured here, in linear time without the intermediate lists of the
+    reportlab methods; the results are the same.  Labels and legends are
+    measured analytically, other widgets are drawn once and cached, see
+    _widgetBounds.
+    除非子类重写了 getBounds, 图形组、组件和点列表在这里计算,
+    线性时间且不创建 reportlab 方法中的中间列表, 结果相同.
+    标签和图例直接计算, 其他组件绘制一次后缓存, 见 _widgetBounds.
+    """
+    method = getattr(type(obj), 'getBounds', None)
+    if method is _GROUP_GET_BOUNDS:
+        return _groupBounds(obj)
+    elif method in _POINTS_GET_BOUNDS:
+        return getPointsBounds(obj.points)
+    elif method is _WIDGET_GET_BOUNDS:
+        return _widgetBounds(obj)
+    elif method is _STRING_GET_BOUNDS:
+        return _stringBounds(
+            obj.text,
+            obj.x,
+            obj.y,
+            obj.fontName,
+            obj.fontSize,
+            obj.textAnchor,
+            encoding=obj.encoding,
+        )
+    elif method is not None:
         # this is the preferred "future" solution :-)
         # 这是首选的“未来”解决方案
         return obj.getBounds()
@@ -117,57 +212,681 @@ def getBounds(obj):
     elif isinstance(obj, shapes.Wedge):
         return getPointsBounds(obj.asPolygon().points)
     elif isinstance(obj, shapes.String):
-        w = stringWidth(obj.text, obj.fontName, obj.fontSize)
-        x = obj.x
-        tA = obj.textAnchor
-        if tA != 'start':
-            if tA == 'middle':
-                x -= 0.5 * w
-            elif tA == 'end':
-                x -= w
-            elif tA == 'numeric':
-                x -= shapes.numericXShift(
-                    tA, obj.text, w, obj.fontName, obj.fontSize, obj.encoding
-                )
-        return (x, obj.y - 0.2 * obj.fontSize, x + w, obj.y + obj.fontSize)
+        return _stringBounds(
+            obj.text, obj.x, obj.y, obj.fontName, obj.fontSize, obj.textAnchor
+        )
     elif isinstance(obj, shapes.Path):
-        xs = []
-        ys = []
-        points = obj.points[:]
-        while points:
-            xs.append(points[0])
-            ys.append(points[1])
-            points = points[2:]
-        return (min(xs), min(ys), max(xs), max(ys))
+        return _flatPointsBounds(obj.points)
 
     # then groups, which need transformation...
     elif isinstance(obj, shapes.Group):
-        # iterate over each thing getting its rect
-        if obj.contents:
-            b = []
-            for elem in obj.contents:
-                b.append(getBounds(elem))
-            (x1, y1, x2, y2) = getRectsBounds(b)
-            trans = obj.transform
-            corners = [[x1, y1], [x1, y2], [x2, y1], [x2, y2]]
-            newCorners = []
-            for corner in corners:
-                newCorners.append(shapes.transformPoint(trans, corner))
-            return getPointsBounds(newCorners)
-        else:
-            # empty group needs a sane default; this
-            # will happen when interactively creating a group
-            # nothing has been added to yet.  The alternative is
-            # to handle None as an allowed return value everywhere.
-            return (0, 0, 0, 0)
+        return _groupBounds(obj)
 
     elif isinstance(obj, shapes.UserNode):
-        return getBounds(obj.provideNode())
+        return _getBounds(obj.provideNode())
 
     else:
         raise ValueError("Don't know how to get bounds of %s" % obj)
 
 
+def _groupBounds(group):
+    """
+    Bounds of a group: running bounds of the contents, skipping empty groups,
+    then the four transformed corners; None if nothing has bounds
+    图形组的边界: 逐个合并内容的边界(跳过空的图形组), 再变换四个角点;
+    没有任何边界时返回 None
+    """
+    x1 = None
+    for elem in group.contents:
+        b = _getBounds(elem)
+        if b is None:
+            continue
+        ex1, ey1, ex2, ey2 = b
+        if x1 is None:
+            x1, y1, x2, y2 = b
+            continue
+        if ex1 < x1:
+            x1 = ex1
+        if ex2 > x2:
+            x2 = ex2
+        if ey1 < y1:
+            y1 = ey1
+        if ey2 > y2:
+            y2 = ey2
+    if x1 is None:
+        return None
+    return _transformBounds(group.transform, x1, y1, x2, y2)
+
+
+def _transformBounds(transform, x1, y1, x2, y2):
+    """
+    Bounds of the four transformed corners, as shapes.transformPoint does
+    (变换四个角点后的边界, 与 shapes.transformPoint 的计算相同)
+    """
+    a, b, c, d, e, f = transform
+    xs = (
+        a * x1 + c * y1 + e,
+        a * x1 + c * y2 + e,
+        a * x2 + c * y1 + e,
+        a * x2 + c * y2 + e,
+    )
+    ys = (
+        b * x1 + d * y1 + f,
+        b * x1 + d * y2 + f,
+        b * x2 + d * y1 + f,
+        b * x2 + d * y2 + f,
+    )
+    return (min(xs), min(ys), max(xs), max(ys))
+
+
+def _stringBounds(
+    text, x, y, fontName, fontSize, textAnchor, width=None, encoding='utf8'
+):
+    """
+    Bounds of a string drawn at (x, y), as shapes.String.getBounds does, with
+    the widths measured by text_metrics
+    (在 (x, y) 绘制的字符串的边界, 与 shapes.String.getBounds 的计算相同,
+    宽度由 text_metrics 测量)
+    """
+    if width is None:
+        width = string_width(text, fontName, fontSize, encoding)
+    shift = _anchorShift(text, width, textAnchor, fontName, fontSize, encoding)
+    if shift is not None:
+        x -= shift
+    return (x, y - 0.2 * fontSize, x + width, y + fontSize)
+
+
+def _anchorShift(text, width, textAnchor, fontName, fontSize, encoding='utf8'):
+    """
+    How far left of its anchor a string starts, None for 'start'
+    (字符串起点在锚点左侧的距离, 'start' 返回 None)
+    """
+    if textAnchor == 'start':
+        return None
+    elif textAnchor == 'middle':
+        return 0.5 * width
+    elif textAnchor == 'end':
+        return width
+    elif textAnchor == 'numeric':
+        # aligned on the decimal point, as shapes.numericXShift does
+        # 按小数点对齐, 与 shapes.numericXShift 相同
+        i = text.rfind(decimalSymbol)
+        if i >= 0:
+            return string_width(text[:i], fontName, fontSize, encoding)
+        return width
+    return None
+
+
+def _widgetBounds(widget, cache=False):
+    """
+    Bounds of a widget without its own getBounds (没有 getBounds 方法的组件的边界).
+
+    Labels and legends are measured analytically from their attributes, the
+    same numbers their draw methods use.  Other widgets are drawn; widgets
+    measured by top level getBounds calls (cache=True) are remembered, and
+    from their second measurement on the result is cached by identity and
+    version stamp (see boundsStamp), alone or inside groups.  Widgets
+    measured only once never pay for the stamp.
+    标签和图例按属性直接计算, 与其 draw 方法使用的数值相同. 其他组件需要绘制;
+    顶层 getBounds 调用(cache=True)计算的组件会被记录, 从第二次计算起结果按
+    对象标识和版本戳缓存(见 boundsStamp), 单独计算或在图形组中都会使用.
+    只计算一次的组件不需要计算版本戳.
+    """
+    measure = _NATIVE_BOUNDS.get(type(widget).draw)
+    if measure is not None:
+        bounds = _nativeBounds(widget, measure)
+        if bounds is not NotImplemented:
+            return bounds
+
+    key = id(widget)
+    entry = _boundsCache.get(key)
+    if entry is not None and entry[0]() is not widget:
+        entry = None
+    if entry is None:
+        bounds = _getBounds(widget.draw())
+        if cache:
+            # measured once: remember the widget, stamp it when measured again
+            # 第一次计算: 只记录组件, 再次计算时才计算版本戳
+            _remember(widget, None, None)
+        return bounds
+    if entry[1] is not None and entry[1] == boundsStamp(widget):
+        return entry[2]
+    bounds = _getBounds(widget.draw())
+    # stamped after drawing, which may update private attributes
+    # 绘制可能修改私有属性, 所以在绘制后计算版本戳
+    _remember(widget, boundsStamp(widget), bounds)
+    return bounds
+
+
+def _nativeBounds(widget, measure):
+    """
+    Analytic bounds of a label or legend, NotImplemented if they must be
+    drawn.  The analytic code follows the draw methods of the installed
+    reportlab, so the first widget of each class is drawn as well: when the
+    two disagree, e.g. after reportlab changes its layout, widgets of that
+    class are measured by drawing from then on.
+    标签或图例按属性直接计算的边界, 需要绘制计算时返回 NotImplemented.
+    直接计算依照当前 reportlab 的 draw 方法, 每个类的第一个组件同时绘制并比较,
+    结果不一致时(如 reportlab 修改了排列方式)该类的组件此后都通过绘制计算.
+    """
+    cls = type(widget)
+    agrees = _nativeAgrees.get(cls)
+    if agrees is False:
+        return NotImplemented
+    bounds = measure(widget)
+    if agrees is None and bounds is not NotImplemented:
+        drawn = _getBounds(widget.draw())
+        agrees = _nativeAgrees[cls] = _sameBounds(bounds, drawn)
+        if not agrees:
+            return drawn
+    return bounds
+
+
+def _sameBounds(a, b):
+    "Whether two bounds agree up to rounding (两个边界是否相同, 允许舍入误差)"
+    if a is None or b is None:
+        return a is b
+    return all(
+        abs(u - v) <= 1e-6 * max(1.0, abs(u), abs(v)) for u, v in zip(a, b)
+    )
+
+
+def _remember(widget, stamp, bounds):
+    "Cache the bounds of a live widget (缓存组件的边界, 组件回收时删除)"
+    key = id(widget)
+    try:
+        ref = weakref.ref(widget, lambda ref: _boundsCache.pop(key, None))
+    except TypeError:
+        return
+    _boundsCache[key] = (ref, stamp, bounds)
+
+
+def boundsStamp(widget):
+    """
+    Version stamp of a widget's cached bounds: fingerprint of its class and
+    attributes, private ones included since charts and axes keep positions
+    in them (e.g. axis._x)
+    组件边界缓存的版本戳: 类和属性的指纹, 包括私有属性,
+    图表和坐标轴的位置保存在私有属性中(如 axis._x)
+    """
+    return fingerprint(type(widget), vars(widget))
+
+
+def clearBoundsCache():
+    "Forget all cached widget bounds (清空组件边界缓存)"
+    _boundsCache.clear()
+
+
+def _labelBounds(label):
+    """
+    Bounds of a chart label from its text metrics, as Label.draw lays out
+    the box and the lines; NotImplemented for labels drawn as paths or
+    flowables or with custom drawing
+    按文字尺寸计算图表标签的边界, 与 Label.draw 排列外框和文字行的方式相同;
+    绘制为路径、流对象或自定义绘制的标签返回 NotImplemented
+    """
+    if (
+        type(label)._rawDraw is not Label._rawDraw
+        or getattr(label, 'ddfKlass', None)
+        or getattr(label, 'customDrawChanger', None)
+        or label.strokeColor
+    ):
+        return NotImplemented
+    text = label._text
+    label._text = text or ''
+    if type(label).computeSize is Label.computeSize:
+        _computeLabelSize(label)
+    else:
+        label.computeSize()
+    label._text = text
+
+    rects = []
+    if label.boxFillColor or (label.boxStrokeColor and label.boxStrokeWidth):
+        x = label._left - label.leftPadding
+        y = label._bottom - label.bottomPadding
+        rects.append((x, y, x + label._width, y + label._height))
+    y = label._top - label._leading * label._baselineRatio
+    textAnchor = label._getTextAnchor()
+    if textAnchor == 'start':
+        x = label._left
+    elif textAnchor == 'middle':
+        x = label._left + label._ewidth * 0.5
+    else:
+        x = label._right
+    fontName = label.fontName
+    fontSize = label.fontSize
+    widths = label._lineWidths or [None] * len(label._lines)
+    for line, width in zip(label._lines, widths):
+        rects.append(
+            _stringBounds(line, x, y, fontName, fontSize, textAnchor, width)
+        )
+        y -= label._leading
+    if not rects:
+        return None
+
+    # the group transform of Label.draw: translate, then rotate
+    # Label.draw 中图形组的变换: 先平移, 再旋转
+    transform = shapes.mmult(
+        shapes.mmult(
+            shapes.nullTransform(),
+            shapes.translate(label.x + label.dx, label.y + label.dy),
+        ),
+        shapes.rotate(label.angle),
+    )
+    return _transformBounds(transform, *getRectsBounds(rects))
+
+
+def _computeLabelSize(label):
+    """
+    Label.computeSize for text labels, with the line widths measured by
+    text_metrics; sets the same attributes
+    (文字标签的 Label.computeSize, 行宽由 text_metrics 测量; 设置的属性相同)
+    """
+    fontName = label.fontName
+    fontSize = label.fontSize
+    label._lineWidths = []
+    # simpleSplit, wrapping to maxWidth (按 maxWidth 换行)
+    lines = asUnicode(label._text).split('\n')
+    if label.maxWidth:
+        width = lambda t: string_width(t, fontName, fontSize)
+        lines = [
+            part
+            for line in lines
+            for part in _simpleSplit(line, label.maxWidth, width)
+        ]
+    label._lines = lines
+    if not label.width:
+        label._width = label.leftPadding + label.rightPadding
+        if label._lines:
+            label._lineWidths = string_widths(label._lines, fontName, fontSize)
+            label._width += max(label._lineWidths)
+    else:
+        label._width = label.width
+    label._getBaseLineRatio()
+    if label.leading:
+        label._leading = label.leading
+    elif label.useAscentDescent:
+        label._leading = label._ascent - label._descent
+    else:
+        label._leading = fontSize * 1.2
+    label._computeSizeEnd(label._leading * len(label._lines))
+
+
+def _legendBounds(legend):
+    """
+    Bounds of a legend with plain colour swatches, following the layout of
+    Legend.draw; NotImplemented for automatic pairs, markers, callouts,
+    divider lines or underlines, which are measured by drawing
+    按 Legend.draw 的排列计算纯色色块图例的边界; 自动生成的颜色名称对、
+    标记符号、回调、分隔线或下划线返回 NotImplemented, 由绘制计算
+    """
+    entries = _measureLegend(legend)
+    if entries is NotImplemented:
+        return entries
+    return _arrangeLegend(legend, entries, legend.columnMaximum)
+
+
+def _measureLegend(legend):
+    """
+    Measure each entry of a plain legend once, with the text widths from
+    text_metrics: its column widths (as Legend._calculateMaxBoundaries), line
+    count (as Legend._calcHeight) and the width and anchor shift of each
+    line; NotImplemented for legends that are measured by drawing
+    逐项测量纯色色块图例一次, 文字宽度由 text_metrics 测量: 各列宽度(同
+    Legend._calculateMaxBoundaries)、行数(同 Legend._calcHeight)以及每行文字的
+    宽度和对齐偏移; 需要通过绘制计算的图例返回 NotImplemented
+    """
+    colorNamePairs = legend.colorNamePairs
+    n = not isAuto(colorNamePairs) and len(colorNamePairs)
+    cls = type(legend)
+    if (
+        not n
+        or getattr(legend, 'swatchMarker', None) is not None
+        or legend.dividerLines
+        or legend.colEndCallout
+        or getattr(legend, 'callout', None)
+        or getattr(legend, 'swatchCallout', None)
+        or legend.alignment not in ('left', 'right')
+        or cls._defaultSwatch is not Legend._defaultSwatch
+        or cls._calculateMaxBoundaries is not Legend._calculateMaxBoundaries
+        or cls._calcHeight is not Legend._calcHeight
+    ):
+        return NotImplemented
+
+    fontName = legend.fontName
+    fontSize = legend.fontSize
+    subCols = legend.subCols
+    texts = legend._getTexts(colorNamePairs)
+    entries = []
+    for i in range(n):
+        col, name = colorNamePairs[i]
+        if isAuto(name) or not (col is None or isinstance(col, Color)):
+            return NotImplemented
+        T = _getLines(name)
+        if not isSeq(name):
+            T = [T]
+        text = texts[i]
+        if not isSeq(text):
+            text = [text]
+        SC = [subCols[k, i] for k in range(max(len(T), len(text)))]
+
+        # column widths, as legends._getWidths
+        # 各列宽度, 同 legends._getWidths
+        widths = []
+        for t, sc in zip(text, SC):
+            m = string_widths(
+                t.split('\n'),
+                getattr(sc, 'fontName', fontName),
+                getattr(sc, 'fontSize', fontSize),
+            )
+            widths.append(max(sc.minWidth, m and max(m) or 0))
+            widths.append(sc.rpad)
+        del widths[-1]
+
+        parts = []
+        for lines, sc in zip(T, SC):
+            if (
+                getattr(sc, 'underlines', None)
+                or getattr(sc, 'overlines', None)
+                or getattr(sc, 'vAlign', 'top') != 'top'
+            ):
+                return NotImplemented
+            anchor = sc.align
+            if anchor == 'left':
+                anchor = 'start'
+                side = 0
+            elif anchor == 'right':
+                anchor = 'end'
+                side = 1
+            elif anchor == 'numeric':
+                side = 1
+            else:
+                anchor = 'middle'
+                side = 2
+            fN = getattr(sc, 'fontName', fontName)
+            fS = getattr(sc, 'fontSize', fontSize)
+            fL = getattr(sc, 'leading', None) or 1.2 * fontSize
+            L = [
+                (_anchorShift(t, w, anchor, fN, fS), w)
+                for t, w in zip(lines, string_widths(lines, fN, fS))
+            ]
+            parts.append((side, sc.dx, sc.dy, fS, fL, L))
+        entries.append((col, widths, _getLineCount(texts[i]), parts))
+    return entries
+
+
+def _legendAscent(legend):
+    "Font ascent of the legend text, as Legend.draw (图例文字的上升高度)"
+    ascent = getFont(legend.fontName).face.ascent / 1000.0
+    if ascent == 0:
+        ascent = 0.718  # default (from helvetica)
+    return ascent * legend.fontSize
+
+
+def _arrangeLegend(legend, entries, columnMaximum):
+    """
+    Bounds of the measured legend entries arranged by Legend.draw with
+    columnMaximum entries per column, without measuring any text
+    已测量的图例项按 Legend.draw 每列 columnMaximum 项排列后的边界, 不再测量文字
+    """
+    n = len(entries)
+    dx = legend.dx
+    dy = legend.dy
+    alignment = legend.alignment
+    deltax = legend.deltax
+    deltay = legend.deltay
+    dxTextSpace = legend.dxTextSpace
+    yGap = legend.yGap
+    if not deltay:
+        deltay = max(dy, legend.fontSize * 1.2) + legend.autoYPadding
+    ba = legend.boxAnchor
+
+    # column widths, as Legend._calculateMaxBoundaries
+    # 各列宽度, 同 Legend._calculateMaxBoundaries
+    M = [entry[1] for entry in entries]
+    nWidths = max([len(widths) for widths in M])
+    variColumn = legend.variColumn
+    if variColumn:
+        maxWidth = [
+            _transMax(nWidths, M[r : r + columnMaximum])
+            for r in range(0, n, columnMaximum)
+        ]
+    else:
+        maxWidth = _transMax(nWidths, M)
+    nCols = int((n + columnMaximum - 1) / (columnMaximum * 1.0))
+    xW = dx + dxTextSpace + legend.autoXPadding
+    if variColumn:
+        width = sum([m[-1] for m in maxWidth]) + xW * nCols
+    else:
+        deltax = max(maxWidth[-1] + xW, deltax)
+        width = nCols * deltax
+        maxWidth = nCols * [maxWidth]
+
+    thisx = legend.x
+    thisy = legend.y - dy
+    ascent = _legendAscent(legend)
+    if ba not in ('ne', 'n', 'nw', 'autoy'):
+        height = _legendHeight(legend, entries, columnMaximum, ascent)
+        if ba in ('e', 'c', 'w'):
+            thisy += height / 2.0
+        else:
+            thisy += height
+    if ba not in ('nw', 'w', 'sw', 'autox'):
+        if ba in ('n', 'c', 's'):
+            thisx -= width / 2
+        else:
+            thisx -= width
+    upperlefty = thisy
+
+    swdx = getattr(legend, 'swdx', 0)
+    swdy = getattr(legend, 'swdy', 0)
+    lim = columnMaximum - 1
+    rects = []
+    for i, (col, widths, lineCount, parts) in enumerate(entries):
+        jOffs = maxWidth[int(i / (columnMaximum * 1.0))]
+        y0 = thisy + (dy - ascent) * 0.5
+        if alignment == 'left':
+            x = thisx
+            swatchX = thisx + jOffs[-1] + dxTextSpace
+        else:
+            x = thisx + dx + dxTextSpace
+            swatchX = thisx
+        yd = y0
+        for k, (side, scdx, scdy, fS, fL, L) in enumerate(parts):
+            x1 = x + jOffs[k * 2]
+            x2 = x + jOffs[k * 2 + 1]
+            if side == 0:
+                xoffs = x1
+            elif side == 1:
+                xoffs = x2
+            else:
+                xoffs = 0.5 * (x1 + x2)
+            y = y0
+            for shift, w in L:
+                sx = xoffs + scdx
+                if shift is not None:
+                    sx -= shift
+                sy = y + scdy
+                rects.append((sx, sy - 0.2 * fS, sx + w, sy + fS))
+                y -= fL
+            yd = min(yd, y)
+        leadingMove = 2 * y0 - yd - thisy
+
+        if col is not None:
+            swatchX += swdx
+            swatchY = thisy + swdy
+            rects.append((swatchX, swatchY, swatchX + dx, swatchY + dy))
+
+        if i % columnMaximum == lim:
+            if variColumn:
+                thisx += jOffs[-1] + xW
+            else:
+                thisx = thisx + deltax
+            thisy = upperlefty
+        else:
+            thisy = thisy - max(deltay, leadingMove) - yGap
+
+    if not rects:
+        return None
+    # Legend.draw returns an untransformed group
+    # Legend.draw 返回的图形组没有变换
+    return _transformBounds(shapes.nullTransform(), *getRectsBounds(rects))
+
+
+def _legendHeight(legend, entries, columnMaximum, ascent):
+    """
+    Legend._calcHeight with columnMaximum entries per column
+    (每列 columnMaximum 项时图例的高度, 同 Legend._calcHeight)
+    """
+    dy = legend.dy
+    yGap = legend.yGap
+    thisy = upperlefty = legend.y - dy
+    leading = legend.fontSize * 1.2
+    deltay = legend.deltay
+    if not deltay:
+        deltay = max(dy, leading) + legend.autoYPadding
+    count = 0
+    lowy = upperlefty
+    lim = columnMaximum - 1
+    for entry in entries:
+        y0 = thisy + (dy - ascent) * 0.5
+        y = y0 - entry[2] * leading
+        leadingMove = 2 * y0 - y - thisy
+        newy = thisy - max(deltay, leadingMove) - yGap
+        lowy = min(y, newy, lowy)
+        if count == lim:
+            count = 0
+            thisy = upperlefty
+        else:
+            thisy = newy
+            count = count + 1
+    return upperlefty - lowy
+
+
+def legendLayout(legend, availWidth, availHeight, horizontal=True):
+    """
+    Arrange a legend in the available box (在可用区域内排列图例).
+
+    Chooses legend.columnMaximum, the number of rows, so that the legend
+    fits availWidth x availHeight: the fewest rows that fit for horizontal
+    legends, the fewest columns for vertical ones.  When no arrangement
+    fits, the one that needs the least scaling down.  Entries are measured
+    once and each candidate is arranged arithmetically (see _arrangeLegend),
+    the number of rows is found by binary search: the width does not grow
+    and the height does not shrink as rows are added (with variColumn only
+    roughly, so the choice may be a near-best one).  Legends that cannot be
+    measured analytically, or whose class failed the check against drawing
+    (see _nativeBounds), are measured by drawing each candidate.
+    选择 legend.columnMaximum(行数), 使图例放入 availWidth x availHeight 的区域:
+    水平图例选择放得下的最少行数, 垂直图例选择最少列数; 都放不下时选择缩小比例最小的
+    排列. 图例项只测量一次, 每个候选排列按算术计算(见 _arrangeLegend), 行数用二分查找:
+    行数增加时宽度不增加, 高度不减少(variColumn 时只是大致如此, 结果可能接近最优).
+    不能直接计算或所属的类与绘制结果不一致(见 _nativeBounds)的图例, 对每个候选排列
+    绘制后计算.
+
+    @param legend: reportlab 的 Legend
+    @param availWidth: 可用宽度
+    @param availHeight: 可用高度
+    @param horizontal: 是否为水平图例
+    @return: (columnMaximum, 宽度, 高度), 宽高为该排列的边界大小, 不会修改 legend
+    """
+    colorNamePairs = legend.colorNamePairs
+    n = 0 if isAuto(colorNamePairs) else len(colorNamePairs)
+    cls = type(legend)
+    if _NATIVE_BOUNDS.get(cls.draw) is _legendBounds:
+        if cls not in _nativeAgrees:
+            # check the analytic layout against drawing once per class
+            # 每个类第一次使用时与绘制结果比较
+            _nativeBounds(legend, _legendBounds)
+        entries = (
+            _measureLegend(legend) if _nativeAgrees.get(cls) else NotImplemented
+        )
+    else:
+        entries = NotImplemented
+    if entries is NotImplemented:
+
+        def bounds(rows):
+            columnMaximum = legend.columnMaximum
+            legend.columnMaximum = rows
+            try:
+                return getBounds(legend)
+            finally:
+                legend.columnMaximum = columnMaximum
+
+    else:
+
+        def bounds(rows):
+            return _arrangeLegend(legend, entries, rows)
+
+    sizes = {}
+
+    def size(rows):
+        if rows not in sizes:
+            x1, y1, x2, y2 = bounds(rows)
+            sizes[rows] = (x2 - x1, y2 - y1)
+        return sizes[rows]
+
+    if n < 2:
+        rows = max(n, 1)
+        return (rows,) + size(rows)
+
+    def first(predicate, lo, hi):
+        "smallest rows in [lo, hi] satisfying predicate, hi + 1 if none"
+        while lo <= hi:
+            mid = (lo + hi) // 2
+            if predicate(mid):
+                hi = mid - 1
+            else:
+                lo = mid + 1
+        return lo
+
+    # fewest rows narrow enough, most rows low enough
+    # 宽度放得下的最少行数, 高度放得下的最多行数
+    narrow = first(lambda r: size(r)[0] <= availWidth, 1, n)
+    low = first(lambda r: size(r)[1] > availHeight, 1, n) - 1
+    if narrow <= low:
+        rows = narrow if horizontal else low
+        return (rows,) + size(rows)
+
+    # nothing fits: the scale factors min(availWidth / width, availHeight /
+    # height) cross where the width stops limiting
+    # 都放不下: 缩小比例在宽度不再是限制条件处最大
+    def scale(rows):
+        w, h = size(rows)
+        return min(
+            availWidth / w if w else 1e308, availHeight / h if h else 1e308
+        )
+
+    rows = first(
+        lambda r: size(r)[0] * availHeight <= availWidth * size(r)[1], 1, n
+    )
+    candidates = [r for r in (rows - 1, rows) if 1 <= r <= n]
+    rows = max(candidates, key=lambda r: (scale(r), -r if horizontal else r))
+    return (rows,) + size(rows)
+
+
+# reportlab getBounds methods replaced by the linear versions above
+# 由上面的线性实现代替的 reportlab getBounds 方法
+_GROUP_GET_BOUNDS = shapes.Group.getBounds
+_WIDGET_GET_BOUNDS = Widget.getBounds
+_POINTS_GET_BOUNDS = (shapes.PolyLine.getBounds, shapes.Polygon.getBounds)
+_STRING_GET_BOUNDS = shapes.String.getBounds
+
+# analytic bounds of widgets, by draw method; subclasses that override
+# draw are measured by drawing
+# 按 draw 方法对应的组件边界计算函数; 重写了 draw 的子类通过绘制计算
+_NATIVE_BOUNDS = {Label.draw: _labelBounds, Legend.draw: _legendBounds}
+
+# whether the analytic bounds of a widget class matched its drawn bounds
+# {class: bool}, see _nativeBounds
+# 组件类直接计算的边界是否与绘制结果一致 {类: 是否一致}, 见 _nativeBounds
+_nativeAgrees = {}
+
+# bounds of widgets measured by drawing {id: (weak reference, stamp, bounds)}
+# 通过绘制计算边界的组件 {id: (弱引用, 版本戳, 边界)}
+_boundsCache = {}
+
+
 class Sizer(Widget):
     _attrMap = AttrMap(
         BASE=shapes.SolidShape,
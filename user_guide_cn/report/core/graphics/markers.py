@@ -0,0 +1,204 @@
+"""
+数据点标记的盖印
+
+散点图、气泡图的每个数据点都是一个 Marker 组件, 绘制为完整的路径, 几万个点的图形
+会重复输出几 MB 相同的路径. 这里把同一系列中外观相同的连续标记合并为一个 MarkerStamps
+节点:
+
+- PDF 中标记的图形只作为表单对象(form XObject)定义一次, 每个点只输出
+  "q 1 0 0 1 x y cm /表单 Do Q"; 气泡图大小不同的标记按比例缩放同一个表单,
+  线宽在每次盖印时设置, 与原来相同;
+- 其他渲染器(PNG、SVG 等)仍然逐个绘制标记.
+
+MarkerStamping 混入类在 LinePlot(含 ScatterPlot)生成系列之后合并标记,
+quickChart 的散点图、气泡图在点数达到 MARKER_STAMP_POINTS 时使用::
+
+    chart = with_marker_stamps(ScatterPlot)()
+"""
+from reportlab.graphics.shapes import DirectDraw
+from reportlab.graphics.charts.lineplots import LinePlot
+from reportlab.graphics.renderbase import StateTracker
+from reportlab.graphics.renderPDF import _PDFRenderer
+from reportlab.graphics.widgets.markers import Marker
+from reportlab.lib.rl_accel import fp_str
+
+from report.components.fingerprint import fingerprint
+from report.core.graphics.layout import getBounds
+
+# quickChart 自动盖印标记的最少数据点数
+MARKER_STAMP_POINTS = 1000
+
+# 决定标记外观的属性, 不含位置、大小和线宽
+_STYLE_ATTRIBUTES = (
+    'kind',
+    'dx',
+    'dy',
+    'angle',
+    'fillColor',
+    'strokeColor',
+    'arrowBarbDx',
+    'arrowHeight',
+)
+
+
+def _style(marker):
+    """ 标记的外观, 外观和线宽都相同的连续标记才合并 """
+    return tuple(getattr(marker, name) for name in _STYLE_ATTRIBUTES) + (
+        marker.strokeWidth,
+    )
+
+
+class _TemplateRenderer(_PDFRenderer):
+    """ 在表单中绘制标记模板, 不设置线宽, 线宽由盖印时的图形状态决定 """
+
+    def applyStateChanges(self, delta, newState):
+        delta.pop('strokeWidth', None)
+        _PDFRenderer.applyStateChanges(self, delta, newState)
+
+
+class MarkerStamps(DirectDraw):
+    """
+    一组外观相同的标记: 一个模板标记和每个点的位置、大小
+    """
+
+    def __init__(self, markers):
+        """
+        @param markers: 外观相同的 Marker 列表
+        """
+        size = max(marker.size for marker in markers)
+        template = markers[0].clone()
+        template.x = template.y = 0
+        template.size = size
+        self._template = template
+        # 每个点的 (x, y, 相对模板的缩放比例)
+        self._stamps = [
+            (marker.x, marker.y, marker.size / size if size else 1)
+            for marker in markers
+        ]
+
+    def markers(self):
+        """ 还原为逐个的 Marker """
+        template = self._template
+        markers = []
+        for x, y, scale in self._stamps:
+            marker = template.clone()
+            marker.x = x
+            marker.y = y
+            marker.size = template.size * scale
+            markers.append(marker)
+        return markers
+
+    def getBounds(self):
+        x1, y1, x2, y2 = getBounds(self._template)
+        stamps = self._stamps
+        return (
+            min(x + x1 * s for x, _, s in stamps),
+            min(y + y1 * s for _, y, s in stamps),
+            max(x + x2 * s for x, _, s in stamps),
+            max(y + y2 * s for _, y, s in stamps),
+        )
+
+    def _formName(self, canvas):
+        """ 模板对应的表单, 同一文档中外观和大小相同的模板只定义一次 """
+        template = self._template
+        name = 'Marker' + fingerprint(
+            [getattr(template, n) for n in _STYLE_ATTRIBUTES], template.size
+        )
+        if not canvas.hasForm(name):
+            # 线宽在盖印时设置, 表单的边界留出足够的余量
+            page_width, page_height = canvas._pagesize
+            canvas.beginForm(
+                name, -page_width, -page_height, page_width, page_height
+            )
+            renderer = _TemplateRenderer()
+            renderer._canvas = canvas
+            renderer._tracker = StateTracker()
+            renderer.drawNode(template)
+            canvas.endForm()
+        return name
+
+    def drawDirectly(self, renderer):
+        canvas = renderer._canvas
+        if not (
+            isinstance(renderer, _PDFRenderer) and hasattr(canvas, 'beginForm')
+        ):
+            for marker in self.markers():
+                renderer.drawNode(marker)
+            return
+
+        name = self._formName(canvas)
+        xobject = canvas._doc.getXObjectName(name)
+        width = self._template.strokeWidth
+        stamps = self._stamps
+        code = []
+        if all(s == 1 for _, _, s in stamps):
+            code.append(f'{fp_str(width)} w')
+            code.extend(
+                f'q 1 0 0 1 {fp_str(x, y)} cm /{xobject} Do Q'
+                for x, y, _ in stamps
+            )
+        else:
+            # 缩放会同时缩放线宽, 每个点按比例设置线宽
+            code.extend(
+                f'q {fp_str(s, 0, 0, s, x, y)} cm {fp_str(width / s)} w'
+                f' /{xobject} Do Q'
+                for x, y, s in stamps
+                if s
+            )
+        # 与 Canvas.doForm 相同: 记录用到的表单, 输出引用, 这里一次输出全部盖印
+        canvas._formsinuse.append(name)
+        canvas._code.append('\n'.join(code))
+
+
+def stamp_markers(group):
+    """
+    图形组中外观相同的连续 Marker 合并为 MarkerStamps, 绘制顺序不变
+
+    @param group: 图形组, 直接修改
+    """
+    contents = []
+    run = []
+    for node in group.contents:
+        if type(node) is Marker and (not run or _style(node) == _style(run[0])):
+            run.append(node)
+            continue
+        if run:
+            contents.append(run[0] if len(run) == 1 else MarkerStamps(run))
+            run = []
+        if type(node) is Marker:
+            run.append(node)
+        else:
+            contents.append(node)
+    if run:
+        contents.append(run[0] if len(run) == 1 else MarkerStamps(run))
+    group.contents[:] = contents
+
+
+class MarkerStamping:
+    """ LinePlot 的混入类: 生成系列后盖印数据点的标记 """
+
+    def makeLines(self):
+        g = super().makeLines()
+        stamp_markers(g)
+        return g
+
+
+# {reportlab 图形类: 盖印标记的子类}
+_STAMPING_CLASSES = {}
+
+
+def with_marker_stamps(klass):
+    """
+    LinePlot(含 ScatterPlot)及其子类加上标记盖印的子类, 同一个类只创建一次
+
+    @param klass: 图形类, 可以是 with_label_placement 创建的子类
+    @return: 子类
+    """
+    stamping = _STAMPING_CLASSES.get(klass)
+    if stamping is None:
+        if not issubclass(klass, LinePlot):
+            raise TypeError(f'{klass.__name__} 不支持标记盖印')
+        stamping = _STAMPING_CLASSES[klass] = type(
+            klass.__name__, (MarkerStamping, klass), {'__module__': __name__}
+        )
+    return stamping
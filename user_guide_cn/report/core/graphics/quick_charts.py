@@ -45,10 +45,15 @@ absent, and the position of the legend.  It divides
 
 布局逻辑首先查看图形中“事物”的数量：标题，图例，图表，轴标签。 它记录存在或不存在的图例以及图例的位置。 它分裂
 """
+import os
 import sys
+import array
 from functools import reduce
+from itertools import islice
+from collections import namedtuple
 
 from reportlab.lib.colors import *
+from reportlab import rl_config
 from reportlab.rl_config import _FUZZ
 from reportlab.lib.extformat import magicformat
 from reportlab.graphics.shapes import Drawing, String, Rect, Line, Group
@@ -58,7 +63,10 @@ from reportlab.lib.validators import _isColor
 from reportlab.lib.utils import isStr, asBytes, safer_globals
 from reportlab.graphics.charts.axes import TickLabeller
 
-from report.core.graphics.layout import getBounds, Sizer
+from report.core.graphics.layout import getBounds, legendLayout, Sizer
+from report.core.graphics.data_sources import DataSource
+from report.core.graphics.label_placement import with_label_placement
+from report.core.graphics.markers import MARKER_STAMP_POINTS, with_marker_stamps
 
 
 # area 面积图
@@ -102,6 +110,20 @@ CHART_TYPE_SCATTER = 'scatter'
 CHART_TYPE_SCATTER_LINES = 'scatter_lines'
 CHART_TYPE_SCATTER_LINES_MARKERS = 'scatter_lines_markers'
 
+# chart types whose series can be downsampled by maxPoints
+# 可以按 maxPoints 降采样的图表类型
+DOWNSAMPLED_CHART_TYPES = (
+    CHART_TYPE_LINE_CHART,
+    CHART_TYPE_LINE_CHART_MARKERS,
+    CHART_TYPE_LINE_CHART_3D,
+    CHART_TYPE_LINE_PLOT,
+    CHART_TYPE_LINE_PLOT_MARKERS,
+    CHART_TYPE_LINE_PLOT_3D,
+    CHART_TYPE_SCATTER,
+    CHART_TYPE_SCATTER_LINES,
+    CHART_TYPE_SCATTER_LINES_MARKERS,
+)
+
 CHART_TYPES = [
     CHART_TYPE_AREA,
     CHART_TYPE_AREA_STACKED,
@@ -301,11 +323,35 @@ def _simpleData(data):
     @param data:
     @return:
     """
+    if _isArray(data):
+        return data[0] if data.ndim > 1 else data
     if isinstance(data[0], (list, tuple)):
         return data[0]
     return data
 
 
+def _splitArraySeries(data, reqDim):
+    """
+    Split array rows into x, y (and z) data as done for lists in quickChart
+    (与 quickChart 中列表的处理相同, 将数组的行拆分为 x, y (和 z) 数据)
+    """
+    zData = None
+    if len(data) == 1:
+        xData = 'auto'
+        if reqDim == 3:
+            zData = data
+            data = _asMatrix(range(data.shape[1]))
+    elif reqDim == 3:
+        if len(data) & 1:
+            xData, data = data[0], data[1:]
+        else:
+            xData = 'auto'
+        data, zData = data[0::2], data[1::2]
+    else:
+        xData, data = data[0], data[1:]
+    return xData, data, zData
+
+
 def _makeFakes(n, names, label):
     if names is None:
         return None
@@ -332,10 +378,19 @@ def _convertAngle(angle, default=0):
     return float(angle)
 
 
-def _boxConstrain(obj, width, height):
-    x1, y1, x2, y2 = getBounds(obj)
-    w = x2 - x1
-    h = y2 - y1
+def _boxConstrain(obj, width, height, size=None):
+    """
+    Scale obj down to fit width x height if needed (必要时缩小 obj 以放入区域)
+
+    @param size: (width, height) of obj if already known, saves measuring it
+                 已知的 obj 宽高, 不必再计算边界
+    """
+    if size is None:
+        x1, y1, x2, y2 = getBounds(obj)
+        w = x2 - x1
+        h = y2 - y1
+    else:
+        w, h = size
     if w > width + _FUZZ or h > height + _FUZZ:
         scale = min(width / float(w), height / float(h))
         w = scale * w
@@ -344,31 +399,6 @@ def _boxConstrain(obj, width, height):
     return obj, w, h
 
 
-def _bestHorizontalLegendColumnMaximum(n, aW, aH, w, h):
-    """
-    @param n: number of legend elements 图例元素数量
-    @param aW: available width 可用宽度
-    @param aH: available height 可用高度
-    @param w: one row width 一排宽度
-    @param h: one row height 一排高度
-    @return:
-    """
-    w = w / float(n)
-    m = n / (int(n ** 0.5) + 1)
-    bc = 1e308
-    for r in range(1, m + 1):
-        c = int(n / r)
-        eW = w * c
-        eH = r * h
-        if r == 1 and eW <= aW:
-            return r
-        c = abs(min(aW / float(eW), aH / float(eH)) - 1)
-        if c < bc:
-            bc = c
-            br = r
-    return br
-
-
 def _showBBox(obj, d, strokeColor=pink, strokeWidth=0.5):
     x0, y0, x1, y1 = getBounds(obj)
     d.add(
@@ -447,6 +477,14 @@ def quickChart(
     # 线标记，例如散布线标记
     markerType=None,
     markerSize=6,
+    # downsample longer line and scatter series to at most this many points
+    # 折线图、散点图的系列超过该点数时降采样, 保持曲线形状和最大最小值
+    maxPoints=None,
+    # draw the markers of scatter and bubble charts as one stamped form per
+    # series, None for charts with at least MARKER_STAMP_POINTS points
+    # 散点图、气泡图的标记只定义一次再逐点盖印, None 表示点数达到
+    # MARKER_STAMP_POINTS 时盖印
+    markerStamps=None,
     # legend properties.
     # 图例属性。
     legendPos='right',
@@ -471,6 +509,8 @@ def quickChart(
     padMax=None,
     padMin=None,
     padFrac=0.05,
+    # resolve overlapping data labels of pie, bar, column and scatter charts
+    # 解决饼图、条形图、柱形图和散点图数据标签的重叠
     checkLabelOverlap=0,
     orderMode='fixed',
     pointerLabelMode=None,
@@ -540,9 +580,30 @@ def quickChart(
         chartType = CHART_TYPE_COLUMN
         seriesRelation = 'percent'
 
+    reqDim = 1
+    if chartType in (
+        CHART_TYPE_SCATTER,
+        CHART_TYPE_SCATTER_LINES,
+        CHART_TYPE_SCATTER_LINES_MARKERS,
+        CHART_TYPE_LINE_PLOT,
+        CHART_TYPE_LINE_PLOT_3D,
+        CHART_TYPE_LINE_PLOT_MARKERS,
+    ):
+        reqDim = 2
+    elif chartType == CHART_TYPE_BUBBLE:
+        reqDim = 3
+
     if data is not None:
         if isinstance(data, str):
             data = parseDataBlock(data)
+        elif _isArray(data):
+            data = _asMatrix(data)
+        elif isinstance(data, DataSource):
+            data, categoryNames, seriesNames = _sourceData(
+                data, reqDim, categoryNames, seriesNames
+            )
+        else:
+            data = _bufferRows(data)
     if textData and isinstance(textData, str):
         textData = parseDataBlock(
             textData, asText=1, maxLen=max(list(map(len, data)))
@@ -557,29 +618,19 @@ def quickChart(
         CHART_TYPE_PIE_EXPLODED_3D,
     )
 
-    reqDim = 1
-    if chartType in (
-        CHART_TYPE_SCATTER,
-        CHART_TYPE_SCATTER_LINES,
-        CHART_TYPE_SCATTER_LINES_MARKERS,
-        CHART_TYPE_LINE_PLOT,
-        CHART_TYPE_LINE_PLOT_3D,
-        CHART_TYPE_LINE_PLOT_MARKERS,
-    ):
-        reqDim = 2
-    elif chartType == CHART_TYPE_BUBBLE:
-        reqDim = 3
-
     if oneLevel:
         nSeries = 1
-        if not isinstance(_data[0], (list, tuple)):
+        if not (_isArray(_data) or isinstance(_data[0], (list, tuple))):
             _data = [_data]
         data = _simpleData(data)
         nCategories = len(data)
     else:
         nSeries = len(data)
         nCategories = len(data[0])
-        if reqDim > 1:
+        if reqDim > 1 and _isArray(data):
+            xData, data, zData = _splitArraySeries(data, reqDim)
+            nSeries = len(data)
+        elif reqDim > 1:
             data = data[:]
             zData = None
             if nSeries == 1:
@@ -611,6 +662,28 @@ def quickChart(
     seriesNames = _makeFakes(nSeries, seriesNames, 'series')
     categoryNames = _makeFakes(nCategories, categoryNames, 'category')
 
+    # downsample long series before the chart and its axes are set up
+    # 在配置图表和坐标轴之前对过长的系列降采样
+    if (
+        maxPoints
+        and chartType in DOWNSAMPLED_CHART_TYPES
+        and nCategories > maxPoints
+    ):
+        if reqDim == 1 or isinstance(xData, str):
+            x = None
+        else:
+            x = _toList(xData)
+        keep = downsampleIndices(x, _toList(data), int(maxPoints))
+        data = _takeColumns(data, keep)
+        _data = _takeColumns(_data, keep)
+        if textData:
+            textData = _takeColumns(textData, keep)
+        if reqDim > 1:
+            xData = [x[i] if x else i + 1 for i in keep]
+        if categoryNames and len(categoryNames) == nCategories:
+            categoryNames = [categoryNames[i] for i in keep]
+        nCategories = len(keep)
+
     # compute font sizes to pass into chart.  There are many optional font sizes
     # and it saves us code to assign the default values early.
     FONT_SIZE_BIG = 0.075 * height
@@ -948,22 +1021,11 @@ def quickChart(
             (legendMaxHFrac < 0 and hleg) or legendMaxHFrac > 0
         ):
             aH = min(max(legendYPad, abs(legendMaxHFrac * height)), aH)
-        n = len(lc)
-        if hleg:
-            leg.columnMaximum = 1
-            if n >= 3:
-                x1, y1, x2, y2 = getBounds(leg)
-                leg.columnMaximum = _bestHorizontalLegendColumnMaximum(
-                    n, aW, aH, x2 - x1, y2 - y1
-                )
-        else:
-            leg.columnMaximum = int(aH / legendFontSize * 1.2)
-        if 1:
-            leg, legendWidth, legendHeight = _boxConstrain(leg, aW, aH)
-        else:
-            x1, y1, x2, y2 = getBounds(leg)
-            legendWidth = x2 - x1
-            legendHeight = y2 - y1
+        # rows of the legend: the fewest rows (horizontal) or columns
+        # (vertical) that fit the available box
+        # 图例的行数: 能放入可用区域的最少行数(水平图例)或最少列数(垂直图例)
+        leg.columnMaximum, w, h = legendLayout(leg, aW, aH, hleg)
+        leg, legendWidth, legendHeight = _boxConstrain(leg, aW, aH, (w, h))
         d.add(leg, 'legend')
 
         if legendMode is None:
@@ -1081,6 +1143,7 @@ def quickChart(
             dataLabelsFontColor=dataLabelsFontColor,
             dataLabelsAlignment=dataLabelsAlignment,
             _3d=_3d,
+            checkLabelOverlap=checkLabelOverlap,
         )
 
     elif chartType == CHART_TYPE_BAR:
@@ -1116,6 +1179,7 @@ def quickChart(
             dataLabelsFontColor=dataLabelsFontColor,
             dataLabelsAlignment=dataLabelsAlignment,
             _3d=_3d,
+            checkLabelOverlap=checkLabelOverlap,
         )
 
     elif chartType in (
@@ -1234,6 +1298,8 @@ def quickChart(
             dataLabelsFontColor=dataLabelsFontColor,
             markerType=markerType,
             markerSize=markerSize,
+            checkLabelOverlap=checkLabelOverlap,
+            markerStamps=markerStamps,
         )
 
     elif chartType in (
@@ -1274,6 +1340,8 @@ def quickChart(
             dataLabelsFontColor=dataLabelsFontColor,
             markerType=markerType,
             markerSize=markerSize,
+            checkLabelOverlap=checkLabelOverlap,
+            markerStamps=markerStamps,
         )
     elif chartType == CHART_TYPE_BUBBLE:
         chart = getBubblePlot(
@@ -1310,6 +1378,8 @@ def quickChart(
             dataLabelsFontColor=dataLabelsFontColor,
             markerType=markerType,
             markerSize=markerSize,
+            checkLabelOverlap=checkLabelOverlap,
+            markerStamps=markerStamps,
         )
 
     elif chartType in (
@@ -1621,6 +1691,79 @@ def checkArgs(dict):
 #  Data block manipulation helpers - turn 2d array into whatever needed
 #
 ###########################################################################
+#
+#  data may also be a NumPy array (数据也可以是 NumPy 数组): normalization,
+#  percent/stacked transforms and label values are then computed on the
+#  array, and lists are only built when handing data to the chart classes.
+#  numpy is never imported unless an array is passed in.
+#  (数组上的计算向量化完成, 交给图表类时才转换为列表; 不传入数组时不导入 numpy)
+#
+def _isArray(data):
+    "True for NumPy arrays, tested by interface (按接口判断是否为 NumPy 数组)"
+    return hasattr(data, 'ndim') and hasattr(data, 'tolist')
+
+
+# array.array type codes holding numbers (数值类型的 array.array 类型码)
+_NUMBER_TYPECODES = frozenset('bBhHiIlLqQfd')
+
+
+def _isNumberBuffer(row):
+    "True for an array.array of numbers (数值类型的 array.array)"
+    return isinstance(row, array.array) and row.typecode in _NUMBER_TYPECODES
+
+
+def _bufferRows(data):
+    """
+    Rows given as array.array become lists, as the chart classes expect
+    (array.array 形式的数据行转换为列表)
+    """
+    if isinstance(data, (list, tuple)) and any(map(_isNumberBuffer, data)):
+        return [row.tolist() if _isNumberBuffer(row) else row for row in data]
+    return data
+
+
+def _asMatrix(data):
+    """
+    Return a 2d numeric array, one row per series; integer data keeps its
+    dtype so that data labels print 12, not 12.0, as for lists
+    (转换为二维数值数组, 每行一个系列; 整数数据保持整数类型, 数据标签与列表相同)
+    """
+    import numpy as np
+
+    data = np.asarray(data)
+    if data.dtype.kind not in 'iuf':
+        data = np.asarray(data, dtype=float)
+    return np.atleast_2d(data)
+
+
+def _toList(data):
+    "Lists for the chart classes; NaN becomes None (转换为列表, NaN 转为 None)"
+    if not _isArray(data):
+        return data
+    import numpy as np
+
+    if data.dtype.kind == 'f' and np.isnan(data).any():
+        data = np.where(np.isnan(data), None, data)
+    return data.tolist()
+
+
+def _sourceData(source, reqDim, categoryNames, seriesNames):
+    """
+    Data and default category / series names read from a DataSource
+    (从数据源读取数据, 并用其 x 列和列名作为默认的分类名称和系列名称).
+    Charts needing x values get the numeric x column as their first row.
+    """
+    loaded = source.load()
+    data = list(loaded.series)
+    if reqDim > 1 and loaded.x is not None:
+        data.insert(0, loaded.x)
+    elif categoryNames is None and loaded.labels is not None:
+        categoryNames = loaded.labels
+    if seriesNames is None and loaded.names:
+        seriesNames = loaded.names
+    return data, categoryNames, seriesNames
+
+
 def parseDataBlock(text, asText=0, maxLen=None):
     lines = text.split('\n')
     data = []
@@ -1656,6 +1799,8 @@ def getLegendSize(rowCount, fontSize):
 
 def normalizeData(data, decimals=None):
     "Return new data set where each group nsums to 100"
+    if _isArray(data):
+        return _normalizeArray(data, decimals)
     colCount = len(data[0])
     rowCount = len(data)
 
@@ -1688,6 +1833,26 @@ def normalizeData(data, decimals=None):
     return newBlock
 
 
+def _normalizeArray(data, decimals=None):
+    "normalizeData for arrays, returns an array (数组版本的 normalizeData, 返回数组)"
+    import numpy as np
+
+    data = _asMatrix(data)
+    assert not np.isnan(data).any(), (
+        "Cannot accept null data points in " "percent style charts!"
+    )
+    newBlock = 100 * data / data.sum(axis=0)
+    if decimals is not None:
+        from rlextra.utils.vecround import vecRound
+
+        m = float(10 ** decimals)
+        newBlock = np.array(
+            [vecRound(col, m * 100, m) for col in newBlock.T.tolist()],
+            dtype=float,
+        ).T
+    return newBlock
+
+
 _DF = {}
 
 
@@ -1715,7 +1880,10 @@ def makeDataLabels(
     tryInt=0,
 ):
     dpc = fmt.find('(percent') >= 0
-    if dpc:
+    if _isArray(data):
+        data, ndata = _arrayLabelValues(data, oneLevel, dpc, decimals, tryInt)
+        tryInt = 0
+    elif dpc:
         if oneLevel:
             ndata = _simpleData(data)
             from operator import add
@@ -1750,6 +1918,8 @@ def makeDataLabels(
             data = [list(map(int, x)) for x in data]
     R = []
     textData = textData or data
+    template, expressions = _compileLabelFormat(fmt)
+    G = globals()
     for row in range(rowCount):
         if seriesNames:
             series = seriesNames[row]
@@ -1765,10 +1935,82 @@ def makeDataLabels(
                     percent = ndata[row][col]
                 except:
                     percent = 0
-            r(magicformat(fmt))
+            L = locals()
+            r(template % {k: eval(c, G, L) for k, c in expressions})
     return R
 
 
+_LABEL_FORMATS = {}
+
+
+def _compileLabelFormat(fmt):
+    """
+    Parse a magicformat format once (magicformat 的格式只解析一次): returns a
+    plain %-template and the compiled expressions it needs, so formatting a
+    label is template % {name: eval(code)} instead of re-tokenizing the format.
+    """
+    try:
+        return _LABEL_FORMATS[fmt]
+    except KeyError:
+        pass
+    from reportlab.lib.extformat import _matchorfail
+
+    chunks = []
+    expressions = []
+    pos = 0
+    while 1:
+        pc = fmt.find("%", pos)
+        if pc < 0:
+            break
+        nextchar = fmt[pc + 1]
+        if nextchar == "(":
+            chunks.append(fmt[pos:pc])
+            pos, level = pc + 2, 1
+            while level:
+                match, pos = _matchorfail(fmt, pos)
+                tstart, tend = match.regs[3]
+                token = fmt[tstart:tend]
+                if token == "(":
+                    level = level + 1
+                elif token == ")":
+                    level = level - 1
+            vname = '__superformat_%d' % len(expressions)
+            expressions.append(
+                (vname, compile(fmt[pc + 2 : pos - 1], '<label>', 'eval'))
+            )
+            chunks.append('%%(%s)' % vname)
+        else:
+            nc = pc + 1 + (nextchar == "%")
+            chunks.append(fmt[pos:nc])
+            pos = nc
+    if pos < len(fmt):
+        chunks.append(fmt[pos:])
+    _LABEL_FORMATS[fmt] = result = ''.join(chunks), expressions
+    return result
+
+
+def _arrayLabelValues(data, oneLevel, dpc, decimals=0, tryInt=0):
+    """
+    Label values and percentages of an array as lists (数组的标签值和百分比, 以列表返回)
+    """
+    import numpy as np
+
+    data = _asMatrix(data)
+    ndata = None
+    if dpc:
+        if oneLevel:
+            ndata = data[:1] / (0.01 * data[0].sum())
+            from rlextra.utils.vecround import vecRound
+
+            f = float(10 ** decimals)
+            ndata = [vecRound(ndata[0].tolist(), f * 100, f)]
+        else:
+            ndata = _toList(_normalizeArray(data, decimals=decimals))
+    if tryInt and (np.floor(data) == data).all():
+        data = data.astype(int)
+    return _toList(data), ndata
+
+
 class MakeTickLabels(TickLabeller):
     def __init__(self, fmt, **ns):
         self._fmt = fmt
@@ -1815,6 +2057,10 @@ def setMarkers(aggr, markerType, markerSize, symbol='symbol'):
 
 def matrixToMultiSeries(data):
     "Turns tabular block into serieses with implicit x values 0,1,2..."
+    if _isArray(data):
+        data = _asMatrix(data)
+        x = range(data.shape[1])
+        return [list(zip(x, y)) for y in _toList(data)]
     colCount = len(data[0])
     newData = []
     for row in data:
@@ -1827,6 +2073,18 @@ def matrixToMultiSeries(data):
 
 def blockToMultiSeries(xData, yData, zData=None):
     "Turns tabular block yData into series with xData as first element"
+    if _isArray(yData):
+        yData = _asMatrix(yData)
+        if isinstance(xData, str) and xData == 'auto':
+            xData = range(1, yData.shape[1] + 1)
+        else:
+            xData = _toList(_asMatrix(xData)[0])
+        if zData is not None and len(zData):
+            return [
+                list(zip(xData, y, z))
+                for y, z in zip(_toList(yData), _toList(_asMatrix(zData)))
+            ]
+        return [list(zip(xData, y)) for y in _toList(yData)]
     if xData == 'auto':
         xData = list(range(1, len(yData[0]) + 1))
     newData = []
@@ -1839,6 +2097,106 @@ def blockToMultiSeries(xData, yData, zData=None):
     return newData
 
 
+def _takeColumns(block, keep):
+    "Keep only the given columns of every row (只保留每行中指定的列)"
+    if _isArray(block):
+        return block[:, keep]
+    return [[row[i] for i in keep] for row in block]
+
+
+def largestTriangleThreeBuckets(x, y, threshold):
+    """
+    Indices of at most threshold points picked by Largest-Triangle-Three-Buckets
+    (按 LTTB 算法选出至多 threshold 个点的下标).
+
+    The first and last points are kept; the other points are split into
+    threshold - 2 buckets and from each bucket the point forming the largest
+    triangle with the previously kept point and the average of the next
+    bucket is kept, which preserves the visual shape of the line.
+    @param x: x values, None for 0, 1, 2...
+    @param y: y values
+    @param threshold: number of points to keep
+    @return: sorted list of indices
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return list(range(n))
+    if x is None:
+        x = range(n)
+
+    every = (n - 2) / (threshold - 2)
+    keep = [0]
+    a = 0
+    end = 1
+    for i in range(threshold - 2):
+        start = end
+        end = int((i + 1) * every) + 1
+        # average point of the next bucket (下一个桶的平均点)
+        nextEnd = min(int((i + 2) * every) + 1, n)
+        count = nextEnd - end
+        avgX = sum(x[end:nextEnd]) / count
+        avgY = sum(y[end:nextEnd]) / count
+
+        ax = x[a]
+        ay = y[a]
+        dx = avgX - ax
+        dy = avgY - ay
+        maxArea = -1
+        for j in range(start, end):
+            # twice the triangle area (三角形面积的两倍)
+            area = abs(dx * (y[j] - ay) - dy * (x[j] - ax))
+            if area > maxArea:
+                maxArea = area
+                a = j
+        keep.append(a)
+    keep.append(n - 1)
+    return keep
+
+
+def downsampleIndices(xData, yData, maxPoints):
+    """
+    Columns to keep, at most maxPoints of them
+    (降采样时保留的列, 至多 maxPoints 列).
+
+    Each series gets an equal share of maxPoints: its minimum and maximum plus
+    a Largest-Triangle-Three-Buckets selection; all series keep the union of
+    these columns so they still share the x values, so the union is at most
+    maxPoints.  None values are skipped.  When the share is under 5 points
+    evenly spaced columns are kept instead.
+    @param xData: shared x values, None for 0, 1, 2...
+    @param yData: list of series
+    @param maxPoints: maximum number of points
+    @return: sorted list of column indices
+    """
+    share = maxPoints // len(yData)
+    if share < 5:
+        # too few points per series for LTTB (每个系列分到的点数太少)
+        n = max(map(len, yData))
+        if maxPoints >= n:
+            return list(range(n))
+        if maxPoints < 2:
+            return [0]
+        step = (n - 1) / (maxPoints - 1)
+        return sorted({int(round(i * step)) for i in range(maxPoints)})
+    keep = set()
+    for y in yData:
+        valid = [i for i, v in enumerate(y) if v is not None]
+        if not valid:
+            continue
+        if len(valid) == len(y):
+            vy = y
+            vx = xData
+        else:
+            vy = [y[i] for i in valid]
+            vx = [xData[i] for i in valid] if xData else valid
+        low = min(range(len(vy)), key=vy.__getitem__)
+        high = max(range(len(vy)), key=vy.__getitem__)
+        picked = largestTriangleThreeBuckets(vx, vy, share - 2)
+        keep.update(valid[i] for i in picked)
+        keep.update((valid[low], valid[high]))
+    return sorted(keep)
+
+
 def _setColors(obj, C, a='fillColor'):
     for i, c in enumerate(C):
         setattr(obj[i], a, c)
@@ -1876,6 +2234,7 @@ def getColumnChart(
     dataLabelsFontColor=black,
     dataLabelsAlignment=None,
     _3d=None,
+    checkLabelOverlap=0,
 ):
     # raise Exception("format=%s" % dataLabelsFormat)
     if _3d:
@@ -1886,6 +2245,8 @@ def getColumnChart(
         from reportlab.graphics.charts.barcharts import (
             VerticalBarChart as Klass,
         )
+    if checkLabelOverlap:
+        Klass = with_label_placement(Klass)
     chart = Klass()
     valueAxis = chart.valueAxis
     categoryAxis = chart.categoryAxis
@@ -1965,7 +2326,7 @@ def getColumnChart(
     valueAxis.rangeRound = 'both'
 
     if data is not None:
-        chart.data = data
+        chart.data = _toList(data)
         categoryAxis.categoryNames = categoryNames
     else:
         chart.data = [(100, 150, 180), (125, 180, 200)]
@@ -2018,6 +2379,7 @@ def getBarChart(
     dataLabelsFontColor=black,
     dataLabelsAlignment=None,
     _3d=None,
+    checkLabelOverlap=0,
 ):
     # raise Exception("format=%s" % dataLabelsFormat)
     if _3d:
@@ -2028,6 +2390,8 @@ def getBarChart(
         from reportlab.graphics.charts.barcharts import (
             HorizontalBarChart as Klass,
         )
+    if checkLabelOverlap:
+        Klass = with_label_placement(Klass)
     chart = Klass()
     _setColors(chart.bars, chartColors)
     chart.bars.strokeWidth = 0.5
@@ -2109,7 +2473,7 @@ def getBarChart(
 
     valueAxis.rangeRound = 'both'
     if data is not None:
-        chart.data = data
+        chart.data = _toList(data)
         categoryAxis.categoryNames = categoryNames
     else:
         chart.data = [(100, 150, 180), (125, 180, 200)]
@@ -2210,7 +2574,7 @@ def getLinePlot(
         yA.labelTextPostFormat = '%s%%'
         yA.avoidBoundFrac = None
 
-    chart.data = data
+    chart.data = _toList(data)
     if xAxisGridLines:
         xA.visibleGrid = 1
     else:
@@ -2321,7 +2685,7 @@ def getLineChart(
         valueAxis.avoidBoundFrac = None
     valueAxis.rangeRound = 'both'
 
-    chart.data = data
+    chart.data = _toList(data)
     if xAxisGridLines:
         categoryAxis.visibleGrid = 1
     else:
@@ -2378,12 +2742,18 @@ def getLinePlotArea(
 
         if seriesRelation == 'percent':
             data = normalizeData(data)
-        odata, data = data, []
-        for j in range(n):
-            d = [j]
-            for i in range(len(odata)):
-                d.append(odata[i][j])
-            data.append(tuple(d))
+        if _isArray(data):
+            import numpy as np
+
+            data = _asMatrix(data)
+            data = _toList(np.column_stack((np.arange(n), data.T)))
+        else:
+            odata, data = data, []
+            for j in range(n):
+                d = [j]
+                for i in range(len(odata)):
+                    d.append(odata[i][j])
+                data.append(tuple(d))
     else:
         AreaLinePlot = None
         data = matrixToMultiSeries(data)
@@ -2468,10 +2838,19 @@ def getScatterPlot(
     markerType=None,
     markerSize=0,
     reqDim=2,
+    checkLabelOverlap=0,
+    markerStamps=None,
 ):
     # raise Exception("format=%s" % dataLabelsFormat)
     from reportlab.graphics.charts.lineplots import ScatterPlot
 
+    data = blockToMultiSeries(xData, yData, zData)
+    if markerStamps is None:
+        markerStamps = sum(map(len, data)) >= MARKER_STAMP_POINTS
+    if checkLabelOverlap:
+        ScatterPlot = with_label_placement(ScatterPlot)
+    if markerStamps:
+        ScatterPlot = with_marker_stamps(ScatterPlot)
     chart = ScatterPlot()
     _setColors(chart.lines, chartColors, 'strokeColor')
     chart.fillColor = plotColor
@@ -2511,7 +2890,7 @@ def getScatterPlot(
     yA.avoidBoundFrac = (0.1, 0.1)
     yA.rangeRound = 'both'
 
-    chart.data = blockToMultiSeries(xData, yData, zData)
+    chart.data = data
     if xAxisGridLines:
         xA.visibleGrid = 1
     else:
@@ -2563,6 +2942,8 @@ def getScatterLinesPlot(
     dataLabelsFontColor=black,
     markerType=None,
     markerSize=0,
+    checkLabelOverlap=0,
+    markerStamps=None,
 ):
     chart = getScatterPlot(
         width=width,
@@ -2598,6 +2979,8 @@ def getScatterLinesPlot(
         dataLabelsFontColor=dataLabelsFontColor,
         markerType=markerType,
         markerSize=markerSize,
+        checkLabelOverlap=checkLabelOverlap,
+        markerStamps=markerStamps,
     )
     chart.lines.strokeWidth = 1
     for i in range(0, 10):
@@ -2640,6 +3023,8 @@ def getBubblePlot(
     dataLabelsFontColor=black,
     markerType=None,
     markerSize=8,
+    checkLabelOverlap=0,
+    markerStamps=None,
 ):
     if markerType == None:
         markerType = "Sequence"  # make sure there are markers
@@ -2678,6 +3063,8 @@ def getBubblePlot(
         dataLabelsFontColor=dataLabelsFontColor,
         markerType=markerType,
         markerSize=markerSize,
+        checkLabelOverlap=checkLabelOverlap,
+        markerStamps=markerStamps,
     )
     chart._bubblePlot = 1
     return chart
@@ -2702,9 +3089,11 @@ def getPieChart(
         from reportlab.graphics.charts.piecharts import Pie3d as Pie
     else:
         from reportlab.graphics.charts.piecharts import Pie
+        if checkLabelOverlap:
+            Pie = with_label_placement(Pie)
     chart = Pie()
     _setColors(chart.slices, chartColors)
-    chart.data = _simpleData(data)
+    chart.data = _toList(_simpleData(data))
     chart.labels = dataLabelsFormat
     chart.slices.fontName = dataLabelsFontName
     chart.slices.fontSize = dataLabelsFontSize
@@ -2738,7 +3127,7 @@ def getDoughnutChart(
     from reportlab.graphics.charts.doughnut import Doughnut
 
     chart = Doughnut()
-    chart.data = data
+    chart.data = _toList(data)
     _setColors(chart.slices, chartColors)
     chart.labels = categoryNames
     if categoryNames is None:
@@ -2790,7 +3179,7 @@ def getRadarChart(
     else:
         chart.strandLabels.format = dataLabelsFormat
     chart.fillColor = plotColor
-    chart.data = data
+    chart.data = _toList(data)
     if categoryNames is None:
         categoryNames = []
         for i in range(len(data[0])):
@@ -2903,14 +3292,13 @@ def getLegend():
 
 from reportlab.lib.validators import (
     isNumber,
+    isInt,
     isNumberOrNone,
     isListOfStringsOrNone,
     isListOfNumbers,
-    isListOfNumbersOrNone,
     isColorOrNone,
     OneOf,
     isBoolean,
-    SequenceOf,
     isString,
     EitherOr,
     isColorOrNone,
@@ -2918,6 +3306,8 @@ from reportlab.lib.validators import (
     isListOfColors,
     isStringOrNone,
     isListOfShapes,
+    Validator,
+    DerivedValue,
 )
 
 from reportlab.lib.attrmap import *
@@ -2926,19 +3316,62 @@ from reportlab.lib.attrmap import *
 _isLabelAngle = NoneOr(EitherOr((isNumber, isString)))
 
 
+class _isNumberArray(Validator):
+    "NumPy array of numbers (数值类型的 NumPy 数组)"
+
+    def test(self, x):
+        return _isArray(x) and x.dtype.kind in 'biuf' and x.size > 0
+
+
+isNumberArray = _isNumberArray()
+
+# exact types accepted without calling isNumber (无需调用 isNumber 即可接受的类型)
+_NUMBER_TYPES = frozenset((int, float, bool))
+
+
+class _isChartData(Validator):
+    """
+    Data for the quickchart (图形数据): a block of text, a DataSource, a NumPy
+    array of numbers, or a non-empty sequence of rows, each a list of numbers,
+    an array.array of numbers or None.
+
+    Arrays are checked by dtype / type code and rows of plain ints and floats
+    by their set of types, so only unusual rows are tested element by element
+    (数组按类型检查, 只有包含其他类型的数据行才逐个元素检查).
+    """
+
+    def test(self, x):
+        if x is None or isString(x) or isinstance(x, DataSource):
+            return True
+        if _isArray(x):
+            return isNumberArray(x)
+        if not isinstance(x, (list, tuple)) or not x:
+            return False
+        for row in x:
+            if row is None or _isNumberBuffer(row):
+                continue
+            if not isinstance(row, (list, tuple)):
+                return False
+            if not _NUMBER_TYPES.issuperset(map(type, row)):
+                if not isListOfNumbers(row):
+                    return False
+        return True
+
+
+isChartData = _isChartData()
+
+
+# large attributes left out of QuickChart's cache key, covered by its version
+# (QuickChart 缓存键中不计算内容的大属性, 由赋值版本号覆盖)
+_UNHASHED_ATTRS = frozenset(('data', 'textData'))
+
+
 class QuickChart(Widget):
     _attrMap = AttrMap(
         chartType=AttrMapValue(OneOf(*tuple(CHART_TYPES)), "chart type"),
         width=AttrMapValue(isNumber, "Width of the quickchart"),
         height=AttrMapValue(isNumber, "Height of the quickchart"),
-        data=AttrMapValue(
-            NoneOr(
-                EitherOr(
-                    (SequenceOf(isListOfNumbersOrNone, emptyOK=0), isString)
-                )
-            ),
-            "Data for the quickchart",
-        ),
+        data=AttrMapValue(isChartData, "Data for the quickchart"),
         textData=AttrMapValue(
             isStringOrNone, "Textual data for use in place of data in " "labels"
         ),
@@ -2983,6 +3416,14 @@ class QuickChart(Widget):
         ),
         markerType=AttrMapValue(None, ""),
         markerSize=AttrMapValue(None, ""),
+        maxPoints=AttrMapValue(
+            NoneOr(isInt),
+            "Downsample line and scatter series longer than this",
+        ),
+        markerStamps=AttrMapValue(
+            NoneOr(isBoolean),
+            "Stamp scatter and bubble markers from one form, None for auto",
+        ),
         legendPos=AttrMapValue(None, ""),
         legendText=AttrMapValue(None, ""),
         legendFontName=AttrMapValue(None, ""),
@@ -3011,7 +3452,8 @@ class QuickChart(Widget):
             isNumberOrNone, desc='pad specified as a fraction of width'
         ),
         checkLabelOverlap=AttrMapValue(
-            isBoolean, desc='true check pie label overlap'
+            isBoolean,
+            desc='true resolve overlapping pie, bar and scatter data labels',
         ),
         orderMode=AttrMapValue(
             isString,
@@ -3069,6 +3511,8 @@ class QuickChart(Widget):
         self.dataLabelsAlignment = None
         self.markerType = None
         self.markerSize = 6
+        self.maxPoints = None
+        self.markerStamps = None
         self.legendPos = 'right'
         self.legendText = None
         self.legendFontName = 'Helvetica'
@@ -3098,7 +3542,103 @@ class QuickChart(Widget):
         self.x = 0
         self.y = 0
 
+    @classmethod
+    def validateSpec(cls, spec):
+        """
+        Validate a dictionary of attributes in one pass, raising a single
+        AttributeError which lists every bad attribute
+        (一次检查全部属性, 所有不合法的属性在同一个 AttributeError 中列出)
+
+        @param spec: {属性名: 值}
+        """
+        if not rl_config.shapeChecking:
+            return
+        attrMap = cls._attrMap
+        errors = []
+        for name, value in spec.items():
+            if name[0] == '_' or isinstance(value, DerivedValue):
+                continue
+            if name not in attrMap:
+                errors.append('illegal attribute %r' % name)
+            elif not attrMap[name].validate(value):
+                errors.append('illegal assignment of %r to %r' % (value, name))
+        if errors:
+            raise AttributeError('QuickChart %s' % '; '.join(errors))
+
+    def configure(self, spec=None, validate=True, **kw):
+        """
+        Set many attributes at once (批量设置属性).
+
+        Unlike setting them one by one, the whole spec is validated in a
+        single pass before anything is assigned; trusted callers whose values
+        are known to be valid can pass validate=False to skip it.
+
+        @param spec: {属性名: 值}
+        @param validate: 是否检查属性, 内部调用方的值已知合法时可以为 False
+        @param kw: 其他属性, 覆盖 spec 中的同名属性
+        @return: self
+        """
+        spec = dict(spec or {}, **kw)
+        if validate:
+            self.validateSpec(spec)
+        self.__dict__.update(spec)
+        self._bumpVersion()
+        return self
+
+    def __setattr__(self, name, value):
+        Widget.__setattr__(self, name, value)
+        if name[0] != '_':
+            self._bumpVersion()
+
+    def _bumpVersion(self):
+        "Public assignments invalidate the drawn group (赋值后缓存的图形组失效)"
+        self.__dict__['_version'] = self.__dict__.get('_version', 0) + 1
+
+    def _fingerprint(self):
+        """
+        Cache key of the chart state (图形状态的缓存键): the assignment
+        version, the stamp of a DataSource and a fingerprint of the small
+        attributes; data and textData are not hashed, so after changing an
+        array in place assign it again or call configure
+        (data 和 textData 不计算内容, 原地修改数组后需要重新赋值或调用 configure)
+        """
+        from report.components.fingerprint import fingerprint
+
+        data = self.__dict__.get('data')
+        return (
+            self.__dict__.get('_version', 0),
+            data.stamp() if isinstance(data, DataSource) else None,
+            fingerprint(
+                type(self),
+                {
+                    k: v
+                    for k, v in self.__dict__.items()
+                    if k[0] != '_' and k not in _UNHASHED_ATTRS
+                },
+            ),
+        )
+
     def draw(self):
+        """
+        Build the chart group; while no attribute changes, later draws reuse
+        the group built by the first one (属性不变时复用第一次构建的图形组)
+        """
+        key = self._fingerprint()
+        cache = self.__dict__.get('_drawCache')
+        if cache is not None and cache[0] == key:
+            return cache[1]
+        g = self._draw()
+        self.__dict__['_drawCache'] = key, g
+        return g
+
+    def getBounds(self):
+        """
+        The chart is laid out to fit its own box, so the box is its bounds
+        (图形按自身的矩形区域排版, 边界即该区域), without drawing it
+        """
+        return (self.x, self.y, self.x + self.width, self.y + self.height)
+
+    def _draw(self):
         g = quickChart(
             chartType=self.chartType,
             width=self.width,
@@ -3144,6 +3684,8 @@ class QuickChart(Widget):
             dataLabelsAlignment=self.dataLabelsAlignment,
             markerType=self.markerType,
             markerSize=self.markerSize,
+            maxPoints=self.maxPoints,
+            markerStamps=self.markerStamps,
             legendPos=self.legendPos,
             legendText=self.legendText,
             legendFontName=self.legendFontName,
@@ -3188,6 +3730,181 @@ class QuickChartDrawing(Drawing):
         self._add(self, qc, name='qc', validate=None, desc=None)
 
 
+# one chart of a batch: the arguments of quickChart (批量渲染的一个图形: quickChart 的参数)
+ChartSpec = namedtuple(
+    'ChartSpec',
+    [
+        'chartType',  # 图形类型, 见 CHART_TYPES
+        'width',  # 宽度
+        'height',  # 高度
+        'data',  # 数据
+        'options',  # quickChart 的其他关键字参数, 可以为 None
+        'name',  # 名称, 用作输出文件名, 默认为 chart_<序号>
+    ],
+)
+ChartSpec.__new__.__defaults__ = (None, None)
+
+# the result of one chart (一个图形的渲染结果)
+ChartResult = namedtuple(
+    'ChartResult',
+    [
+        'index',  # 图形在批次中的序号
+        'name',  # 图形名称
+        'outputs',  # {格式: 内容(bytes) 或输出文件路径}, 失败时为 None
+        'error',  # 失败时的异常信息(traceback), 成功时为 None
+    ],
+)
+
+
+def _chartSpec(spec):
+    """
+    normalise a spec given as ChartSpec, tuple or dict
+    (图形参数可以是 ChartSpec、元组或字典)
+    """
+    if isinstance(spec, dict):
+        return ChartSpec(**spec)
+    return ChartSpec(*spec)
+
+
+def _initChartWorker(fontNames, formats):
+    """
+    warm up a worker process: register the fonts and load the renderers once,
+    instead of on the first chart of every process
+    (预热工作进程: 注册字体并加载渲染模块)
+    """
+    from reportlab.pdfbase import pdfmetrics
+    from report.core import VALIDATED_FONT_NAMES, register_font
+
+    for fontName in fontNames:
+        try:
+            if fontName in VALIDATED_FONT_NAMES:
+                # 字体目录中的字体
+                register_font(fontName)
+            else:
+                pdfmetrics.getFont(fontName)
+        except Exception:
+            # 无法注册的字体留给使用它的图形报错
+            pass
+    for format in formats:
+        Drawing(1, 1).asString(format)
+
+
+def _renderChart(index, spec, formats, outDir=None):
+    """
+    render one chart, returning any error in the result
+    (渲染一个图形, 异常记录在结果中)
+    """
+    import traceback
+
+    name = None
+    try:
+        spec = _chartSpec(spec)
+        name = spec.name or 'chart_%d' % index
+        d = quickChart(
+            spec.chartType,
+            spec.width,
+            spec.height,
+            spec.data,
+            **(spec.options or {})
+        )
+        outputs = {}
+        for format in formats:
+            content = asBytes(d.asString(format))
+            if outDir:
+                path = os.path.join(outDir, '%s.%s' % (name, format))
+                with open(path, 'wb') as f:
+                    f.write(content)
+                content = path
+            outputs[format] = content
+    except Exception:
+        return ChartResult(index, name, None, traceback.format_exc())
+    return ChartResult(index, name, outputs, None)
+
+
+def renderCharts(
+    specs,
+    formats=('pdf',),
+    outDir=None,
+    workers=None,
+    fontNames=(),
+    backlog=None,
+):
+    """
+    Render a batch of quick charts in a process pool.
+
+    Yields a ChartResult for every spec as soon as it is finished, so the
+    results arrive out of order; use ChartResult.index to match them up.
+    A chart which fails yields a result with the traceback in ``error``
+    and the batch goes on.  Specs are read lazily, at most ``backlog``
+    charts are in flight at any time.
+
+    批量渲染快速图形, 在进程池中并行执行, 每个图形完成后立即返回其结果(不保证顺序).
+    单个图形失败不会中断批次.
+
+    @param specs: 图形参数(ChartSpec、元组或字典)的可迭代对象, 按需读取
+    @param formats: 输出格式, 如 pdf、png、svg, 见 Drawing.asString
+    @param outDir: 输出目录, 指定时写入 <名称>.<格式> 文件, 结果中为文件路径;
+        否则结果中为文件内容
+    @param workers: 工作进程数量, 默认为 cpu 核数
+    @param fontNames: 工作进程启动时预先注册的字体, 如图形中用到的中文字体
+    @param backlog: 同时提交的图形数量上限, 默认为工作进程数量的 4 倍
+    @return: ChartResult 生成器
+    """
+    import traceback
+    from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+    from concurrent.futures.process import BrokenProcessPool
+
+    if isStr(formats):
+        formats = (formats,)
+    formats = tuple(formats)
+    unknown = [format for format in formats if format not in Drawing._saveModes]
+    if unknown:
+        raise ValueError('unknown chart formats: %s' % ', '.join(unknown))
+    if outDir:
+        os.makedirs(outDir, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+    backlog = max(backlog or 4 * workers, 1)
+
+    def newPool():
+        return ProcessPoolExecutor(
+            workers,
+            initializer=_initChartWorker,
+            initargs=(tuple(fontNames), formats),
+        )
+
+    specs = enumerate(specs)
+    pending = {}
+    pool = newPool()
+    try:
+        while True:
+            for index, spec in islice(specs, backlog - len(pending)):
+                args = (_renderChart, index, spec, formats, outDir)
+                try:
+                    future = pool.submit(*args)
+                except BrokenProcessPool:
+                    # 工作进程异常退出(如渲染时崩溃), 换一个进程池继续
+                    pool.shutdown()
+                    pool = newPool()
+                    future = pool.submit(*args)
+                pending[future] = index
+            if not pending:
+                break
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    result = future.result()
+                except Exception:
+                    # 图形参数无法 pickle, 或工作进程异常退出
+                    error = traceback.format_exc()
+                    result = ChartResult(index, None, None, error)
+                yield result
+    finally:
+        for future in pending:
+            future.cancel()
+        pool.shutdown()
+
+
 def testCommandLine(args):
     usage = """quickchart.py - high level interface for easy charts.
     usage 1: runs all tests
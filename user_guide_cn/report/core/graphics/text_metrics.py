@@ -0,0 +1,120 @@
+"""
+图形文字宽度测量
+
+图表排版(标题、坐标轴标签、数据标签、图例)和 layout.getBounds 反复测量相同的文字,
+这里在 reportlab 的 stringWidth 之前加一层 LRU 缓存, 以 (文字, 字体, 字号, 编码) 为键.
+
+reportlab 的 TrueType 字体(包括思源黑体等中文字体)按字符查字宽表的部分已经由 C 扩展
+(rl_accel)实现, 标准 Type1 字体还要先按字体拆分文字, 单次测量耗时是缓存命中的 10~80 倍.
+
+reportlab 图表内部(条形图的数据标签、图例列宽、标签尺寸、String 的边界)按名称导入
+pdfmetrics.stringWidth 直接测量, install 把这些模块中的 stringWidth 换为 string_width,
+quickChart 的全部文字测量因此都经过缓存. lineplots 的 _maxWidth 把 stringWidth 绑定为
+默认参数, 不能替换, 它只为 y 轴的最大值标签留出边距, 每个图形调用一两次.
+
+替换对整个进程的 reportlab 有效, 导入本模块或 quick_charts 时不会替换, 由应用自行选择:
+在入口处调用 install, 或只在一段代码中使用::
+
+    with installed():
+        drawing = quickChart('barchart', 400, 270, data)
+        drawing.save(formats=['pdf'], outDir='out')
+
+同名字体重新注册为另一个字体文件后, 需要调用 clear_cache 清空缓存.
+"""
+import sys
+import importlib
+from functools import lru_cache
+from contextlib import contextmanager
+
+from reportlab.pdfbase import pdfmetrics
+
+# 缓存的测量结果数, 每条约 200 字节
+CACHE_SIZE = 16384
+
+# 按名称导入 pdfmetrics.stringWidth 测量图表文字的 reportlab 模块
+REPORTLAB_MODULES = (
+    'reportlab.graphics.shapes',
+    'reportlab.graphics.charts.textlabels',
+    'reportlab.graphics.charts.barcharts',
+    'reportlab.graphics.charts.legends',
+    'reportlab.graphics.charts.utils',
+)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def string_width(text, font_name, font_size, encoding='utf8'):
+    """
+    文字宽度, 与 reportlab.pdfbase.pdfmetrics.stringWidth 相同, 结果按参数缓存
+
+    @param text: 文字
+    @param font_name: 字体名称
+    @param font_size: 字号
+    @param encoding: 文字为 bytes 时的编码
+    @return: 宽度(磅)
+    """
+    return pdfmetrics.getFont(font_name).stringWidth(
+        text, font_size, encoding=encoding
+    )
+
+
+def string_widths(texts, font_name, font_size, encoding='utf8'):
+    """
+    批量测量同一字体、字号的多个文字, 如坐标轴的全部刻度标签
+
+    @param texts: 文字序列
+    @param font_name: 字体名称
+    @param font_size: 字号
+    @param encoding: 文字为 bytes 时的编码
+    @return: 与 texts 一一对应的宽度列表
+    """
+    return [
+        string_width(text, font_name, font_size, encoding) for text in texts
+    ]
+
+
+def clear_cache():
+    """ 清空测量结果缓存 """
+    string_width.cache_clear()
+
+
+def cache_info():
+    """ 缓存的命中次数、未命中次数和大小, 同 functools.lru_cache """
+    return string_width.cache_info()
+
+
+def install():
+    """
+    REPORTLAB_MODULES 中的 stringWidth 换为 string_width, 参数和结果相同;
+    已替换或被其他代码替换的不再修改
+
+    @return: 本次替换的模块名称列表
+    """
+    names = []
+    for name in REPORTLAB_MODULES:
+        module = importlib.import_module(name)
+        if getattr(module, 'stringWidth', None) is pdfmetrics.stringWidth:
+            module.stringWidth = string_width
+            names.append(name)
+    return names
+
+
+def uninstall(names=REPORTLAB_MODULES):
+    """
+    恢复 install 替换的 stringWidth, 未导入或被其他代码替换的模块不修改
+
+    @param names: 模块名称, 默认全部 REPORTLAB_MODULES
+    """
+    for name in names:
+        module = sys.modules.get(name)
+        if getattr(module, 'stringWidth', None) is string_width:
+            module.stringWidth = pdfmetrics.stringWidth
+
+
+@contextmanager
+def installed():
+    """ 在 with 语句内替换 stringWidth, 退出时只恢复本次替换的模块 """
+    names = install()
+    try:
+        yield
+    finally:
+        uninstall(names)
@@ -0,0 +1,221 @@
+"""
+紧凑的时间序列
+
+reportlab 的 NormalDateXValueAxis 要求 x 值为 yyyymmdd 格式的日期(整数或字符串),
+配置坐标轴时把每个点都转换为 NormalDate 对象, 按日期对象计算刻度和位置;
+多年的日数据中这部分解析和比较占了大部分耗时.
+
+这里的日期用 epoch 日(1970-01-01 起的天数)整数表示:
+
+- EpochDayXValueAxis 直接按整数计算位置, 不转换数据点;
+  按月取刻度时用二分查找在有序日期中定位每月的最后一个点;
+  只有选中的刻度才转换为日期并格式化标签, 每个刻度只格式化一次;
+- EpochDayTimeSeriesPlot 是使用该坐标轴的 SimpleTimeSeriesPlot,
+  setTimeSeries 接收 epoch 日数组和各系列的数值数组.
+"""
+from bisect import bisect_left
+from datetime import date
+from operator import itemgetter
+
+from reportlab.lib import normalDate
+from reportlab.graphics.charts.axes import NormalDateXValueAxis, YValueAxis
+from reportlab.graphics.charts.lineplots import SimpleTimeSeriesPlot
+
+# 1970-01-01 的公历序数
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+def epoch_day(value):
+    """
+    转换为 epoch 日
+
+    @param value: yyyymmdd 格式的整数或字符串, datetime.date 或 NormalDate
+    @return: 1970-01-01 起的天数
+    """
+    if isinstance(value, normalDate.NormalDate):
+        value = value.normalDate
+    if not isinstance(value, date):
+        value = int(value)
+        value = date(value // 10000, value // 100 % 100, value % 100)
+    return value.toordinal() - EPOCH_ORDINAL
+
+
+def epoch_days(values):
+    """
+    批量转换为 epoch 日
+
+    @param values: 日期序列, 格式见 epoch_day
+    @return: epoch 日列表
+    """
+    return [epoch_day(value) for value in values]
+
+
+def epoch_date(day):
+    """
+    epoch 日转换为日期
+
+    @param day: 1970-01-01 起的天数
+    @return: datetime.date
+    """
+    return date.fromordinal(int(day) + EPOCH_ORDINAL)
+
+
+def time_series(days, values):
+    """
+    epoch 日数组和数值数组组合为图形的 (x, y) 数据点
+
+    @param days: epoch 日数组, 列表、range 或 NumPy 数组
+    @param values: 数值数组
+    @return: (epoch 日, 数值) 列表
+    """
+    if hasattr(days, 'tolist'):
+        days = days.tolist()
+    if hasattr(values, 'tolist'):
+        values = values.tolist()
+    return list(zip(days, values))
+
+
+def _normal_date(day):
+    """ epoch 日转换为 NormalDate """
+    d = epoch_date(day)
+    return normalDate.ND((d.year, d.month, d.day))
+
+
+def _month_ends(days):
+    """
+    有序日期中每个月的最后一个日期, 按月二分查找, 不逐个比较
+
+    @param days: 升序的 epoch 日列表
+    @return: epoch 日列表
+    """
+    ends = []
+    first = epoch_date(days[0])
+    year, month = first.year, first.month
+    start = 0
+    while start < len(days):
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        stop = bisect_left(days, epoch_day(date(year, month, 1)), start)
+        if stop > start:
+            ends.append(days[stop - 1])
+        start = stop
+    return ends
+
+
+class _NormalDates:
+    """
+    epoch 日列表的 NormalDate 视图, 只在访问时转换, 同一位置只转换一次.
+    刻度算法只访问选中的刻度和首尾几个位置
+    """
+
+    def __init__(self, days):
+        self._days = days
+        self._dates = {}
+
+    def __len__(self):
+        return len(self._days)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self._days)
+        d = self._dates.get(index)
+        if d is None:
+            d = self._dates[index] = _normal_date(self._days[index])
+        return d
+
+
+class _EpochTick(int):
+    """ 刻度值, 可以像 NormalDate 刻度一样带 _doSubTicks 标记 """
+
+
+class EpochDayXValueAxis(NormalDateXValueAxis):
+    """
+    x 值为 epoch 日整数的日期坐标轴, 属性和刻度规则与 NormalDateXValueAxis 相同,
+    valueMin、valueMax 也是 epoch 日
+    """
+
+    def _scalar2ND(self, x):
+        return _normal_date(x)
+
+    def _convertXV(self, data):
+        # 数据点保持为整数, 不转换
+        pass
+
+    def tickYear(self, value):
+        """
+        刻度值的年份
+
+        @param value: 刻度值(epoch 日)
+        @return: 年份
+        """
+        return epoch_date(value).year
+
+    def _xAxisTicker(self, xVals):
+        # 刻度算法按 yyyymmdd 解释 valueMin、valueMax
+        valueMin, valueMax = self.valueMin, self.valueMax
+        try:
+            for name, value in (('valueMin', valueMin), ('valueMax', valueMax)):
+                if value is not None:
+                    d = epoch_date(value)
+                    value = d.year * 10000 + d.month * 100 + d.day
+                self.__dict__[name] = value
+            ticks, labels = NormalDateXValueAxis._xAxisTicker(
+                self, _NormalDates(xVals)
+            )
+        finally:
+            self.__dict__['valueMin'] = valueMin
+            self.__dict__['valueMax'] = valueMax
+
+        steps = []
+        for tick in ticks:
+            step = _EpochTick(epoch_day(tick))
+            if not getattr(tick, '_doSubTicks', 1):
+                step._doSubTicks = 0
+            steps.append(step)
+        return steps, labels
+
+    def _getStepsAndLabels(self, xVals):
+        if self.dailyFreq:
+            xVals = _month_ends(xVals)
+        return self._xAxisTicker(xVals)
+
+    def configure(self, data):
+        xVals = set()
+        for series in data:
+            xVals.update(map(itemgetter(0), series))
+        xVals = sorted(xVals)
+        steps, labels = self._getStepsAndLabels(xVals)
+        valueMin, valueMax = self.valueMin, self.valueMax
+        valueMin = xVals[0] if valueMin is None else valueMin
+        valueMax = xVals[-1] if valueMax is None else valueMax
+        self._valueMin, self._valueMax = valueMin, valueMax
+        self._tickValues = steps
+        self._labelTextFormat = labels
+
+        self._scaleFactor = self._length / float(valueMax - valueMin)
+        self._configured = 1
+
+
+class EpochDayTimeSeriesPlot(SimpleTimeSeriesPlot):
+    """
+    x 坐标轴为 EpochDayXValueAxis 的 SimpleTimeSeriesPlot, 数据的 x 值为 epoch 日
+    """
+
+    def __init__(self):
+        SimpleTimeSeriesPlot.__init__(self)
+        self.xValueAxis = EpochDayXValueAxis()
+        self.yValueAxis = YValueAxis()
+        # 示例数据的日期为 yyyymmdd 格式
+        self.data = [
+            [(epoch_day(x), y) for x, y in series] for series in self.data
+        ]
+
+    def setTimeSeries(self, days, *values):
+        """
+        设置数据, 所有系列共用同一组日期
+
+        @param days: epoch 日数组
+        @param values: 各系列的数值数组
+        """
+        if hasattr(days, 'tolist'):
+            days = days.tolist()
+        self.data = [time_series(days, series) for series in values]
@@ -0,0 +1,151 @@
+"""
+图片加载
+
+``PDF.add_image`` 和封面图片都通过这里加载图片:
+
+- 图片的像素尺寸只读取文件头获得, 同一个文件在进程中只读取一次;
+- 绘制时按文件名引用图片, reportlab 按文件名复用图片对象,
+  同一个文件在文档中只解码、嵌入一次;
+- 指定 dpi 时, 按显示尺寸计算需要的像素数, 源图片更大时缩小到该像素数.
+  缩小后的图片缓存在磁盘上, 以源文件路径、修改时间、大小和目标像素数为键,
+  之后的构建直接使用缓存.
+
+缓存目录默认为 ``~/.cache/report/images``, 可通过环境变量 ``REPORT_IMAGE_CACHE`` 指定.
+"""
+import os
+import math
+import hashlib
+import logging
+from collections import namedtuple
+
+from reportlab.platypus import Image
+
+logger = logging.getLogger(__name__)
+
+IMAGE_CACHE_DIR = os.environ.get(
+    'REPORT_IMAGE_CACHE',
+    os.path.join(os.path.expanduser('~'), '.cache', 'report', 'images'),
+)
+
+# 加载结果: 绘制用的图片文件, 显示宽高(point), 源图片像素宽高
+ImageInfo = namedtuple(
+    'ImageInfo', 'filename width height pixel_width pixel_height'
+)
+
+# {(文件路径, 修改时间, 大小, 显示宽, 显示高, dpi, 缓存目录): ImageInfo}
+_loaded = {}
+
+
+def _file_key(filename):
+    stat = os.stat(filename)
+    return os.path.abspath(filename), stat.st_mtime_ns, stat.st_size
+
+
+def _resampled_path(key, pixel_width, pixel_height, ext, cache_dir):
+    digest = hashlib.md5(
+        repr((key, pixel_width, pixel_height)).encode('utf8')
+    ).hexdigest()
+    return os.path.join(cache_dir, f'{digest}{ext}')
+
+
+def _resample(filename, path, pixel_width, pixel_height):
+    """ 将图片缩小到指定像素数, 保存为 path """
+    from PIL import Image as PILImage
+
+    with PILImage.open(filename) as img:
+        jpeg = img.format == 'JPEG'
+        if img.mode not in ('L', 'RGB', 'RGBA', 'CMYK'):
+            transparent = (
+                img.mode in ('LA', 'PA') or 'transparency' in img.info
+            )
+            img = img.convert('RGBA' if transparent else 'RGB')
+        img = img.resize((pixel_width, pixel_height), PILImage.LANCZOS)
+
+        # 先写临时文件再改名, 避免并行的进程读到不完整的图片
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.{os.getpid()}.tmp'
+        if jpeg:
+            img.save(tmp_path, 'JPEG', quality=90)
+        else:
+            img.save(tmp_path, 'PNG', optimize=True)
+    os.replace(tmp_path, path)
+
+
+def load_image(filename, width=None, height=None, dpi=None, cache_dir=None):
+    """
+    加载图片
+
+    @param filename: 图片文件路径
+    @param width: 显示宽度, 默认为图片的像素宽度
+    @param height: 显示高度, 默认为图片的像素高度
+    @param dpi: 按显示尺寸缩小图片的目标分辨率, 为 None 时不缩小
+    @param cache_dir: 缩小后图片的缓存目录, 默认为 IMAGE_CACHE_DIR
+    @return: ImageInfo
+    """
+    file_key = _file_key(filename)
+    key = file_key + (width, height, dpi, cache_dir)
+    if key in _loaded:
+        return _loaded[key]
+
+    from PIL import Image as PILImage
+
+    # 只读取文件头, 不解码图片数据
+    with PILImage.open(filename) as img:
+        pixel_width, pixel_height = img.size
+        ext = '.jpg' if img.format == 'JPEG' else '.png'
+    width = width or pixel_width
+    height = height or pixel_height
+
+    path = filename
+    if dpi:
+        target_width = math.ceil(width / 72 * dpi)
+        target_height = math.ceil(height / 72 * dpi)
+        if target_width < pixel_width and target_height < pixel_height:
+            path = _resampled_path(
+                file_key,
+                target_width,
+                target_height,
+                ext,
+                cache_dir or IMAGE_CACHE_DIR,
+            )
+            if not os.path.exists(path):
+                try:
+                    _resample(filename, path, target_width, target_height)
+                except OSError as e:
+                    logger.warning(f'无法缩小图片 {filename}: {e}')
+                    path = filename
+
+    info = ImageInfo(path, width, height, pixel_width, pixel_height)
+    _loaded[key] = info
+    return info
+
+
+class CachedImage(Image):
+    """
+    通过 load_image 加载的图片
+
+    尺寸由 load_image 得到, 不再解码图片; 绘制时按文件名引用图片,
+    同一个文件在文档中只嵌入一次.
+    """
+
+    def __init__(
+        self,
+        filename,
+        width=None,
+        height=None,
+        dpi=None,
+        mask='auto',
+        hAlign='CENTER',
+        cache_dir=None,
+    ):
+        info = load_image(filename, width, height, dpi=dpi, cache_dir=cache_dir)
+        super().__init__(
+            info.filename, info.width, info.height, mask=mask, hAlign=hAlign
+        )
+        self.source = filename
+        self.dpi = dpi
+        self._img = None
+        self.imageWidth = info.pixel_width
+        self.imageHeight = info.pixel_height
+        self.drawWidth = info.width
+        self.drawHeight = info.height
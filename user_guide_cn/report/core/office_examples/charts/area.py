@@ -8,15 +8,19 @@ from reportlab.graphics.charts.axes import (
     XValueAxis,
     YValueAxis,
     AdjYValueAxis,
-    NormalDateXValueAxis,
 )
-from reportlab.lib.normalDate import NormalDate
 from reportlab.graphics.charts.lineplots import AreaLinePlot, LinePlot
 from reportlab.graphics.shapes import Drawing, _DrawingEditorMixin, Line
 from reportlab.lib.colors import PCMYKColor, black, white
 from reportlab.lib.formatters import DecimalFormatter
 from reportlab.graphics.charts.textlabels import Label
 
+from report.core.graphics.time_series import (
+    EpochDayXValueAxis,
+    epoch_days,
+    time_series,
+)
+
 
 class AreaWithLinesChart(_DrawingEditorMixin, Drawing):
     """
@@ -113,7 +117,7 @@ class AreaWithLinesChart(_DrawingEditorMixin, Drawing):
         self.bgrect1.height = self.chart.y
         # x axis
         self.chart.xValueAxis = (
-            NormalDateXValueAxis()
+            EpochDayXValueAxis()
         )  # we change the axis type here
         self.chart.xValueAxis.bottomAxisLabelSlack = 0
         self.chart.xValueAxis.dailyFreq = 0
@@ -180,136 +184,184 @@ class AreaWithLinesChart(_DrawingEditorMixin, Drawing):
         self.legend.yGap = 0
         self.legend.y = self.chart.y
         # sample data
-        self.chart.data = [
+        dates = epoch_days(
             [
-                (19960901, 100000.0),
-                (19961201, 109034.00000000001),
-                (19970301, 110105.00000000001),
-                (19970601, 127487.0),
-                (19970901, 134702.0),
-                (19971201, 136920.0),
-                (19980301, 153788.0),
-                (19980601, 158997.0),
-                (19980901, 141245.0),
-                (19981201, 171859.0),
-                (19990301, 179215.0),
-                (19990601, 193963.0),
-                (19990901, 181679.0),
-                (19991201, 202828.0),
-                (20000301, 216832.0),
-                (20000601, 218377.0),
-                (20000901, 222553.0),
-                (20001201, 220915.00000000003),
-                (20010301, 204568.0),
-                (20010601, 212621.0),
-                (20010901, 185524.0),
-                (20011201, 202977.0),
-                (20020301, 204425.0),
-                (20020601, 176716.0),
-                (20020901, 143573.0),
-                (20021201, 158079.0),
-                (20030301, 153953.0),
-                (20030601, 181898.0),
-                (20030901, 186917.0),
-                (20031201, 210109.0),
-                (20040301, 214340.99999999997),
-                (20040601, 217241.00000000003),
-                (20040901, 207773.0),
-                (20041201, 226420.99999999997),
-                (20050301, 219802.0),
-                (20050601, 224784.0),
-                (20050901, 234346.0),
-                (20051201, 238378.99999999997),
-                (20060301, 244329.99999999997),
-                (20060601, 237279.00000000003),
-                (20060901, 250893.0),
-            ],
-            [
-                (19960901, 100000.0),
-                (19961201, 107756.00000000001),
-                (19970301, 109009.0),
-                (19970601, 127193.0),
-                (19970901, 137804.0),
-                (19971201, 140379.0),
-                (19980301, 159140.0),
-                (19980601, 163192.0),
-                (19980901, 145219.0),
-                (19981201, 177235.0),
-                (19990301, 185424.0),
-                (19990601, 199092.0),
-                (19990901, 186227.0),
-                (19991201, 217680.0),
-                (20000301, 225952.99999999997),
-                (20000601, 218523.99999999997),
-                (20000901, 222131.0),
-                (20001201, 199163.0),
-                (20010301, 171684.0),
-                (20010601, 182742.0),
-                (20010901, 150187.0),
-                (20011201, 167530.0),
-                (20020301, 166471.0),
-                (20020601, 141964.0),
-                (20020901, 116748.99999999999),
-                (20021201, 126703.00000000001),
-                (20030301, 122520.0),
-                (20030601, 142817.0),
-                (20030901, 147424.0),
-                (20031201, 165744.0),
-                (20040301, 169164.0),
-                (20040601, 171480.0),
-                (20040901, 167844.0),
-                (20041201, 183880.0),
-                (20050301, 177886.0),
-                (20050601, 182389.0),
-                (20050901, 189194.0),
-                (20051201, 194098.0),
-                (20060301, 202789.00000000003),
-                (20060601, 199425.0),
-                (20060901, 208632.99999999997),
-            ],
-            [
-                (19960901, 100000.0),
-                (19961201, 108335.0),
-                (19970301, 111239.0),
-                (19970601, 130658.99999999999),
-                (19970901, 140444.0),
-                (19971201, 144476.0),
-                (19980301, 164629.0),
-                (19980601, 170065.0),
-                (19980901, 153148.0),
-                (19981201, 185764.0),
-                (19990301, 195021.0),
-                (19990601, 208768.00000000003),
-                (19990901, 195733.0),
-                (19991201, 224858.0),
-                (20000301, 230015.0),
-                (20000601, 223903.0),
-                (20000901, 221735.00000000003),
-                (20001201, 204384.0),
-                (20010301, 180154.0),
-                (20010601, 190697.0),
-                (20010901, 162707.0),
-                (20011201, 180094.0),
-                (20020301, 180588.0),
-                (20020601, 156393.0),
-                (20020901, 129375.0),
-                (20021201, 140290.0),
-                (20030301, 135871.0),
-                (20030601, 156793.0),
-                (20030901, 160942.0),
-                (20031201, 180538.0),
-                (20040301, 183594.0),
-                (20040601, 186752.0),
-                (20040901, 183261.0),
-                (20041201, 200178.0),
-                (20050301, 195875.0),
-                (20050601, 198549.0),
-                (20050901, 205708.0),
-                (20051201, 210001.00000000003),
-                (20060301, 218838.0),
-                (20060601, 215685.0),
-                (20060901, 227904.99999999997),
-            ],
+                19960901,
+                19961201,
+                19970301,
+                19970601,
+                19970901,
+                19971201,
+                19980301,
+                19980601,
+                19980901,
+                19981201,
+                19990301,
+                19990601,
+                19990901,
+                19991201,
+                20000301,
+                20000601,
+                20000901,
+                20001201,
+                20010301,
+                20010601,
+                20010901,
+                20011201,
+                20020301,
+                20020601,
+                20020901,
+                20021201,
+                20030301,
+                20030601,
+                20030901,
+                20031201,
+                20040301,
+                20040601,
+                20040901,
+                20041201,
+                20050301,
+                20050601,
+                20050901,
+                20051201,
+                20060301,
+                20060601,
+                20060901,
+            ]
+        )
+        self.chart.data = [
+            time_series(dates, values)
+            for values in (
+                [
+                    100000.0,
+                    109034.00000000001,
+                    110105.00000000001,
+                    127487.0,
+                    134702.0,
+                    136920.0,
+                    153788.0,
+                    158997.0,
+                    141245.0,
+                    171859.0,
+                    179215.0,
+                    193963.0,
+                    181679.0,
+                    202828.0,
+                    216832.0,
+                    218377.0,
+                    222553.0,
+                    220915.00000000003,
+                    204568.0,
+                    212621.0,
+                    185524.0,
+                    202977.0,
+                    204425.0,
+                    176716.0,
+                    143573.0,
+                    158079.0,
+                    153953.0,
+                    181898.0,
+                    186917.0,
+                    210109.0,
+                    214340.99999999997,
+                    217241.00000000003,
+                    207773.0,
+                    226420.99999999997,
+                    219802.0,
+                    224784.0,
+                    234346.0,
+                    238378.99999999997,
+                    244329.99999999997,
+                    237279.00000000003,
+                    250893.0,
+                ],
+                [
+                    100000.0,
+                    107756.00000000001,
+                    109009.0,
+                    127193.0,
+                    137804.0,
+                    140379.0,
+                    159140.0,
+                    163192.0,
+                    145219.0,
+                    177235.0,
+                    185424.0,
+                    199092.0,
+                    186227.0,
+                    217680.0,
+                    225952.99999999997,
+                    218523.99999999997,
+                    222131.0,
+                    199163.0,
+                    171684.0,
+                    182742.0,
+                    150187.0,
+                    167530.0,
+                    166471.0,
+                    141964.0,
+                    116748.99999999999,
+                    126703.00000000001,
+                    122520.0,
+                    142817.0,
+                    147424.0,
+                    165744.0,
+                    169164.0,
+                    171480.0,
+                    167844.0,
+                    183880.0,
+                    177886.0,
+                    182389.0,
+                    189194.0,
+                    194098.0,
+                    202789.00000000003,
+                    199425.0,
+                    208632.99999999997,
+                ],
+                [
+                    100000.0,
+                    108335.0,
+                    111239.0,
+                    130658.99999999999,
+                    140444.0,
+                    144476.0,
+                    164629.0,
+                    170065.0,
+                    153148.0,
+                    185764.0,
+                    195021.0,
+                    208768.00000000003,
+                    195733.0,
+                    224858.0,
+                    230015.0,
+                    223903.0,
+                    221735.00000000003,
+                    204384.0,
+                    180154.0,
+                    190697.0,
+                    162707.0,
+                    180094.0,
+                    180588.0,
+                    156393.0,
+                    129375.0,
+                    140290.0,
+                    135871.0,
+                    156793.0,
+                    160942.0,
+                    180538.0,
+                    183594.0,
+                    186752.0,
+                    183261.0,
+                    200178.0,
+                    195875.0,
+                    198549.0,
+                    205708.0,
+                    210001.00000000003,
+                    218838.0,
+                    215685.0,
+                    227904.99999999997,
+                ],
+            )
         ]
         self._seriesNames = 'Index', 'Europe Market', 'Asia Market'
         self.bgrect0.fillColor = PCMYKColor(10, 10, 10, 10, alpha=100)
@@ -340,10 +392,11 @@ def addConditionalSubTicks(chart):
     """
     if the dates of the axis jumps one year then this will add subticks between
     """
-    chart.xValueAxis.configure([chart.data])
+    axis = chart.xValueAxis
+    axis.configure([chart.data])
     if (
-        int(str(chart.xValueAxis._tickValues[-1])[:4])
-        - int(str(chart.xValueAxis._tickValues[-2])[:4])
+        axis.tickYear(axis._tickValues[-1])
+        - axis.tickYear(axis._tickValues[-2])
         > 1
     ):
         chart.xValueAxis.subTickNum = 1
@@ -392,7 +445,7 @@ class AreaWithDynamicLabelChart(_DrawingEditorMixin, Drawing):
         gridStickOut = 4
         strokeDashArray = (0.4, 0.4)
         # x axis
-        self.chart.xValueAxis = NormalDateXValueAxis()
+        self.chart.xValueAxis = EpochDayXValueAxis()
         self.chart.xValueAxis.labels.boxAnchor = 'autox'
         self.chart.xValueAxis.labels.fontName = fontName
         self.chart.xValueAxis.labels.fontSize = 6
@@ -444,70 +497,137 @@ class AreaWithDynamicLabelChart(_DrawingEditorMixin, Drawing):
         )
         # sample data
         # self.chart.data = [(20030228, 10020.0), (20030331, 9910.0), (20030430, 10240.0), (20030530, 10660.0), (20030630, 10680.0), (20030731, 10690.0), (20030829, 10850.0), (20030930, 10760.0)]
-        self.chart.data = [
-            (20030228, 10020.0),
-            (20030331, 9910.0),
-            (20030430, 10240.0),
-            (20030530, 10660.0),
-            (20030630, 10680.0),
-            (20030731, 10690.0),
-            (20030829, 10850.0),
-            (20030930, 10760.0),
-            (20031031, 11170.0),
-            (20031128, 11280.0),
-            (20031231, 11553.190000000001),
-            (20040130, 11635.57),
-            (20040227, 11707.65),
-            (20040331, 11635.57),
-            (20040430, 11388.440000000001),
-            (20040528, 11460.52),
-            (20040630, 11651.870000000001),
-            (20040730, 11233.110000000001),
-            (20040831, 11306.4),
-            (20040930, 11358.74),
-            (20041029, 11536.709999999999),
-            (20041130, 11945.0),
-            (20041231, 12295.450000000001),
-            (20050131, 11966.209999999999),
-            (20050228, 12102.450000000001),
-            (20050331, 11932.15),
-            (20050429, 11716.440000000001),
-            (20050531, 12034.33),
-            (20050630, 11991.209999999999),
-            (20050729, 12426.84),
-            (20050831, 12254.879999999999),
-            (20050930, 12289.280000000001),
-            (20051031, 12128.780000000001),
-            (20051130, 12564.41),
-            (20051230, 12584.99),
-            (20060131, 12967.76),
-            (20060228, 12921.360000000001),
-            (20060331, 13257.74),
-            (20060428, 13338.93),
-            (20060531, 12874.969999999999),
-            (20060630, 12857.6),
-            (20060731, 12834.35),
-            (20060831, 12985.48),
-            (20060929, 13171.49),
-            (20061031, 13555.120000000001),
-            (20061130, 13776.0),
-            (20061229, 13886.870000000001),
-            (20070131, 14053.4),
-            (20070228, 13848.43),
-            (20070330, 13925.299999999999),
-            (20070430, 14335.24),
-            (20070531, 14655.51),
-            (20070629, 14460.98),
-            (20070731, 14190.08),
-            (20070831, 14319.08),
-            (20070928, 14770.59),
-            (20071031, 14925.389999999999),
-            (20071130, 14460.98),
-            (20071231, 14494.120000000001),
-            (20080131, 13829.26),
-            (20080229, 13637.18),
-            (20080331, 13651.959999999999),
+        dates = epoch_days(
+            [
+                20030228,
+                20030331,
+                20030430,
+                20030530,
+                20030630,
+                20030731,
+                20030829,
+                20030930,
+                20031031,
+                20031128,
+                20031231,
+                20040130,
+                20040227,
+                20040331,
+                20040430,
+                20040528,
+                20040630,
+                20040730,
+                20040831,
+                20040930,
+                20041029,
+                20041130,
+                20041231,
+                20050131,
+                20050228,
+                20050331,
+                20050429,
+                20050531,
+                20050630,
+                20050729,
+                20050831,
+                20050930,
+                20051031,
+                20051130,
+                20051230,
+                20060131,
+                20060228,
+                20060331,
+                20060428,
+                20060531,
+                20060630,
+                20060731,
+                20060831,
+                20060929,
+                20061031,
+                20061130,
+                20061229,
+                20070131,
+                20070228,
+                20070330,
+                20070430,
+                20070531,
+                20070629,
+                20070731,
+                20070831,
+                20070928,
+                20071031,
+                20071130,
+                20071231,
+                20080131,
+                20080229,
+                20080331,
+            ]
+        )
+        values = [
+            10020.0,
+            9910.0,
+            10240.0,
+            10660.0,
+            10680.0,
+            10690.0,
+            10850.0,
+            10760.0,
+            11170.0,
+            11280.0,
+            11553.19,
+            11635.57,
+            11707.65,
+            11635.57,
+            11388.44,
+            11460.52,
+            11651.87,
+            11233.11,
+            11306.4,
+            11358.74,
+            11536.71,
+            11945.0,
+            12295.45,
+            11966.21,
+            12102.45,
+            11932.15,
+            11716.44,
+            12034.33,
+            11991.21,
+            12426.84,
+            12254.88,
+            12289.28,
+            12128.78,
+            12564.41,
+            12584.99,
+            12967.76,
+            12921.36,
+            13257.74,
+            13338.93,
+            12874.97,
+            12857.6,
+            12834.35,
+            12985.48,
+            13171.49,
+            13555.12,
+            13776.0,
+            13886.87,
+            14053.4,
+            13848.43,
+            13925.3,
+            14335.24,
+            14655.51,
+            14460.98,
+            14190.08,
+            14319.08,
+            14770.59,
+            14925.39,
+            14460.98,
+            14494.12,
+            13829.26,
+            13637.18,
+            13651.96,
         ]
+        self.chart.data = time_series(dates, values)
         # chart horizonatl line on the axis
         self.chart.annotations = [
             lambda c, cA, vA: Line(
@@ -532,9 +652,7 @@ class AreaWithDynamicLabelChart(_DrawingEditorMixin, Drawing):
         )
         self._add(
             self,
-            DynamicLabel(
-                '', NormalDate(self.chart.data[0][0]), self.chart.data[0][1]
-            ),
+            DynamicLabel('', self.chart.data[0][0], self.chart.data[0][1]),
             name='label',
             validate=None,
             desc=None,
@@ -567,7 +685,7 @@ class AreaWithDynamicLabelChart(_DrawingEditorMixin, Drawing):
         mq = m + sf * self.label.fontSize
         self.chart.yValueAxis.valueMax = max(mg, mq)
         format = self._label_format
-        self.label._ux = NormalDate(dates[-1])
+        self.label._ux = dates[-1]
         self.label._uy = m
         self.label._text = ' Ending Value %s ' % format(values[-1] * 1000)
         self.label.fillColor = black
@@ -0,0 +1,435 @@
+"""
+按章节并行构建文档
+
+顺序构建时, 所有章节写入同一个 ``PDF.store`` 后再由 ``multiBuild`` 单核排版.
+并行构建时:
+
+1. 主进程先按顺序执行一遍各章节函数(只生成流对象, 不排版), 记录每个章节开始时
+   计数器(``Chapter``/``Section``/``Figure``/``Table``)、附录模式、页面模板等状态;
+2. 每个章节(或连续的、不以分页开头的几个章节)作为一个分段, 在工作进程中恢复上述
+   状态后重新生成流对象并排版为独立的分段 PDF, 同时收集目录条目;
+3. 主进程汇总所有分段的目录条目, 排版封面和目录分段;
+4. 按顺序合并所有分段, 添加页脚页码, 重建书签(outline).
+
+分段排版时不绘制页脚页码, 因此分段的排版结果与起始页码无关, 只取决于分段的
+流对象和起始状态. 指定缓存目录时, 以两者的内容指纹为键缓存分段 PDF,
+内容未变化的分段直接复用, 只重新计算页码.
+
+合并分段 PDF 需要安装 ``pypdf`` 包.
+"""
+import os
+import io
+import json
+import logging
+import tempfile
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import reportlab
+from reportlab.lib.sequencer import getSequencer
+from reportlab.pdfgen.canvas import Canvas
+from reportlab.platypus import PageBreak, Paragraph
+from reportlab.platypus.doctemplate import NextPageTemplate
+
+from report.components import constant
+from report.components.fingerprint import fingerprint
+from report.core.pdf import PDF
+from report.core.templates import draw_page_number
+
+logger = logging.getLogger(__name__)
+
+# 一个分段的构建参数
+PartJob = namedtuple(
+    'PartJob',
+    [
+        'chapters',  # 分段包含的章节函数
+        'skip',  # 跳过的流对象数量(第一章前的封面和目录)
+        'pdf_kwargs',  # 构造 PDF 对象的参数
+        'seq_state',  # 分段开始时的计数器状态
+        'appendix_mode',  # 分段开始时是否附录模式
+        'doc_state',  # 分段开始时的文档状态
+    ],
+)
+
+# 一个分段的构建结果, 目录条目中的页码为分段内的页码
+PartResult = namedtuple('PartResult', ['path', 'page_count', 'toc_entries'])
+
+
+class _StoryState:
+    """ 顺序扫描流对象, 跟踪文档模板会看到的状态 """
+
+    def __init__(self):
+        self.title = None
+        self.chapter = None
+        self.chapter_count = 0
+        self.template = constant.PAGE_TEMPLATE_COVER
+        self.next_template = None
+
+    def feed(self, flowable):
+        if isinstance(flowable, NextPageTemplate):
+            self.next_template = flowable.action[1]
+        elif isinstance(flowable, PageBreak):
+            if self.next_template:
+                self.template = self.next_template
+                self.next_template = None
+        elif isinstance(flowable, Paragraph):
+            style = flowable.style.name
+            if style == constant.STYLE_TITLE:
+                self.title = flowable.getPlainText()
+            elif style == constant.STYLE_HEADING_1:
+                self.chapter = flowable.getPlainText()
+                self.chapter_count += 1
+
+    def snapshot(self):
+        return {
+            'title': self.title,
+            'chapter': self.chapter,
+            'chapter_count': self.chapter_count,
+            'template': self.next_template or self.template,
+        }
+
+
+def _snapshot_sequencer(seq):
+    return {
+        name: (counter._value, counter._formatter)
+        for name, counter in seq._counters.items()
+    }
+
+
+def _restore_sequencer(seq, state):
+    for name, (value, formatter) in state.items():
+        counter = seq._getCounter(name)
+        counter._value = value
+        counter._formatter = formatter
+
+
+def _starts_with_page_break(flowables):
+    for flowable in flowables:
+        if isinstance(flowable, PageBreak):
+            return True
+        if not isinstance(flowable, NextPageTemplate):
+            return False
+    return False
+
+
+def _strip_leading_breaks(flowables, state):
+    """ 分段总是从新页开始, 去掉开头的分页, 并计算首页使用的页面模板 """
+    index = 0
+    for index, flowable in enumerate(flowables):
+        if isinstance(flowable, (PageBreak, NextPageTemplate)):
+            state.feed(flowable)
+        else:
+            break
+    else:
+        index = len(flowables)
+    return flowables[index:]
+
+
+def _census(pdf, chapters, pdf_kwargs):
+    """
+    按顺序生成所有章节的流对象, 划分分段
+
+    @return: (封面和目录的流对象, 分段列表, 各分段的流对象)
+    """
+    toc_class = pdf.toc_class
+    state = _StoryState()
+    front = None
+    jobs = []
+    stories = []
+
+    for chapter in chapters:
+        seq_state = _snapshot_sequencer(pdf.seq)
+        appendix_mode = pdf._appendix_mode
+        start = len(pdf.store)
+        chapter(pdf)
+        story = pdf.store[start:]
+
+        skip = 0
+        if front is None:
+            # 第一个目录及之前的内容为封面和目录分段
+            for index, flowable in enumerate(story):
+                if isinstance(flowable, toc_class):
+                    skip = index + 1
+                    front = story[:skip]
+                    break
+            for flowable in story[:skip]:
+                state.feed(flowable)
+            story = story[skip:]
+
+        if not story:
+            continue
+        if jobs and not _starts_with_page_break(story):
+            # 与前一章节在同一页接续排版, 合并为同一个分段
+            job = jobs[-1]
+            jobs[-1] = job._replace(chapters=job.chapters + (chapter,))
+            stories[-1].extend(story)
+        else:
+            doc_state = _StoryState()
+            doc_state.__dict__.update(state.__dict__)
+            _strip_leading_breaks(story, doc_state)
+            jobs.append(
+                PartJob(
+                    chapters=(chapter,),
+                    skip=skip,
+                    pdf_kwargs=pdf_kwargs,
+                    seq_state=seq_state,
+                    appendix_mode=appendix_mode,
+                    doc_state=doc_state.snapshot(),
+                )
+            )
+            stories.append(list(story))
+        for flowable in story:
+            state.feed(flowable)
+
+    if front is None:
+        raise ValueError('并行构建需要文档包含目录')
+    return front, jobs, stories
+
+
+def _prepare_doc(doc, doc_state):
+    doc.chapter_offset = doc_state['chapter_count']
+    if doc_state['title']:
+        doc.initial_title = doc_state['title']
+    if doc_state['chapter']:
+        doc.initial_chapter = doc_state['chapter']
+    template_ids = [template.id for template in doc.pageTemplates]
+    doc._firstPageTemplateIndex = template_ids.index(doc_state['template'])
+
+
+def _render_part(job, path):
+    """ 工作进程: 恢复状态, 生成并排版一个分段 """
+    # 工作进程会被复用, 先清空上一个分段留下的计数器
+    getSequencer()._reset()
+    pdf = PDF(path, **job.pdf_kwargs)
+    _restore_sequencer(pdf.seq, job.seq_state)
+    pdf._appendix_mode = job.appendix_mode
+    for chapter in job.chapters:
+        chapter(pdf)
+
+    state = _StoryState()
+    story = _strip_leading_breaks(pdf.store[job.skip:], state)
+
+    doc = pdf._doc
+    _prepare_doc(doc, job.doc_state)
+    doc.draw_page_numbers = False
+    doc.build(story)
+    pdf.reset_seq()
+
+    return PartResult(
+        path=path, page_count=doc.page, toc_entries=doc.toc_entries
+    )
+
+
+def _source_fingerprint():
+    """ 排版相关的代码: reportlab 版本和 report 包的源码 """
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sources = []
+    for root, dirs, files in os.walk(package_dir):
+        dirs.sort()
+        for name in sorted(files):
+            if name.endswith('.py'):
+                with open(os.path.join(root, name), 'rb') as f:
+                    sources.append((name, f.read()))
+    return fingerprint(reportlab.Version, sources)
+
+
+def _part_key(source, job, story):
+    return fingerprint(
+        source,
+        job.pdf_kwargs,
+        job.seq_state,
+        job.appendix_mode,
+        job.doc_state,
+        story,
+    )
+
+
+def _load_cached(path):
+    try:
+        with open(f'{path}.json') as f:
+            record = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not os.path.exists(path):
+        return None
+    return PartResult(
+        path=path,
+        page_count=record['page_count'],
+        toc_entries=[tuple(entry) for entry in record['toc_entries']],
+    )
+
+
+def _save_cached(result):
+    with open(f'{result.path}.json', 'w') as f:
+        json.dump(
+            {
+                'page_count': result.page_count,
+                'toc_entries': result.toc_entries,
+            },
+            f,
+        )
+
+
+def _prune_cache(cache_dir, paths):
+    """ 删除本次构建没有用到的缓存 """
+    keep = set(os.path.basename(path) for path in paths)
+    keep.update(f'{name}.json' for name in list(keep))
+    for name in os.listdir(cache_dir):
+        if name.endswith(('.pdf', '.pdf.json')) and name not in keep:
+            os.remove(os.path.join(cache_dir, name))
+
+
+def _page_offsets(front_pages, page_counts):
+    offsets = []
+    offset = front_pages
+    for count in page_counts:
+        offsets.append(offset)
+        offset += count
+    return offsets
+
+
+def _global_entries(results, offsets):
+    return [
+        (level, text, page + offset, key)
+        for result, offset in zip(results, offsets)
+        for (level, text, page, key) in result.toc_entries
+    ]
+
+
+def _page_number_stamps(first_page, page_count, page_size, unicode_font):
+    """ 生成只包含页脚页码的 PDF, 用于叠加到分段的页面上 """
+    from pypdf import PdfReader
+
+    buffer = io.BytesIO()
+    canvas = Canvas(buffer, pagesize=page_size)
+    for page_number in range(first_page, first_page + page_count):
+        canvas.setFont(unicode_font, 10)
+        draw_page_number(canvas, page_size, page_number)
+        canvas.showPage()
+    canvas.save()
+    return PdfReader(buffer).pages
+
+
+def _merge(filename, front_path, results, entries, page_size, unicode_font):
+    """ 按顺序合并分段, 添加页码, 重建书签 """
+    from pypdf import PdfWriter
+    from pypdf.generic import ArrayObject, NameObject
+
+    writer = PdfWriter()
+    writer.append(front_path, import_outline=False)
+    front_pages = len(writer.pages)
+    for result in results:
+        writer.append(result.path, import_outline=False)
+
+    stamps = _page_number_stamps(
+        front_pages + 1,
+        len(writer.pages) - front_pages,
+        page_size,
+        unicode_font,
+    )
+    for page, stamp in zip(writer.pages[front_pages:], stamps):
+        page.merge_page(stamp)
+        page.compress_content_streams()
+
+    # 目录链接指向首页的占位书签, 改为指向 FitH 参数中记录的目标页
+    placeholder = writer.pages[0].indirect_reference
+    for page in writer.pages[:front_pages]:
+        for annotation in page.get('/Annots') or []:
+            annotation = annotation.get_object()
+            dest = annotation.get('/Dest')
+            if dest and dest[0] == placeholder and dest[1] == '/FitH':
+                target = writer.pages[int(dest[2]) - 1].indirect_reference
+                annotation[NameObject('/Dest')] = ArrayObject(
+                    [target, NameObject('/Fit')]
+                )
+
+    parents = {}
+    for level, text, page, key in entries:
+        parents[level] = writer.add_outline_item(
+            text, page - 1, parent=parents.get(level - 1)
+        )
+    writer.page_mode = '/UseOutlines'
+    # 各分段重复嵌入的图片等对象只保留一份
+    writer.compress_identical_objects(
+        remove_identicals=True, remove_orphans=True
+    )
+    with open(filename, 'wb') as f:
+        writer.write(f)
+
+
+def build_in_parallel(
+    filename, chapters, workers=None, cache_dir=None, **pdf_kwargs
+):
+    """
+    按章节并行构建文档
+
+    @param filename: 输出文件名
+    @param chapters: 章节函数列表, 函数接收 PDF 对象作为唯一参数, 需可被 pickle
+    @param workers: 工作进程数量, 默认为 cpu 核数
+    @param cache_dir: 分段缓存目录, 为 None 时不缓存
+    @param pdf_kwargs: 构造 PDF 对象的参数
+    @return: 重新排版的分段数量
+    """
+    pdf = PDF(filename, **pdf_kwargs)
+    front, jobs, stories = _census(pdf, chapters, pdf_kwargs)
+    toc = front[-1]
+    doc = pdf._doc
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        part_dir = cache_dir or tmp_dir
+        os.makedirs(part_dir, exist_ok=True)
+        source = _source_fingerprint()
+        paths = [
+            os.path.join(part_dir, f'{_part_key(source, job, story)}.pdf')
+            for job, story in zip(jobs, stories)
+        ]
+
+        results = [_load_cached(path) if cache_dir else None for path in paths]
+        pending = [index for index, result in enumerate(results) if not result]
+        logger.info(
+            f'共 {len(jobs)} 个分段, 复用 {len(jobs) - len(pending)} 个, '
+            f'排版 {len(pending)} 个'
+        )
+        if pending:
+            with ProcessPoolExecutor(workers) as pool:
+                futures = {
+                    pool.submit(_render_part, jobs[index], paths[index]): index
+                    for index in pending
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    results[index] = future.result()
+                    _save_cached(results[index])
+                    logger.debug(
+                        f'分段 {index} 排版完成: {results[index].page_count} 页'
+                    )
+        page_counts = [result.page_count for result in results]
+
+        # 目录的页数取决于条目, 条目的页码取决于目录页数
+        front_path = os.path.join(tmp_dir, 'front.pdf')
+        front_pages = 1
+        while True:
+            offsets = _page_offsets(front_pages, page_counts)
+            toc._lastEntries = _global_entries(results, offsets)
+            _prepare_doc(doc, _StoryState().snapshot())
+            doc.external_destinations = {
+                key: page for (level, text, page, key) in toc._lastEntries
+            }
+            doc.build(front[:], filename=front_path)
+            if doc.page == front_pages:
+                break
+            front_pages = doc.page
+
+        _merge(
+            filename,
+            front_path,
+            results,
+            toc._lastEntries,
+            doc.pagesize,
+            pdf.font_regular,
+        )
+        if cache_dir:
+            _prune_cache(cache_dir, paths)
+
+    pdf.reset_seq()
+    return len(pending)
@@ -22,9 +22,7 @@ from reportlab.platypus import (
     Spacer,
     XPreformatted,
     KeepTogether,
-    Image,
 )
-from reportlab.graphics.shapes import Drawing
 from reportlab.platypus.xpreformatted import PythonPreformatted
 
 from report.components.constant import (
@@ -37,15 +35,10 @@ from report.components import constant
 from report.components.exception import FontNameNotFoundError, HeadingLevelError
 from report.components.utils import find_file_name, quick_fix
 
-from report.core import VALIDATED_FONT_NAMES
-from report.core.graphics.quick_charts import (
-    QuickChart,
-    CHART_TYPES,
-    LEGEND_POSITIONS,
-    MARKERS,
-)
+from report.core import VALIDATED_FONT_NAMES, register_font
 from report.core.figure import Illustration, GraphicsDrawing, ParaBox, ParaBox2
 from report.core.flowable import NoteAnnotation, HandAnnotation
+from report.core.images import CachedImage
 from report.core.style.default import get_default_style_sheet
 from report.core.toc import TableOfContents
 from report.core.templates import RLDocTemplate
@@ -69,10 +62,14 @@ class PDF(object):
         font_italic='SourceHanSans-Light',  # 忽略，没有斜体，留在这儿只为说明有这个功能
         font_bold_italic='SourceHanSans-ExtraLight',  # 忽略，没有斜体，留在这儿只为说明有这个功能
         toc_cls=None,
+        toc_sidecar=None,  # 保存目录条目的文件, 文档结构不变时一遍排版即可完成
+        profile=None,  # 统计流对象排版耗时, 结果保存到 {profile}.txt/.json
+        image_dpi=None,  # 图片按显示尺寸缩小到的分辨率, 为 None 时不缩小
     ):
 
         self.filename = filename
         self.cover_image = cover_image
+        self.image_dpi = image_dpi
         self.copyrights = copyrights or ['Generate By ReportLab']
 
         # 处理页面大小
@@ -89,6 +86,16 @@ class PDF(object):
         self.font_bold_italic = font_bold_italic
         # 注册字体
         self.registered_fonts = []
+        for font in (
+            font_regular,
+            font_normal,
+            font_bold,
+            font_italic,
+            font_bold_italic,
+        ):
+            if font and font not in self.registered_fonts:
+                register_font(font)
+                self.registered_fonts.append(font)
 
         # 保持一致flag
         self._keep_together_index = None
@@ -130,7 +137,10 @@ class PDF(object):
             self.filename,
             self.font_regular,
             cover_image=self.cover_image,
+            image_dpi=self.image_dpi,
             copyrights=self.copyrights,
+            toc_sidecar=toc_sidecar,
+            profile=profile,
             pagesize=defaultPageSize,
         )
 
@@ -323,11 +333,18 @@ class PDF(object):
         exec(code, var, var)
         self.store.append(var[name])
 
-    def add_image(self, path, width=None, height=None):
-        """ 添加图片 """
+    def add_image(self, path, width=None, height=None, dpi=None):
+        """
+        添加图片
+
+        同一个图片文件在文档中只嵌入一次.
+        @param dpi: 按显示尺寸缩小图片的目标分辨率, 默认为 image_dpi
+        """
         s = self.start_keep_together()
         self.add_space(0.2)
-        self.store.append(Image(path, width, height))
+        self.store.append(
+            CachedImage(path, width, height, dpi=dpi or self.image_dpi)
+        )
         self.add_space(0.2)
         self.end_keep_together(s)
 
@@ -429,8 +446,14 @@ class PDF(object):
         self.store.append(NextPageTemplate(constant.PAGE_TEMPLATE_NORMAL))
 
     def build_2_save(self):
-        self._doc.multiBuild(self.store)
+        """
+        排版并保存
+
+        @return: 排版遍数
+        """
+        passes = self._doc.multiBuild(self.store)
         self.reset_seq()
+        return passes
 
     def add_quick_chart(
         self,
@@ -454,28 +477,36 @@ class PDF(object):
         @return: None
         """
 
+        # 图形引擎较大, 第一次添加图形时才导入
+        from reportlab.graphics.shapes import Drawing
+        from report.core.graphics.quick_charts import QuickChart, CHART_TYPES
+
         if chart_type not in CHART_TYPES:
             raise ValueError(
                 f'图形类别 {chart_type} 不支持, 仅支持: {"、".join(CHART_TYPES)}'
             )
 
         chart = QuickChart()
-        chart.width = width
-        chart.height = height
-        chart.chartType = chart_type
-        chart.data = data
-        # chart.titleText = '折线图'  # 'Line Chart'
-        chart.seriesNames = series
-        chart.categoryNames = names
-        # chart.xTitleText = 'Year'
-        # chart.yTitleText = 'Sales (000,000)'
-        chart.titleFontName = self.font_regular
-        chart.xTitleFontName = self.font_regular
-        chart.yTitleFontName = self.font_regular
-        chart.xAxisFontName = self.font_regular
-        chart.yAxisFontName = self.font_regular
-        chart.dataLabelsFontName = self.font_regular
-        chart.legendFontName = self.font_regular
+        # 图形类别已检查, 其余属性一次设置, 不逐个校验
+        chart.configure(
+            validate=False,
+            width=width,
+            height=height,
+            chartType=chart_type,
+            data=data,
+            # titleText='折线图',  # 'Line Chart'
+            seriesNames=series,
+            categoryNames=names,
+            # xTitleText='Year',
+            # yTitleText='Sales (000,000)',
+            titleFontName=self.font_regular,
+            xTitleFontName=self.font_regular,
+            yTitleFontName=self.font_regular,
+            xAxisFontName=self.font_regular,
+            yAxisFontName=self.font_regular,
+            dataLabelsFontName=self.font_regular,
+            legendFontName=self.font_regular,
+        )
 
         drawing = Drawing()
         drawing.add(chart)
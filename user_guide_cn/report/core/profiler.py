@@ -0,0 +1,174 @@
+"""
+流对象排版耗时统计
+
+构建期间替换所有 ``Flowable`` 子类的 ``wrap``/``split``/``draw`` 方法,
+记录每个流对象排版(wrap)、拆分(split)、绘制(draw)的调用次数和耗时,
+按流对象类型和所在章节分组. 嵌套的流对象(如 KeepTogether、表格中的段落)
+单独统计, 外层流对象只计算自身的耗时.
+
+用法::
+
+    pdf = PDF('out.pdf', profile='out.profile')
+    pdf.build_2_save()  # 生成 out.profile.txt 和 out.profile.json
+"""
+import json
+import time
+import types
+from collections import defaultdict
+from contextlib import contextmanager
+
+from reportlab.platypus.flowables import Flowable
+
+OPERATIONS = ('wrap', 'split', 'draw')
+
+
+def _flowable_classes():
+    """ Flowable 及其所有已定义的子类 """
+    classes = []
+    pending = [Flowable]
+    while pending:
+        cls = pending.pop()
+        if cls not in classes:
+            classes.append(cls)
+            pending.extend(cls.__subclasses__())
+    return classes
+
+
+class FlowableProfiler(object):
+    """ 按流对象类型和章节统计排版耗时 """
+
+    def __init__(self):
+        # {(章节, 类型): {操作: [调用次数, 耗时]}}
+        self.stats = defaultdict(
+            lambda: {operation: [0, 0.0] for operation in OPERATIONS}
+        )
+        self.builds = 0
+        self.build_time = 0.0
+        # 正在执行的调用中, 子流对象的累计耗时
+        self._child_times = []
+
+    def _wrap_method(self, doc, method, operation):
+        profiler = self
+
+        def wrapper(flowable, *args, **kwargs):
+            child_times = profiler._child_times
+            child_times.append(0.0)
+            start = time.perf_counter()
+            try:
+                return method(flowable, *args, **kwargs)
+            finally:
+                elapsed = time.perf_counter() - start
+                own = elapsed - child_times.pop()
+                if child_times:
+                    child_times[-1] += elapsed
+                key = (doc.chapter, type(flowable).__name__)
+                record = profiler.stats[key][operation]
+                record[0] += 1
+                record[1] += own
+
+        return wrapper
+
+    @contextmanager
+    def record(self, doc):
+        """ 统计一次 doc.build 的耗时 """
+        originals = []
+        for cls in _flowable_classes():
+            for operation in OPERATIONS:
+                method = cls.__dict__.get(operation)
+                if isinstance(method, types.FunctionType):
+                    originals.append((cls, operation, method))
+                    setattr(
+                        cls,
+                        operation,
+                        self._wrap_method(doc, method, operation),
+                    )
+        start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self.build_time += time.perf_counter() - start
+            self.builds += 1
+            for cls, operation, method in originals:
+                setattr(cls, operation, method)
+
+    def _group(self, index):
+        """ 按键的第 index 项(0: 章节, 1: 类型)汇总 """
+        groups = defaultdict(
+            lambda: {operation: [0, 0.0] for operation in OPERATIONS}
+        )
+        for key, record in self.stats.items():
+            group = groups[key if index is None else key[index]]
+            for operation in OPERATIONS:
+                group[operation][0] += record[operation][0]
+                group[operation][1] += record[operation][1]
+        return self._rows(groups)
+
+    def _rows(self, groups):
+        rows = []
+        for name, record in groups.items():
+            total = sum(seconds for _, seconds in record.values())
+            row = {'name': name, 'seconds': total}
+            if self.build_time:
+                row['percent'] = 100 * total / self.build_time
+            else:
+                row['percent'] = 0.0
+            for operation in OPERATIONS:
+                row[f'{operation}_calls'] = record[operation][0]
+                row[f'{operation}_seconds'] = record[operation][1]
+            rows.append(row)
+        rows.sort(key=lambda row: row['seconds'], reverse=True)
+        return rows
+
+    def report(self):
+        """ 统计结果, 各分组按耗时降序排列 """
+        return {
+            'builds': self.builds,
+            'build_seconds': self.build_time,
+            'by_class': self._group(1),
+            'by_chapter': self._group(0),
+            'by_chapter_class': [
+                dict(row, chapter=row['name'][0], name=row['name'][1])
+                for row in self._group(None)
+            ],
+        }
+
+    def format_report(self, limit=30):
+        """ 文本格式的统计结果 """
+        report = self.report()
+        header = (
+            f'{"名称":<40} {"耗时(s)":>9} {"占比":>7} '
+            f'{"wrap":>15} {"split":>15} {"draw":>15}'
+        )
+        lines = [
+            f'排版 {report["builds"]} 遍, 总耗时 {report["build_seconds"]:.3f}s',
+        ]
+        sections = (
+            ('按流对象类型', report['by_class']),
+            ('按章节', report['by_chapter']),
+            ('按章节和流对象类型', report['by_chapter_class']),
+        )
+        for title, rows in sections:
+            lines += ['', f'{title}:', header]
+            for row in rows[:limit]:
+                name = row['name']
+                if 'chapter' in row:
+                    name = f'{row["chapter"]} / {name}'
+                cells = [
+                    '{:>6}x{:>8.3f}'.format(
+                        row[f'{operation}_calls'], row[f'{operation}_seconds']
+                    )
+                    for operation in OPERATIONS
+                ]
+                lines.append(
+                    f'{name[:40]:<40} {row["seconds"]:>9.3f} '
+                    f'{row["percent"]:>6.1f}% ' + ' '.join(cells)
+                )
+        return '\n'.join(lines)
+
+    def save(self, prefix):
+        """ 保存统计结果到 {prefix}.txt 和 {prefix}.json """
+        with open(f'{prefix}.txt', 'w', encoding='utf8') as f:
+            f.write(self.format_report())
+            f.write('\n')
+        with open(f'{prefix}.json', 'w', encoding='utf8') as f:
+            json.dump(self.report(), f, ensure_ascii=False, indent=2)
@@ -1,14 +1,29 @@
 import os
+import json
+import logging
+
 from reportlab.platypus import PageTemplate, BaseDocTemplate, Frame, Paragraph
+from reportlab.platypus.tableofcontents import TableOfContents
 from reportlab.lib.units import inch, cm
 from reportlab.lib.sequencer import Sequencer
 from reportlab.rl_config import defaultPageSize
 
 from report.components import constant
+from report.core.images import load_image
+from report.core.profiler import FlowableProfiler
+
+logger = logging.getLogger(__name__)
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 
+def draw_page_number(canvas, page_size, page_number):
+    """ 页脚页码, 字体由调用方设置 """
+    canvas.drawCentredString(
+        page_size[0] / 2, 0.75 * inch, f'第 {page_number} 页'
+    )
+
+
 class RLFrontCoverTemplate(PageTemplate):
     """ 封面 """
 
@@ -19,11 +34,16 @@ class RLFrontCoverTemplate(PageTemplate):
         cover_image=None,
         after_page_strings=None,
         page_size=defaultPageSize,
+        image_dpi=None,
     ):
         self.unicode_font = unicode_font
         self.pageWidth = page_size[0]
         self.pageHeight = page_size[1]
         self.cover_image = cover_image
+        # 封面图片按原始像素尺寸显示, 指定 image_dpi 时缩小
+        self.cover_image_info = None
+        if cover_image:
+            self.cover_image_info = load_image(cover_image, dpi=image_dpi)
         self.after_page_strings = after_page_strings or []
         frame1 = Frame(
             inch,
@@ -38,8 +58,11 @@ class RLFrontCoverTemplate(PageTemplate):
         canvas.saveState()
 
         # 如果有封面图片
-        if self.cover_image:
-            canvas.drawImage(self.cover_image, 2 * inch, 8 * inch)
+        if self.cover_image_info:
+            info = self.cover_image_info
+            canvas.drawImage(
+                info.filename, 2 * inch, 8 * inch, info.width, info.height
+            )
 
         # 封面左下角文本（版权信息）
         x = inch
@@ -81,9 +104,8 @@ class OneColumnTemplate(PageTemplate):
         canvas.drawString(inch, y + 8, doc.title)
         canvas.drawRightString(self.pageWidth - inch, y + 8, doc.chapter)
         canvas.line(inch, y, self.pageWidth - inch, y)
-        canvas.drawCentredString(
-            doc.pagesize[0] / 2, 0.75 * inch, f'第 {canvas.getPageNumber()} 页'
-        )
+        if doc.draw_page_numbers:
+            draw_page_number(canvas, doc.pagesize, canvas.getPageNumber())
         canvas.restoreState()
 
 
@@ -110,9 +132,8 @@ class TOCTemplate(PageTemplate):
         canvas.drawString(inch, y + 8, doc.title)
         canvas.drawRightString(self.pageWidth - inch, y + 8, '目录')
         canvas.line(inch, y, self.pageWidth - inch, y)
-        canvas.drawCentredString(
-            doc.pagesize[0] / 2, 0.75 * inch, f'第 {canvas.getPageNumber()} 页'
-        )
+        if doc.draw_page_numbers:
+            draw_page_number(canvas, doc.pagesize, canvas.getPageNumber())
         canvas.restoreState()
 
 
@@ -146,9 +167,8 @@ class TwoColumnTemplate(PageTemplate):
         canvas.drawRightString(self.pageWidth - inch, y + 8, doc.chapter)
         canvas.line(inch, y, self.pageWidth - inch, y * inch)
 
-        canvas.drawCentredString(
-            doc.pagesize[0] / 2, 0.75 * inch, f'第 {canvas.getPageNumber()} 页'
-        )
+        if doc.draw_page_numbers:
+            draw_page_number(canvas, doc.pagesize, canvas.getPageNumber())
         canvas.restoreState()
 
 
@@ -160,7 +180,10 @@ class RLDocTemplate(BaseDocTemplate):
         filename,
         unicode_font,
         cover_image=None,
+        image_dpi=None,
         copyrights=None,
+        toc_sidecar=None,
+        profile=None,
         **kwargs,
     ):
         super().__init__(filename=filename, **kwargs)
@@ -172,6 +195,7 @@ class RLDocTemplate(BaseDocTemplate):
                 cover_image=cover_image,
                 after_page_strings=copyrights,
                 page_size=self.pagesize,
+                image_dpi=image_dpi,
             )
         )
         self.addPageTemplates(
@@ -197,18 +221,104 @@ class RLDocTemplate(BaseDocTemplate):
         )
         self.seq = Sequencer()  # 计数器
 
+        # 分段构建时的起始状态, 参考: report.core.parallel
+        self.chapter_offset = 0
+        self.initial_title = "(这儿是文档标题)"
+        self.initial_chapter = "(这儿是章节标题)"
+        # 目录链接指向其他分段中的书签 {key: 页码}, 先在首页注册占位书签,
+        # 目标页码记录在 FitH 的 top 参数中, 合并时再改为指向目标页
+        self.external_destinations = {}
+        # 分段的页码取决于前面分段的页数, 由合并时统一添加
+        self.draw_page_numbers = True
+
         # 初始化标题和章节
-        self.title = "(这儿是文档标题)"
-        self.chapter = "(这儿是章节标题)"
+        self.title = self.initial_title
+        self.chapter = self.initial_chapter
         self.seq.reset('section')
         self.seq.reset('chapter')
 
+        # 本次构建发出的目录条目
+        self.toc_entries = []
+
+        # 保存目录条目的文件, 作为下次构建时目录的初始值, 参考: multiBuild
+        self.toc_sidecar = toc_sidecar
+        # 上一次 multiBuild 时目录初始值是否有效(一遍排版完成)
+        self.toc_seed_valid = None
+
+        # 统计流对象排版耗时, 结果保存到 {profile}.txt 和 {profile}.json
+        self.profile = profile
+        self.profiler = FlowableProfiler() if profile else None
+
     def beforeDocument(self):
         self.canv.showOutline()
-        self.title = "(这儿是文档标题)"
-        self.chapter = "(这儿是章节标题)"
+        self.title = self.initial_title
+        self.chapter = self.initial_chapter
         self.seq.reset('section')
-        self.seq.reset('chapter')
+        self.seq.reset('chapter', base=self.chapter_offset)
+        self.toc_entries = []
+
+        for key, page in self.external_destinations.items():
+            self.canv.bookmarkPage(key, fit='FitH', top=page)
+
+    def _load_toc_seed(self, tocs):
+        """ 读取上次构建保存的目录条目, 作为目录的初始值 """
+        if not self.toc_sidecar or not tocs:
+            return False
+        try:
+            with open(self.toc_sidecar, encoding='utf8') as f:
+                seeds = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if len(seeds) != len(tocs):
+            return False
+
+        for toc, entries in zip(tocs, seeds):
+            toc._entries = [tuple(entry) for entry in entries]
+        return True
+
+    def _save_toc_seed(self, tocs):
+        with open(self.toc_sidecar, 'w', encoding='utf8') as f:
+            json.dump([toc._entries for toc in tocs], f, ensure_ascii=False)
+
+    def build(self, flowables, **kwargs):
+        if self.profiler is None:
+            return super().build(flowables, **kwargs)
+
+        with self.profiler.record(self):
+            super().build(flowables, **kwargs)
+        self.profiler.save(self.profile)
+
+    def multiBuild(self, story, **kwargs):
+        """
+        多遍排版, 直到目录不再变化
+
+        指定 toc_sidecar 时, 以上次构建的目录条目(含书签key)作为目录的初始值,
+        文档结构没有变化时一遍排版即可完成.
+
+        @return: 排版遍数
+        """
+        tocs = [
+            flowable
+            for flowable in story
+            if isinstance(flowable, TableOfContents)
+        ]
+        seeded = self._load_toc_seed(tocs)
+        passes = super().multiBuild(story, **kwargs)
+        self.toc_seed_valid = seeded and passes == 1
+
+        if self.toc_sidecar and tocs:
+            self._save_toc_seed(tocs)
+            if self.toc_seed_valid:
+                logger.info(f'目录初始值有效, 排版 {passes} 遍')
+            else:
+                reason = '已失效' if seeded else '不存在'
+                logger.info(f'目录初始值{reason}, 排版 {passes} 遍')
+        return passes
+
+    def notify(self, kind, stuff):
+        if kind == 'TOCEntry':
+            self.toc_entries.append(stuff)
+        super().notify(kind, stuff)
 
     def afterFlowable(self, flowable):
         """Detect Level 1 and 2 headings, build outline,